@@ -0,0 +1,256 @@
+import numpy as np
+
+from algorithms.multi_var.gradient_search import (
+    bfgs,
+    conjugate_gradient,
+    lbfgs,
+    steepest_descent,
+)
+from algorithms.multi_var.simplex_search import simplex_search
+from constants import constrained_headers, himmelblau_function
+from objective import Objective, as_objective
+from result import Result, SolverRun
+
+# Solvers using finite differences of the penalised function
+gradient_solvers = (steepest_descent, conjugate_gradient, bfgs, lbfgs)
+
+
+class Constraints:
+    """
+    Inequality constraints g(x) >= 0 and equality constraints h(x) = 0. Like the
+    objective functions they take one array per coordinate, eg. g(x, y), and work
+    elementwise, so all the constraints of a batch of points take one call each.
+    """
+
+    def __init__(self, n_vars: int, inequalities=(), equalities=()):
+        self.n_vars = n_vars
+        self.inequalities = [Objective(g, n_vars) for g in inequalities]
+        self.equalities = [Objective(h, n_vars) for h in equalities]
+
+    def values(self, points, constraints) -> np.ndarray:
+        """
+        Values of the constraints at the points, one row per constraint
+        """
+        shape = np.shape(points) if self.n_vars == 1 else np.shape(points)[:-1]
+        values = np.empty((len(constraints), *shape))
+        for i, constraint in enumerate(constraints):
+            values[i] = constraint(points)
+
+        return values
+
+    def violation(self, points) -> np.ndarray:
+        """
+        Largest violation of any constraint at the points. 0 where they are feasible
+        """
+        g = self.values(points, self.inequalities)
+        h = self.values(points, self.equalities)
+        violations = np.concatenate([np.maximum(-g, 0), np.abs(h)])
+        return violations.max(axis=0, initial=0.0)
+
+    def penalty(self, points, method: str, parameter: float) -> np.ndarray:
+        """
+        Penalty of the points for the given method and penalty parameter R
+            penalty: R * (sum <g(x)>^2 + sum h(x)^2), where <g> = min(g, 0)
+            barrier: -R * sum log(g(x)) + sum h(x)^2 / R. Infinite where any
+                g(x) <= 0, so the search stays inside the feasible region
+        """
+        g = self.values(points, self.inequalities)
+        equality_terms = np.sum(self.values(points, self.equalities) ** 2, axis=0)
+
+        if method == "penalty":
+            inequality_terms = np.sum(np.minimum(g, 0) ** 2, axis=0)
+            return parameter * (inequality_terms + equality_terms)
+
+        feasible = np.all(g > 0, axis=0)
+        log_terms = np.sum(np.log(np.where(g > 0, g, 1.0)), axis=0)
+        barrier = np.where(feasible, -parameter * log_terms, np.inf)
+        return barrier + equality_terms / parameter
+
+    def random_start(self, min_pt, max_pt, rng, strictly_feasible: bool, tries=1000):
+        """
+        A random point in [min_pt, max_pt]. With strictly_feasible it must satisfy
+        every inequality strictly, as needed by the barrier method
+        """
+        points = rng.uniform(min_pt, max_pt, size=(tries, self.n_vars))
+        if not strictly_feasible:
+            return points[0]
+
+        g = self.values(points, self.inequalities)
+        feasible = np.flatnonzero(np.all(g > 0, axis=0))
+        if not len(feasible):
+            raise ValueError("Could not find a feasible start for the barrier method")
+
+        return points[feasible[0]]
+
+
+class PenalisedFunction:
+    """
+    Objective function plus the penalty of the constraints. Evaluates a batch of
+    points like any objective function, so it can be handed to any solver.
+    sign is -1 to maximise the objective. Points with any coordinate outside
+    [min_pt, max_pt] are infinite, so that solvers without bounds keep to them.
+    """
+
+    def __init__(
+        self,
+        objective,
+        constraints,
+        method,
+        parameter,
+        sign=1,
+        min_pt=-np.inf,
+        max_pt=np.inf,
+    ):
+        self.objective = objective
+        self.constraints = constraints
+        self.method = method
+        self.parameter = parameter
+        self.sign = sign
+        self.min_pt = min_pt
+        self.max_pt = max_pt
+
+    def __call__(self, *coords):
+        if len(coords) == 1:
+            points = np.asarray(coords[0], dtype=float)
+        else:
+            points = np.stack(np.broadcast_arrays(*coords), axis=-1).astype(float)
+
+        values = self.sign * self.objective(points)
+        values = values + self.constraints.penalty(points, self.method, self.parameter)
+
+        outside = (points < self.min_pt) | (points > self.max_pt)
+        if self.constraints.n_vars > 1:
+            outside = np.any(outside, axis=-1)
+        return np.where(outside, np.inf, values)
+
+
+def constrained_search(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = 100,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+    inequalities=(),
+    equalities=(),
+    method: str = "penalty",
+    solver=simplex_search,
+    parameter: float | None = None,
+    growth: float = 10.0,
+    max_levels: int = 10,
+    tolerance: float = 1e-4,
+) -> Result:
+    """
+    Sequential unconstrained minimisation with the penalty or the log barrier
+    method (see Constraints.penalty) for the constraints g(x) >= 0 of inequalities
+    and h(x) = 0 of equalities. Each penalty parameter is solved with solver,
+    simplex_search by default, evolutionary_search or one of the gradient searches,
+    warm started from the solution of the previous parameter. delta, epsilon, iter
+    and rng are passed on to the solver. After the first level delta becomes
+    twice the distance moved in the previous level, at least 10 epsilon and at
+    most the given delta.
+    Points outside [min_pt, max_pt] are infinitely penalised, see
+    PenalisedFunction. The gradient searches use finite differences of the
+    penalised function, which are not finite next to the bounds or the barrier, so
+    they can only be used with the penalty method and stop without progress at the
+    bounds.
+    The result is only successful if the largest constraint violation is below
+    tolerance and the solution lies inside [min_pt, max_pt].
+    The constraints are python functions, so constrained search is only available
+    as a library function and not from main.py.
+
+    Working ->
+        1. Start from x0, or a random point in [min_pt, max_pt] which is strictly
+           feasible for the barrier method, with R = parameter. R defaults to 0.1
+           for the penalty method and 1 for the barrier method
+        2. Minimise P(x, R) = f(x) + penalty(x, R) with the solver starting from x
+        3. If |P(x, R) - P| < epsilon for the P of the previous level, then x is
+           the solution
+        4. Else multiply R by growth for the penalty method (divide for the barrier
+           method) and go to step 2
+        5. Terminates after max_levels penalty parameters
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for constrained search")
+    if method not in ("penalty", "barrier"):
+        raise ValueError("method must be either penalty or barrier")
+    if method == "barrier" and solver in gradient_solvers:
+        raise ValueError("The barrier method cannot be used with gradient searches")
+
+    objective = as_objective(objective, himmelblau_function, n_vars=2, cache=False)
+    n_vars = objective.n_vars
+    run = SolverRun(objective, trace, constrained_headers(n_vars))
+
+    rng = np.random.default_rng(rng)
+    constraints = Constraints(n_vars, inequalities, equalities)
+    sign = 1 if is_minimising else -1
+
+    if x0 is None:
+        x0 = constraints.random_start(min_pt, max_pt, rng, method == "barrier")
+    x = np.array(x0, dtype=float).reshape(n_vars)
+    if method == "barrier" and not np.isfinite(
+        constraints.penalty(x, method, 1.0)
+    ):
+        raise ValueError("The barrier method must start inside the feasible region")
+
+    if parameter is None:
+        parameter = 0.1 if method == "penalty" else 1.0
+
+    step = delta
+    previous = None
+    converged = False
+    for level in range(1, max_levels + 1):
+        penalised = Objective(
+            PenalisedFunction(
+                objective, constraints, method, parameter, sign, min_pt, max_pt
+            ),
+            n_vars,
+        )
+        search = solver(
+            min_pt,
+            max_pt,
+            step,
+            epsilon,
+            iter,
+            is_minimising=True,
+            objective=penalised,
+            rng=rng,
+            x0=x,
+        )
+
+        new_x = np.array(search.x, dtype=float).reshape(n_vars)
+        moved = np.linalg.norm(new_x - x)
+        x, value = new_x, search.fun
+
+        fx = objective.value(x)
+        violation = float(constraints.violation(x))
+        run.record(
+            [level, parameter, *x, fx, violation, value, objective.n_evaluations]
+        )
+
+        if previous is not None and abs(value - previous) < epsilon:
+            converged = True
+            break
+
+        previous = value
+        parameter = parameter * growth if method == "penalty" else parameter / growth
+        step = max(2 * moved, 10 * epsilon)
+        if delta:
+            step = min(step, delta)
+
+    if violation > tolerance:
+        return run.result(x, fx, "infeasible", success=False, iterations=level)
+    if np.any((x < min_pt) | (x > max_pt)):
+        return run.result(x, fx, "out_of_bounds", success=False, iterations=level)
+
+    return run.result(
+        x,
+        fx,
+        "converged" if converged else "max_iterations",
+        success=converged,
+        iterations=level,
+    )
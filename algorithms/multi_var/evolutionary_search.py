@@ -1,25 +1,44 @@
 import numpy as np
 
-from constants import himmelblau_function, summary
+from constants import evo_headers, himmelblau_function
+from objective import as_objective
+from result import Result, SolverRun
 
 
-def hyper_cube_points(x: float, delta: float):
-    cubepoints = np.zeros((6, 3))
-    cubepoints[0, 0:2] = [x[0] - delta[0] / 2, x[1] - delta[1] / 2]
-    cubepoints[1, 0:2] = [x[0] + delta[0] / 2, x[1] - delta[1] / 2]
-    cubepoints[2, 0:2] = [x[0] + delta[0] / 2, x[1] + delta[1] / 2]
-    cubepoints[3, 0:2] = [x[0] - delta[0] / 2, x[1] + delta[1] / 2]
+def hyper_cube_signs(
+    n_vars: int, max_corners: int | None = None, rng=None
+) -> np.ndarray:
+    """
+    Signs (-1 or 1) of the offsets of the hypercube corners from its centre, one
+    row per corner.
+    Corner i is built from the bits of the gray code of i, so consecutive corners
+    differ in one coordinate and for 2 variables the corners go around the square.
+    When there are more than max_corners corners a random subset of them, drawn
+    from rng, is used.
+    """
+    if max_corners is None or 2**n_vars <= max_corners:
+        codes = np.arange(2**n_vars)
+        codes ^= codes >> 1
+        bits = (codes[:, None] >> np.arange(n_vars)) & 1
+    else:
+        rng = np.random.default_rng(rng)
+        bits = np.unique(rng.integers(0, 2, size=(max_corners, n_vars)), axis=0)
 
-    cubepoints[4, 0:2] = cubepoints[0, 0:2]
-    cubepoints[5, 0:2] = [x[0], x[1]]
+    return 2 * bits - 1
 
-    cubepoints[0, 2] = himmelblau_function(cubepoints[0, 0], cubepoints[0, 1])
-    cubepoints[1, 2] = himmelblau_function(cubepoints[1, 0], cubepoints[1, 1])
-    cubepoints[2, 2] = himmelblau_function(cubepoints[2, 0], cubepoints[2, 1])
-    cubepoints[3, 2] = himmelblau_function(cubepoints[3, 0], cubepoints[3, 1])
 
-    cubepoints[4, 2] = cubepoints[0, 2]
-    cubepoints[5, 2] = himmelblau_function(cubepoints[5, 0], cubepoints[5, 1])
+def hyper_cube_points(x: np.ndarray, delta: np.ndarray, objective, signs=None):
+    """
+    Corners of the hypercube of side delta around x and their values, evaluated
+    in a single call. Returns an array with one row per corner holding the
+    coordinates followed by the value.
+    """
+    if signs is None:
+        signs = hyper_cube_signs(len(x))
+
+    cubepoints = np.empty((len(signs), len(x) + 1))
+    cubepoints[:, :-1] = x + signs * (delta / 2)
+    cubepoints[:, -1] = objective(cubepoints[:, :-1])
 
     return cubepoints
 
@@ -31,8 +50,20 @@ def evolutionary_search(
     epsilon: float | None = None,
     iter: int | None = 100,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+    max_corners: int | None = 4096,
+) -> Result:
     """
+    Box evolutionary search in any number of variables, taken from the objective.
+    Starts from x0, or (initial_x, initial_y) repeated over the variables.
+    delta is the initial side of the hypercube, either one value for every variable
+    or one per variable. It defaults to 2. When the hypercube has more than
+    max_corners corners a random subset of max_corners corners, drawn from rng (a
+    numpy Generator or a seed), is evaluated at every iteration.
+
     Working ->
         1. Choose initial point x0 and initial step size delta
         2. Compute the function value at the corners of the hypercube
@@ -44,35 +75,45 @@ def evolutionary_search(
     if not epsilon:
         raise ValueError("Must provide epsilon for evolutionary search")
 
-    x0 = np.array([initial_x, initial_y])
+    objective = as_objective(objective, himmelblau_function, n_vars=2, cache=False)
+    n_vars = objective.n_vars
+    run = SolverRun(objective, trace, evo_headers(n_vars))
+
+    if x0 is None:
+        # (initial_x, initial_y, initial_x, ...) for more than 2 variables
+        x0 = np.resize([initial_x, initial_y], n_vars)
+    x0 = np.array(x0, dtype=float).reshape(n_vars)
+
+    delta = np.broadcast_to(delta if delta else 2, n_vars).astype(float)
+    rng = np.random.default_rng(rng)
+    sample_corners = max_corners is not None and 2**n_vars > max_corners
+    signs = hyper_cube_signs(n_vars, max_corners, rng)
 
-    delta = np.array([2, 2])
+    # The value at the centre is carried over, only the corners are evaluated
+    f0 = objective.value(x0)
     iter_count = 0
 
     delta_mag = np.linalg.norm(delta)
     while delta_mag > epsilon and iter_count < iter:
-        hcpts = hyper_cube_points(x0, delta)
-        x1 = hcpts[np.argmin(hcpts[:, 2]), 0:2]
-
-        summary.append(
-            [
-                iter_count,
-                np.round(hcpts[5, :], 2),
-                np.round(hcpts[0, :], 2),
-                np.round(hcpts[1, :], 2),
-                np.round(hcpts[2, :], 2),
-                np.round(hcpts[3, :], 2),
-                delta,
-                np.linalg.norm(delta),
-            ]
-        )
+        if sample_corners:
+            signs = hyper_cube_signs(n_vars, max_corners, rng)
 
-        if x0[0] == x1[0] and x0[1] == x1[1]:
-            delta = delta / 2
+        hcpts = hyper_cube_points(x0, delta, objective, signs)
+        best = np.argmin(hcpts[:, -1])
+
+        run.record([iter_count, *x0, f0, *hcpts[best], *delta, delta_mag])
+
+        if hcpts[best, -1] < f0:
+            x0, f0 = hcpts[best, :-1], hcpts[best, -1]
         else:
-            x0 = x1
+            delta = delta / 2
 
         iter_count += 1
         delta_mag = np.linalg.norm(delta)
 
-    return True
+    if delta_mag > epsilon:
+        return run.result(
+            x0, f0, "max_iterations", success=False, iterations=iter_count
+        )
+
+    return run.result(x0, f0, "converged", iterations=iter_count)
@@ -0,0 +1,376 @@
+from collections import deque
+
+import numpy as np
+
+from algorithms.single_var.bounding_phase import bracket_optimum
+from algorithms.single_var.golden_section import golden_section_interval
+from constants import gradient_headers, himmelblau_function
+from objective import Objective, as_objective
+from result import Result, SolverRun
+
+
+def box_step_limit(x: np.ndarray, direction: np.ndarray, min_pt, max_pt) -> float:
+    """
+    Largest step along direction which keeps x inside [min_pt, max_pt]
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limits = np.where(
+            direction > 0,
+            (max_pt - x) / direction,
+            np.where(direction < 0, (min_pt - x) / direction, np.inf),
+        )
+    return float(np.min(limits))
+
+
+def line_search(
+    objective,
+    x: np.ndarray,
+    direction: np.ndarray,
+    max_step: float,
+    delta: float,
+    tolerance: float = 1e-4,
+) -> float:
+    """
+    Find the step minimising f(x + step * direction) for a step in [0, max_step].
+    The minimum is bracketed with the bounding phase method starting from 0 with
+    step delta and then located with golden section search to within tolerance
+    times the length of the bracket.
+    """
+    if max_step <= 0:
+        return 0.0
+
+    # Steps beyond max_step are evaluated at max_step, so they are never better
+    phi = Objective(
+        lambda steps: objective(
+            x + np.multiply.outer(np.minimum(steps, max_step), direction)
+        )
+    )
+
+    bracket = bracket_optimum(phi, 0.0, min(delta, max_step), -np.inf, max_step)
+    if bracket is None:
+        # Still decreasing at the bound
+        return max_step
+
+    search = golden_section_interval(
+        phi, *bracket, tolerance * (bracket[1] - bracket[0])
+    )
+    return min((search.min_pt + search.max_pt) / 2, max_step)
+
+
+def steepest_descent_direction(s, y, gradient, old_gradient, direction):
+    return -gradient
+
+
+def fletcher_reeves_direction(s, y, gradient, old_gradient, direction):
+    beta = (gradient @ gradient) / (old_gradient @ old_gradient)
+    return -gradient + beta * direction
+
+
+def polak_ribiere_direction(s, y, gradient, old_gradient, direction):
+    # Clipped at 0, which restarts along the gradient when the directions lose
+    # conjugacy
+    beta = gradient @ (gradient - old_gradient) / (old_gradient @ old_gradient)
+    return -gradient + max(0.0, beta) * direction
+
+
+def bfgs_direction(n_vars: int):
+    """
+    Direction rule keeping a dense approximation H of the inverse hessian
+    """
+    H = None
+    identity = np.eye(n_vars)
+
+    def rule(s, y, gradient, old_gradient, direction):
+        nonlocal H
+        sy = s @ y
+        if sy <= 1e-12:
+            # Curvature condition failed, keep the current approximation
+            return -(H @ gradient) if H is not None else -gradient
+
+        if H is None:
+            H = (sy / (y @ y)) * identity
+
+        rho = 1 / sy
+        V = identity - rho * np.outer(s, y)
+        H = V @ H @ V.T + rho * np.outer(s, s)
+        return -(H @ gradient)
+
+    return rule
+
+
+def lbfgs_direction(memory: int):
+    """
+    Direction rule keeping only the last memory steps and gradient changes, which
+    are applied with the two loop recursion instead of storing H
+    """
+    pairs = deque(maxlen=memory)
+
+    def rule(s, y, gradient, old_gradient, direction):
+        sy = s @ y
+        if sy > 1e-12:
+            pairs.append((s, y, 1 / sy))
+
+        if not pairs:
+            return -gradient
+
+        q = gradient.copy()
+        alphas = []
+        for s_i, y_i, rho_i in reversed(pairs):
+            alpha = rho_i * (s_i @ q)
+            q -= alpha * y_i
+            alphas.append(alpha)
+
+        s_last, y_last, _ = pairs[-1]
+        r = (s_last @ y_last) / (y_last @ y_last) * q
+
+        for (s_i, y_i, rho_i), alpha in zip(pairs, reversed(alphas)):
+            r += s_i * (alpha - rho_i * (y_i @ r))
+
+        return -r
+
+    return rule
+
+
+def gradient_search(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None,
+    epsilon: float | None,
+    iter: int | None,
+    objective,
+    trace,
+    x0,
+    direction_rule,
+    rng=None,
+) -> Result:
+    """
+    Descent loop shared by the gradient based searches. They only differ in how
+    the next direction is found from the last step s, the change in gradient y,
+    the new and old gradients and the last direction.
+    Every point is kept inside [min_pt, max_pt] in every dimension. The result is
+    successful if the norm of the gradient fell below epsilon. Steps to points where
+    f or its gradient is not finite are rejected.
+
+    Working ->
+        1. Compute f(x) and its gradient g. See Objective.value_and_gradient
+        2. Drop the components of the direction d leaving the box at an active bound
+        3. If |g| < epsilon, then x is the solution
+        4. Find the step along d with the line search and move x. The line search
+           starts with a step of delta, or twice the last step if that is shorter
+        5. Find the next direction with the direction rule and go to step 2
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for gradient search")
+    if not iter:
+        iter = 100
+
+    objective = as_objective(objective, himmelblau_function, n_vars=2)
+    n_vars = objective.n_vars
+    run = SolverRun(objective, trace, gradient_headers(n_vars))
+
+    if x0 is None:
+        x0 = np.random.default_rng(rng).uniform(min_pt, max_pt, size=n_vars)
+    x = np.clip(np.array(x0, dtype=float).reshape(n_vars), min_pt, max_pt)
+    if not delta:
+        delta = 0.01 * (max_pt - min_pt) if np.isfinite(max_pt - min_pt) else 0.01
+
+    f, gradient = objective.value_and_gradient(x)
+    direction = -gradient
+    step = delta
+    run.record([0, *x, f, np.linalg.norm(gradient), 0, objective.n_evaluations])
+
+    if not (np.isfinite(f) and np.all(np.isfinite(gradient))):
+        return run.result(x, f, "no_progress", success=False)
+
+    for iter_count in range(1, iter + 1):
+        at_min, at_max = x <= min_pt, x >= max_pt
+        free_gradient = np.where(
+            (at_min & (gradient > 0)) | (at_max & (gradient < 0)), 0, gradient
+        )
+        if np.linalg.norm(free_gradient) < epsilon:
+            return run.result(x, f, "converged", iterations=iter_count - 1)
+
+        direction = np.where(
+            (at_min & (direction < 0)) | (at_max & (direction > 0)), 0, direction
+        )
+        if direction @ gradient >= 0:
+            # Not a descent direction, restart along the gradient
+            direction = -free_gradient
+
+        unit = direction / np.linalg.norm(direction)
+        step = line_search(
+            objective,
+            x,
+            unit,
+            box_step_limit(x, unit, min_pt, max_pt),
+            min(delta, 2 * step) if step > 0 else delta,
+        )
+        new_x = np.clip(x + step * unit, min_pt, max_pt)
+        new_f, new_gradient = objective.value_and_gradient(new_x)
+
+        run.record(
+            [
+                iter_count,
+                *new_x,
+                new_f,
+                np.linalg.norm(new_gradient),
+                step,
+                objective.n_evaluations,
+            ]
+        )
+
+        # Infinite values and gradients, eg. from finite differences across a
+        # barrier, are no progress either
+        if not (new_f < f and np.all(np.isfinite(new_gradient))):
+            if np.array_equal(direction, -free_gradient):
+                # Not even the gradient direction makes progress
+                return run.result(
+                    x, f, "no_progress", success=False, iterations=iter_count
+                )
+
+            direction = -free_gradient
+            continue
+
+        direction = direction_rule(
+            new_x - x, new_gradient - gradient, new_gradient, gradient, direction
+        )
+        x, f, gradient = new_x, new_f, new_gradient
+
+    return run.result(x, f, "max_iterations", success=False, iterations=iter)
+
+
+def steepest_descent(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = 100,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+) -> Result:
+    """
+    Move along the negative gradient at every iteration.
+    Starts from x0 or a random point in [min_pt, max_pt] drawn from rng (a numpy
+    Generator or a seed). delta is the first step of the line search.
+    Working ->
+        See gradient_search
+    """
+    return gradient_search(
+        min_pt,
+        max_pt,
+        delta,
+        epsilon,
+        iter,
+        objective,
+        trace,
+        x0,
+        steepest_descent_direction,
+        rng,
+    )
+
+
+def conjugate_gradient(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = 100,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+    method: str = "polak_ribiere",
+) -> Result:
+    """
+    Nonlinear conjugate gradient search. The next direction is
+    d = -g + beta * d where beta is
+        fletcher_reeves: |g|^2 / |g_old|^2
+        polak_ribiere: max(0, g . (g - g_old) / |g_old|^2)
+    Working ->
+        See gradient_search
+    """
+    rules = {
+        "fletcher_reeves": fletcher_reeves_direction,
+        "polak_ribiere": polak_ribiere_direction,
+    }
+    if method not in rules:
+        raise ValueError(f"method must be one of {', '.join(rules)}")
+
+    return gradient_search(
+        min_pt,
+        max_pt,
+        delta,
+        epsilon,
+        iter,
+        objective,
+        trace,
+        x0,
+        rules[method],
+        rng,
+    )
+
+
+def bfgs(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = 100,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+    memory: int | None = None,
+) -> Result:
+    """
+    Quasi newton search, the direction is d = -H g where H approximates the
+    inverse hessian from the steps taken so far. Set memory to use L-BFGS, which
+    keeps only the last memory steps instead of the dense H.
+    Working ->
+        See gradient_search
+    """
+    objective = as_objective(objective, himmelblau_function, n_vars=2)
+    if memory is None:
+        rule = bfgs_direction(objective.n_vars)
+    else:
+        rule = lbfgs_direction(memory)
+
+    return gradient_search(
+        min_pt, max_pt, delta, epsilon, iter, objective, trace, x0, rule, rng
+    )
+
+
+def lbfgs(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = 100,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+    memory: int = 10,
+) -> Result:
+    """
+    Limited memory BFGS. See bfgs
+    """
+    return bfgs(
+        min_pt,
+        max_pt,
+        delta,
+        epsilon,
+        iter,
+        is_minimising,
+        objective,
+        trace,
+        rng,
+        x0,
+        memory=memory,
+    )
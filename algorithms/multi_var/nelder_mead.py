@@ -0,0 +1,144 @@
+from math import factorial
+from typing import NamedTuple
+
+import numpy as np
+
+
+class NelderMeadResult(NamedTuple):
+    simplex: np.ndarray  # Final simplex sorted from best to worst vertex
+    fvals: np.ndarray  # Objective value of each vertex
+    iterations: int
+    converged: bool  # True if the spread of the vertex values fell below epsilon
+    n_evaluations: int  # Number of points evaluated by the search
+
+
+def simplex_volume(simplex: np.ndarray) -> float:
+    """
+    Volume of an n dimensional simplex with n + 1 vertices.
+    Found from the singular values of the edge matrix, so it works for any n.
+    """
+    edges = simplex[1:] - simplex[0]
+    n = edges.shape[1]
+    return float(np.prod(np.linalg.svd(edges, compute_uv=False)) / factorial(n))
+
+
+def nelder_mead(
+    objective,
+    simplex: np.ndarray,
+    epsilon: float,
+    iter: int = 100,
+    lb=None,
+    ub=None,
+    reflection: float = 1.0,
+    expansion: float = 2.0,
+    contraction: float = 0.5,
+    shrink: float = 0.5,
+    min_volume: float = 0.0,
+    restart=None,
+    callback=None,
+) -> NelderMeadResult:
+    """
+    N dimensional Nelder-Mead simplex search used by both the simplex implementations.
+
+    Args:
+        objective: Batched objective. See objective.Objective
+        simplex: Initial simplex of shape (n + 1, n)
+        epsilon: Stop when the spread of the vertex values is less than epsilon
+        iter: Maximum number of iterations
+        lb, ub: Optional bounds. Trial points are projected onto the bounds
+        reflection, expansion, contraction, shrink: Coefficients of the moves
+        min_volume: When the simplex volume falls below this, restart is called
+        restart: Called with the simplex when it is degenerate. Returns a new simplex
+            or None to carry on with the current one
+        callback: Called as callback(iteration, simplex, fvals, n_evaluations) after
+            every iteration
+
+    Working ->
+        1. Sort the vertices by their value and find the centroid c of all but the worst w
+        2. Reflect w to xr = c + reflection * (c - w)
+        3. If xr is better than the best vertex, try expanding to
+           xe = c + expansion * (c - w) and keep the better of xe and xr
+        4. Else if xr is better than the second worst vertex, replace w with xr
+        5. Else contract towards c, outside (xr is better than w) or inside,
+           and replace w if the contracted point is an improvement
+        6. Else shrink every vertex towards the best one
+        7. Terminate when the spread of the vertex values is less than epsilon
+
+    The vertex values are kept in an array alongside the simplex, so every iteration
+    only evaluates the new trial points. That is n + 1 evaluations to start with and
+    then per iteration at most 2, or 2 + n when the simplex shrinks (plus n + 1 on a
+    restart).
+    """
+    simplex = np.array(simplex, dtype=float)
+    n = simplex.shape[1]
+    assert simplex.shape == (n + 1, n), "Simplex must have n + 1 vertices"
+
+    def project(points):
+        if lb is None and ub is None:
+            return points
+        return np.clip(points, lb, ub)
+
+    simplex = project(simplex)
+    fvals = objective(simplex)
+    n_evaluations = n + 1
+    iter_count = 0
+    converged = False
+
+    while iter_count < iter:
+        order = np.argsort(fvals)
+        simplex = simplex[order]
+        fvals = fvals[order]
+
+        centroid = np.mean(simplex[:-1], axis=0)
+        direction = centroid - simplex[-1]
+
+        xr = project(centroid + reflection * direction)
+        fr = objective.value(xr)
+        n_evaluations += 1
+
+        if fr < fvals[0]:
+            xe = project(centroid + expansion * direction)
+            fe = objective.value(xe)
+            n_evaluations += 1
+            if fe < fr:
+                simplex[-1], fvals[-1] = xe, fe
+            else:
+                simplex[-1], fvals[-1] = xr, fr
+
+        elif fr < fvals[-2]:
+            simplex[-1], fvals[-1] = xr, fr
+
+        else:
+            outside = fr < fvals[-1]
+            step = direction if outside else -direction
+            xc = project(centroid + contraction * step)
+            fc = objective.value(xc)
+            n_evaluations += 1
+
+            if fc < (fr if outside else fvals[-1]):
+                simplex[-1], fvals[-1] = xc, fc
+            else:
+                simplex[1:] = simplex[0] + shrink * (simplex[1:] - simplex[0])
+                fvals[1:] = objective(simplex[1:])
+                n_evaluations += n
+
+        iter_count += 1
+
+        if restart is not None and simplex_volume(simplex) < min_volume:
+            new_simplex = restart(simplex)
+            if new_simplex is not None:
+                simplex = project(np.array(new_simplex, dtype=float))
+                fvals = objective(simplex)
+                n_evaluations += n + 1
+
+        if callback is not None:
+            callback(iter_count, simplex, fvals, n_evaluations)
+
+        if np.ptp(fvals) < epsilon:
+            converged = True
+            break
+
+    order = np.argsort(fvals)
+    return NelderMeadResult(
+        simplex[order], fvals[order], iter_count, converged, n_evaluations
+    )
@@ -1,33 +1,30 @@
 import numpy as np
 
-from constants import himmelblau_function, summary
+from algorithms.multi_var.nelder_mead import nelder_mead
+from constants import himmelblau_function, simplex_headers
+from objective import as_objective
+from result import Result, SolverRun
 
 
-def add_to_summary(iteration, simplex):
+def generate_initial_simplex(min_pt, max_pt, epsilon, n_vars=2, rng=None):
     """
-    Helper function to properly format the summary table.
-    Convert the nd array into a proper printable string for great output
+    Randomly generate n_vars + 1 points and return a nd array.
+    rng is a numpy Generator or a seed. None for a fresh unseeded generator
     """
 
-    summary_item = [iteration]
-    for point in simplex:
-        str = "("
-        for coordinate in point:
-            str += f"{round(coordinate, 3)}, "
+    return np.random.default_rng(rng).uniform(
+        min_pt + epsilon, max_pt - epsilon, size=(n_vars + 1, n_vars)
+    )
 
-        str = str[:-2]
-        str += ")"
-        summary_item.append(str)
 
-    summary.append(summary_item)
-
-
-def generate_initial_simplex(min_pt, max_pt, epsilon, n = 3):
+def simplex_around(x0, size, min_pt, max_pt) -> np.ndarray:
     """
-    Randomly generate n points and return a nd array. 
+    Simplex with x0 as a vertex and the other vertices size away from it along each
+    axis, or against the axis where that would leave [min_pt, max_pt]
     """
-
-    return np.random.uniform(min_pt + epsilon, max_pt - epsilon, size=(n, 2))
+    x0 = np.asarray(x0, dtype=float)
+    steps = np.where(x0 + size > max_pt, -size, size)
+    return np.vstack([x0, x0 + np.diag(steps)])
 
 
 def simplex_search(
@@ -37,52 +34,55 @@ def simplex_search(
     epsilon: float | None = None,
     iter: int | None = 100,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+    x0=None,
+) -> Result:
     """
-    TODO: This doesn't use min_pt and max_pt. This is a todo. Randomly generate the initial simplex
+    Randomly generate the initial simplex inside [min_pt, max_pt] in every dimension
+    from rng (a numpy Generator or a seed) and run the Nelder-Mead search on it.
+    Given x0, start from a simplex around x0 with sides delta (5% of the interval
+    by default) instead. Trial points are projected onto [min_pt, max_pt].
+    The number of variables is taken from the objective, which defaults to the 2
+    variable himmelblau function.
     Working ->
+        See algorithms.multi_var.nelder_mead
     """
     if not epsilon:
         raise ValueError("Must provide epsilon for evolutionary search")
 
-    # Initial simplex
-    initial_simplex = generate_initial_simplex(min_pt, max_pt, epsilon)
-    n = len(initial_simplex[0])
-    simplex = np.array(initial_simplex)
-    add_to_summary(0, simplex)
-
-    for i in range(iter):
-        simplex = simplex[
-            np.argsort([himmelblau_function(x[0], x[1]) for x in simplex])
-        ]
-        centroid = np.mean(simplex[:-1], axis=0)
-
-        x2 = centroid + (centroid - simplex[-1])
-        if (
-            himmelblau_function(*simplex[0])
-            <= himmelblau_function(*x2)
-            < himmelblau_function(*simplex[-2])
-        ):
-            simplex[-1] = x2
-        else:
-            if himmelblau_function(*x2) < himmelblau_function(*simplex[0]):
-                x1 = centroid + 2 * (x2 - centroid)
-                if himmelblau_function(*x1) < himmelblau_function(*x2):
-                    simplex[-1] = x1
-                else:
-                    simplex[-1] = x2
-            else:
-                x0 = centroid + 0.5 * (simplex[-1] - centroid)
-                if himmelblau_function(*x0) < himmelblau_function(*simplex[-1]):
-                    simplex[-1] = x0
-                else:
-                    for i in range(1, n):
-                        simplex[i] = simplex[0] + 0.5 * (simplex[i] - simplex[0])
+    objective = as_objective(objective, himmelblau_function, n_vars=2, cache=False)
+    run = SolverRun(objective, trace, simplex_headers(objective.n_vars))
 
-        if np.all(
-            np.abs(himmelblau_function(*simplex[0]) - himmelblau_function(*simplex[-1]))
-            < epsilon
-        ):
-            break
-
-        add_to_summary(i, simplex)
+    # Initial simplex
+    if x0 is not None:
+        size = delta if delta else 0.05 * (max_pt - min_pt)
+        simplex = simplex_around(
+            np.reshape(x0, objective.n_vars), size, min_pt, max_pt
+        )
+    else:
+        simplex = generate_initial_simplex(
+            min_pt, max_pt, epsilon, objective.n_vars, rng
+        )
+    run.record([0, *simplex.ravel(), 0])
+
+    search = nelder_mead(
+        objective,
+        simplex,
+        epsilon,
+        iter,
+        lb=min_pt,
+        ub=max_pt,
+        callback=lambda i, simplex, fvals, n_evaluations: run.record(
+            [i, *simplex.ravel(), n_evaluations]
+        ),
+    )
+
+    return run.result(
+        search.simplex[0],
+        search.fvals[0],
+        "converged" if search.converged else "max_iterations",
+        success=search.converged,
+        iterations=search.iterations,
+    )
@@ -0,0 +1,350 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import GAMMA, objective_function
+from derivatives import finite_differences
+from objective import Objective
+
+
+class BatchResult(NamedTuple):
+    x: np.ndarray  # Optimum found for every problem
+    fx: np.ndarray  # Objective value at x
+    min_pt: np.ndarray  # Final interval of every problem. Equal to x for newton
+    max_pt: np.ndarray
+    iterations: np.ndarray  # Iterations taken by every problem
+    converged: np.ndarray  # False for problems which ran out of iterations
+
+
+def make_evaluator(objective, params, is_minimising):
+    """
+    Returns evaluate(x, problems) which evaluates the points x belonging to the given
+    problem indices in a single call. Maxima are found by minimising -f.
+
+    Without params the objective is f(x) and can be an Objective or a plain function.
+    With params the objective is a plain function f(x, params) and every point
+    gets the params of its problem, ie. params[problems].
+    """
+    sign = 1.0 if is_minimising else -1.0
+
+    if objective is None:
+        objective = objective_function
+
+    if params is None:
+        if not isinstance(objective, Objective):
+            # No cache, keying every point would cost more than evaluating it here
+            objective = Objective(objective)
+
+        return lambda x, problems: sign * objective(x)
+
+    params = np.asarray(params)
+    return lambda x, problems: sign * np.asarray(
+        objective(x, params[problems]), dtype=float
+    )
+
+
+def broadcast_intervals(min_pts, max_pts):
+    min_pts, max_pts = np.broadcast_arrays(
+        np.asarray(min_pts, dtype=float), np.asarray(max_pts, dtype=float)
+    )
+    assert min_pts.ndim == 1, "Intervals must be 1 dimensional arrays"
+    assert np.all(min_pts < max_pts), "min_pt must be less than max_pt"
+    return min_pts.copy(), max_pts.copy()
+
+
+def golden_section_batch(
+    min_pts,
+    max_pts,
+    epsilon: float,
+    iter: int = 100,
+    is_minimising: bool = True,
+    objective=None,
+    params=None,
+) -> BatchResult:
+    """
+    Golden section search on many independent intervals at once.
+    Every iteration advances all the unconverged intervals with one call to the
+    objective. Intervals shorter than epsilon are retired and not evaluated again.
+
+    Working ->
+        1. Place x1 and x2 at the golden section points of every interval
+        2. Where f(x1) < f(x2) the interval becomes [min_pt, x2], else [x1, max_pt]
+        3. The kept point is reused and only the other one is evaluated
+        4. Repeat until the interval is shorter than epsilon or iter runs out
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for golden section search")
+
+    evaluate = make_evaluator(objective, params, is_minimising)
+    a, b = broadcast_intervals(min_pts, max_pts)
+    n = len(a)
+    problems = np.arange(n)
+
+    x1 = b - (b - a) / GAMMA
+    x2 = a + (b - a) / GAMMA
+    f1, f2 = evaluate(np.concatenate([x1, x2]), np.tile(problems, 2)).reshape(2, n)
+
+    iterations = np.zeros(n, dtype=int)
+    active = (b - a) >= epsilon
+
+    for _ in range(iter):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+
+        left = f1[idx] < f2[idx]
+        keep_left, keep_right = idx[left], idx[~left]
+
+        # Keep [a, x2]: x2 moves to x1 and a new x1 is placed
+        b[keep_left] = x2[keep_left]
+        x2[keep_left], f2[keep_left] = x1[keep_left], f1[keep_left]
+        x1[keep_left] = a[keep_left] + b[keep_left] - x2[keep_left]
+
+        # Keep [x1, b]: x1 moves to x2 and a new x2 is placed
+        a[keep_right] = x1[keep_right]
+        x1[keep_right], f1[keep_right] = x2[keep_right], f2[keep_right]
+        x2[keep_right] = a[keep_right] + b[keep_right] - x1[keep_right]
+
+        new_values = evaluate(
+            np.concatenate([x1[keep_left], x2[keep_right]]),
+            np.concatenate([keep_left, keep_right]),
+        )
+        f1[keep_left] = new_values[: len(keep_left)]
+        f2[keep_right] = new_values[len(keep_left) :]
+
+        iterations[idx] += 1
+        active[idx] = (b[idx] - a[idx]) >= epsilon
+
+    first = f1 < f2
+    sign = 1.0 if is_minimising else -1.0
+    return BatchResult(
+        x=np.where(first, x1, x2),
+        fx=sign * np.where(first, f1, f2),
+        min_pt=a,
+        max_pt=b,
+        iterations=iterations,
+        converged=~active,
+    )
+
+
+def interval_halving_batch(
+    min_pts,
+    max_pts,
+    epsilon: float,
+    iter: int = 100,
+    is_minimising: bool = True,
+    objective=None,
+    params=None,
+) -> BatchResult:
+    """
+    Interval halving on many independent intervals at once.
+    Every iteration evaluates x1 and x2 of all the unconverged intervals in one call,
+    the value at the mean point is carried over from the previous iteration.
+
+    Working ->
+        1. Calculate xm = (min_pt + max_pt) / 2, x1 = min_pt + L / 4 and x2 = max_pt - L / 4
+        2. Where f(x1) < f(xm) set max_pt = xm, else where f(x2) < f(xm) set min_pt = xm,
+           else set min_pt = x1 and max_pt = x2
+        3. Repeat until L < epsilon or iter runs out
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for interval halving")
+
+    evaluate = make_evaluator(objective, params, is_minimising)
+    a, b = broadcast_intervals(min_pts, max_pts)
+    n = len(a)
+
+    xm = (a + b) / 2
+    fm = evaluate(xm, np.arange(n))
+
+    iterations = np.zeros(n, dtype=int)
+    active = (b - a) >= epsilon
+
+    for _ in range(iter):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+
+        L = b[idx] - a[idx]
+        x1 = a[idx] + L / 4
+        x2 = b[idx] - L / 4
+        f1, f2 = evaluate(np.concatenate([x1, x2]), np.tile(idx, 2)).reshape(2, -1)
+
+        first = f1 < fm[idx]
+        second = ~first & (f2 < fm[idx])
+        middle = ~first & ~second
+
+        b[idx[first]] = xm[idx[first]]
+        xm[idx[first]], fm[idx[first]] = x1[first], f1[first]
+
+        a[idx[second]] = xm[idx[second]]
+        xm[idx[second]], fm[idx[second]] = x2[second], f2[second]
+
+        a[idx[middle]], b[idx[middle]] = x1[middle], x2[middle]
+
+        iterations[idx] += 1
+        active[idx] = (b[idx] - a[idx]) >= epsilon
+
+    sign = 1.0 if is_minimising else -1.0
+    return BatchResult(
+        x=xm,
+        fx=sign * fm,
+        min_pt=a,
+        max_pt=b,
+        iterations=iterations,
+        converged=~active,
+    )
+
+
+def bisection_batch(
+    min_pts,
+    max_pts,
+    epsilon: float,
+    iter: int = 100,
+    is_minimising: bool = True,
+    objective=None,
+    params=None,
+    h: float | None = None,
+) -> BatchResult:
+    """
+    Bisection on the derivative of many independent intervals at once.
+    Derivatives are central differences with step h, see derivatives.finite_differences.
+    Problems without f'(min_pt) < 0 < f'(max_pt) are not searched and are reported
+    as not converged.
+
+    Working ->
+        1. Set x = (min_pt + max_pt) / 2
+        2. Where f'(x) > 0 set max_pt = x, where f'(x) < 0 set min_pt = x
+        3. Repeat until |f'(x)| < epsilon or iter runs out
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for bisection")
+
+    evaluate = make_evaluator(objective, params, is_minimising)
+    a, b = broadcast_intervals(min_pts, max_pts)
+    n = len(a)
+    problems = np.arange(n)
+
+    def derivatives(x, idx):
+        fx, fx_derivative, _ = finite_differences(
+            lambda points: evaluate(points.ravel(), np.tile(idx, 3)).reshape(3, -1),
+            x,
+            h,
+        )
+        return fx, fx_derivative
+
+    _, fa_derivative = derivatives(a, problems)
+    _, fb_derivative = derivatives(b, problems)
+    valid = (fa_derivative < 0) & (fb_derivative > 0)
+
+    x = (a + b) / 2
+    fx = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    active = valid.copy()
+
+    for _ in range(iter):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+
+        x[idx] = (a[idx] + b[idx]) / 2
+        fx[idx], fx_derivative = derivatives(x[idx], idx)
+        iterations[idx] += 1
+
+        done = np.abs(fx_derivative) < epsilon
+        converged[idx[done]] = True
+        active[idx[done]] = False
+
+        positive = ~done & (fx_derivative > 0)
+        negative = ~done & (fx_derivative < 0)
+        b[idx[positive]] = x[idx[positive]]
+        a[idx[negative]] = x[idx[negative]]
+
+    sign = 1.0 if is_minimising else -1.0
+    return BatchResult(
+        x=x,
+        fx=sign * fx,
+        min_pt=a,
+        max_pt=b,
+        iterations=iterations,
+        converged=converged,
+    )
+
+
+def newton_raphson_batch(
+    min_pts,
+    max_pts,
+    epsilon: float,
+    iter: int = 100,
+    is_minimising: bool = True,
+    objective=None,
+    params=None,
+    x0=None,
+    h: float | None = None,
+) -> BatchResult:
+    """
+    Newton-Raphson on many independent problems at once.
+    f(x), f'(x) and f''(x) of every unconverged problem come from a single call to
+    the objective, using central differences with step h. See
+    derivatives.finite_differences.
+    Steps are kept within [min_pt, max_pt]. Starts from x0, or the middle of the
+    intervals if not given.
+
+    Working ->
+        1. Compute f'(x) and f''(x)
+        2. Where |f'(x)| < epsilon the problem has converged
+        3. Else set x = x - f'(x) / f''(x)
+        4. Repeat until every problem has converged or iter runs out
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for newton raphson")
+
+    evaluate = make_evaluator(objective, params, is_minimising)
+    a, b = broadcast_intervals(min_pts, max_pts)
+    n = len(a)
+
+    x = (a + b) / 2 if x0 is None else np.broadcast_to(x0, n).astype(float)
+    fx = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    active = np.ones(n, dtype=bool)
+
+    for _ in range(iter):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+
+        xi = x[idx]
+        fx[idx], f_derivative, f_double_derivative = finite_differences(
+            lambda points: evaluate(points.ravel(), np.tile(idx, 3)).reshape(3, -1),
+            xi,
+            h,
+        )
+        iterations[idx] += 1
+
+        done = np.abs(f_derivative) < epsilon
+        converged[idx[done]] = True
+        active[idx[done]] = False
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = f_derivative / f_double_derivative
+
+        # A flat second derivative gives no usable step, so the problem is dropped
+        failed = ~done & ~np.isfinite(step)
+        active[idx[failed]] = False
+
+        moving = ~done & ~failed
+        x[idx[moving]] = np.clip(
+            xi[moving] - step[moving], a[idx[moving]], b[idx[moving]]
+        )
+
+    sign = 1.0 if is_minimising else -1.0
+    return BatchResult(
+        x=x,
+        fx=sign * fx,
+        min_pt=x,
+        max_pt=x,
+        iterations=iterations,
+        converged=converged,
+    )
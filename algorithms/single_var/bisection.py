@@ -1,7 +1,8 @@
 import numpy as np
 
-from constants import objective_function, summary
-from utils import find_derivative
+from constants import headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
 
 
 def bisection(
@@ -11,7 +12,10 @@ def bisection(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. set x = (a + b) / 2 where f'(a) < 0 and f'(b) > 0
@@ -19,19 +23,23 @@ def bisection(
         3. If f'(x) < 0, then set a = x
         4. If f'(x) = 0, then stop
         5. Repeat steps 1-4 until |f'(x)| < epsilon
+
+    The derivatives at a, b and x come from a single objective.derivatives call.
     """
     if not epsilon:
         raise ValueError("Must provide epsilon for newton raphson")
 
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["bisection"])
+
     iter_count = 0
     fx_derivative = 1000
 
     while np.abs(fx_derivative) > epsilon:
         x = (min_pt + max_pt) / 2
-        fa_derivative = find_derivative(objective_function, min_pt)
-        fb_derivative = find_derivative(objective_function, max_pt)
-        fx_derivative = find_derivative(objective_function, x)
-        summary.append(
+        values, derivatives, _ = objective.derivatives(np.array([min_pt, max_pt, x]))
+        fa_derivative, fb_derivative, fx_derivative = derivatives
+        run.record(
             [
                 iter_count,
                 min_pt,
@@ -40,7 +48,7 @@ def bisection(
                 fa_derivative,
                 fb_derivative,
                 fx_derivative,
-                objective_function(x),
+                values[2],
             ]
         )
 
@@ -48,13 +56,16 @@ def bisection(
             fa_derivative < 0 and fb_derivative > 0
         ), "f'(a) must be less than 0 and f'(b) must be greater than 0"
 
+        bracket = (min_pt, max_pt)
         if fx_derivative > 0:
             max_pt = x
         elif fx_derivative < 0:
             min_pt = x
-        else:
-            break
 
         iter_count += 1
+        if fx_derivative == 0:
+            break
 
-    return True
+    return run.result(
+        x, values[2], "converged", bracket=bracket, iterations=iter_count
+    )
@@ -1,8 +1,8 @@
-import random
-
 import numpy as np
 
-from constants import objective_function, summary
+from constants import headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
 
 
 def bounding_phase(
@@ -12,7 +12,10 @@ def bounding_phase(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. Find x0 such that f(x0 - delta) >= f(x0) >= f(x0 + delta) or vice versa
@@ -21,23 +24,29 @@ def bounding_phase(
         4. Find x(k + 1) aka xkp1 = xk + 2^k * delta
         5. If f(xk) <= f(xkp1) then we have found the minima (and vice versa for maxima)
         6. Else, set xkm1 = xk and xk = xkp1 and go to step 4
+
+    The random x0 is drawn from rng, a numpy Generator or a seed.
     """
     x0 = -1
-    k = 0
 
     if not delta:
         raise ValueError("Must provide delta for bounding phase")
 
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["bounding_phase"])
+
+    rng = np.random.default_rng(rng)
     tries = 100  # Max tries to initiliase x0
     while tries:
-        x0 = round(random.uniform(min_pt, max_pt), 2)
+        x0 = round(rng.uniform(min_pt, max_pt), 2)
         if x0 - delta < min_pt or x0 + delta > max_pt:
             tries -= 1
             continue
 
-        f0 = objective_function(x0 - np.abs(delta))
-        f1 = objective_function(x0)
-        f2 = objective_function(x0 + np.abs(delta))
+        f0, f1, f2 = objective([x0 - np.abs(delta), x0, x0 + np.abs(delta)])
+        if not is_minimising:
+            # Moving towards a maxima of f is moving towards a minima of -f
+            f0, f1, f2 = -f0, -f1, -f2
 
         if f0 >= f1 and f1 >= f2:
             break
@@ -48,30 +57,61 @@ def bounding_phase(
         tries -= 1
 
     if tries == 0:
-        print("Could not find a suitable x0")
-        return False
+        return run.result(None, None, "no_start", success=False)
+
+    last_row = None
+
+    def record(*row):
+        nonlocal last_row
+        last_row = row
+        run.record(list(row))
+
+    bracket = bracket_optimum(
+        objective, x0, delta, min_pt, max_pt, is_minimising, callback=record
+    )
+
+    # xk of the last iteration is the best point found
+    iter_count, _, xk, _, fxk, _ = last_row
+    if bracket is None:
+        return run.result(
+            xk, fxk, "out_of_bounds", success=False, iterations=iter_count
+        )
 
+    return run.result(xk, fxk, "bracketed", bracket=bracket, iterations=iter_count)
+
+
+def bracket_optimum(
+    objective,
+    x0: float,
+    delta: float,
+    min_pt: float,
+    max_pt: float,
+    is_minimising: bool = True,
+    callback=None,
+) -> tuple[float, float] | None:
+    """
+    Steps 2 to 6 of bounding_phase, also used by the line search of the gradient
+    based solvers. delta must already point downhill (uphill for maxima).
+    Returns the bracket (xkm1, xkp1) in increasing order or None if the search
+    left [min_pt, max_pt]. callback is called with the summary row of every iteration.
+    """
+    k = 0
     xk = x0
     xkm1 = x0
     iter_count = 0
     while xkm1 > min_pt and xk < max_pt:
         iter_count += 1
         xkp1 = xk + 2**k * delta
-        fxk = objective_function(xk)
-        fxkp1 = objective_function(xkp1)
-
-        summary.append([iter_count, xkm1, xk, xkp1, fxk, fxkp1])
+        fxk, fxkp1 = objective([xk, xkp1])
 
-        if is_minimising and fxk <= fxkp1:
-            print("Found minima")
-            return True
+        if callback is not None:
+            callback(iter_count, xkm1, xk, xkp1, fxk, fxkp1)
 
-        elif not is_minimising and fxk >= fxkp1:
-            print("Found maxima")
-            return True
+        if (is_minimising and fxk <= fxkp1) or (not is_minimising and fxk >= fxkp1):
+            return min(xkm1, xkp1), max(xkm1, xkp1)
 
         k += 1
         xkm1 = xk
         xk = xkp1
 
-    return False
+    return None
@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+from algorithms.single_var.bounding_phase import bounding_phase
+from constants import GAMMA, headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
+
+CGOLD = 2 - GAMMA  # Fraction of the larger segment taken by a golden section step
+
+
+def brent(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = None,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
+    """
+    Brent's method. Brackets the optimum with bounding phase, then fits a parabola
+    through the three best points and steps to its vertex. Whenever the parabolic
+    step is not trusted a golden section step is taken instead, so the interval
+    never shrinks slower than with golden section search while smooth functions
+    converge superlinearly.
+    delta is the step of bounding phase, 1% of the interval by default. epsilon is
+    the final length of the interval. rng (a numpy Generator or a seed) draws the
+    start of bounding phase.
+
+    Working ->
+        1. Find a bracket (a, b) and a point x inside it with bounding phase. If
+           bounding phase fails, use [min_pt, max_pt]
+        2. Keep the best point x, the second best w and the previous w as v
+        3. If the interval is shorter than epsilon around x, then x is the solution
+        4. Fit a parabola through x, w and v. Its vertex u is accepted if it lies
+           inside (a, b) and the step is less than half the step before last
+        5. Else, u is the golden section point of the larger segment of (a, b)
+           around x
+        6. Evaluate f(u), shrink (a, b) to keep the optimum inside, update x, w and
+           v and go to step 3
+    """
+    if not epsilon:
+        raise ValueError("Must provide epsilon for brent")
+    if not iter:
+        iter = 100
+    if not delta:
+        delta = (max_pt - min_pt) / 100
+
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["brent"])
+
+    # Maxima are found as minima of -f
+    sign = 1 if is_minimising else -1
+
+    bracketing = bounding_phase(
+        min_pt,
+        max_pt,
+        delta,
+        is_minimising=is_minimising,
+        objective=objective,
+        rng=rng,
+    )
+    if bracketing.success:
+        a, b = bracketing.bracket
+        x, fx = bracketing.x, sign * bracketing.fun
+    else:
+        a, b = min_pt, max_pt
+        x = a + CGOLD * (b - a)
+        fx = sign * objective.value(x)
+
+    w, fw = x, fx
+    v, fv = x, fx
+    d = 0.0  # Last step
+    e = 0.0  # Step before last
+
+    for iter_count in range(iter):
+        xm = (a + b) / 2
+        # Smallest step which still changes x, and at most a quarter of epsilon
+        tol1 = epsilon / 4 + np.finfo(float).eps * abs(x)
+        tol2 = 2 * tol1
+        if abs(x - xm) <= tol2 - (b - a) / 2:
+            return run.result(
+                x,
+                sign * fx,
+                "converged",
+                bracket=(a, b),
+                iterations=iter_count,
+            )
+
+        parabolic = False
+        if abs(e) > tol1:
+            # Vertex of the parabola through (x, fx), (w, fw), (v, fv) is x + p / q
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+
+            parabolic = (
+                abs(p) < abs(q * e / 2) and q * (a - x) < p and p < q * (b - x)
+            )
+
+        if parabolic:
+            e = d
+            d = p / q
+            # Do not evaluate too close to the ends of the interval
+            if (x + d) - a < tol2 or b - (x + d) < tol2:
+                d = math.copysign(tol1, xm - x)
+        else:
+            e = a - x if x >= xm else b - x
+            d = CGOLD * e
+
+        u = x + d if abs(d) >= tol1 else x + math.copysign(tol1, d)
+        fu = sign * objective.value(u)
+
+        run.record([iter_count + 1, a, b, x, sign * fx, u, sign * fu, parabolic])
+
+        if fu <= fx:
+            if u >= x:
+                a = x
+            else:
+                b = x
+            v, fv = w, fw
+            w, fw = x, fx
+            x, fx = u, fu
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, fv = w, fw
+                w, fw = u, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+
+    return run.result(
+        x,
+        sign * fx,
+        "max_iterations",
+        success=False,
+        bracket=(a, b),
+        iterations=iter,
+    )
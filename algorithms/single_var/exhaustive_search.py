@@ -1,4 +1,18 @@
-from constants import objective_function, summary
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import headers_dict, objective_function
+from objective import Objective, as_objective
+from result import Result, SolverRun
+
+
+class ScanResult(NamedTuple):
+    indices: np.ndarray  # Grid index of x2 of every bracket
+    points: np.ndarray  # (x1, x2, x3) of every bracket, one row per bracket
+    values: np.ndarray  # (f1, f2, f3) of every bracket
+    n_points: int  # Number of grid points evaluated
+    n_chunks: int  # Number of calls made to the objective
 
 
 def exhaustive_search(
@@ -8,8 +22,17 @@ def exhaustive_search(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+    vectorized: bool = False,
+    chunk_size: int = 1 << 20,
+) -> Result:
     """
+    Set vectorized to evaluate the whole grid in chunks of chunk_size points with
+    exhaustive_scan instead of stepping through it. Every bracket found is then
+    recorded in the summary and the result is the best of them.
+
     Working ->
         1. Start with x1 = min_pt, x2 = x1 + delta, x3 = x2 + delta
         2. If f(x1) > f(x2) < f(x3) then we have found the minima (and vice versa for maxima)
@@ -19,6 +42,14 @@ def exhaustive_search(
     if not delta:
         raise ValueError("Must provide delta for exhaustive search")
 
+    if vectorized:
+        return exhaustive_grid_search(
+            min_pt, max_pt, delta, is_minimising, objective, trace, chunk_size
+        )
+
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["exhaustive_search"])
+
     x1 = min_pt
     x2 = x1 + delta
     x3 = x2 + delta
@@ -26,23 +57,104 @@ def exhaustive_search(
     iter_count: int = 0
 
     while x3 < max_pt:
-        f1 = objective_function(x1)
-        f2 = objective_function(x2)
-        f3 = objective_function(x3)
+        f1, f2, f3 = objective([x1, x2, x3])
 
         iter_count += 1
-        summary.append([iter_count, x1, x2, x3, f1, f2, f3])
+        run.record([iter_count, x1, x2, x3, f1, f2, f3])
 
-        if is_minimising and (f1 > f2 and f2 < f3):
-            print("Found minima")
-            return True
-
-        elif not is_minimising and (f1 < f2 and f2 > f3):
-            print("Found maxima")
-            return True
+        if (is_minimising and (f1 > f2 and f2 < f3)) or (
+            not is_minimising and (f1 < f2 and f2 > f3)
+        ):
+            return run.result(
+                x2, f2, "bracketed", bracket=(x1, x3), iterations=iter_count
+            )
 
         x1 = x2
         x2 = x1 + delta
         x3 = x2 + delta
 
-    return False
+    return run.result(
+        None, None, "out_of_bounds", success=False, iterations=iter_count
+    )
+
+
+def exhaustive_grid_search(
+    min_pt: float,
+    max_pt: float,
+    delta: float,
+    is_minimising: bool,
+    objective,
+    trace,
+    chunk_size: int,
+) -> Result:
+    if not isinstance(objective, Objective):
+        # Grid points are never evaluated twice, so plain functions are not cached
+        objective = Objective(objective or objective_function)
+    run = SolverRun(objective, trace, headers_dict["exhaustive_search"])
+
+    scan = exhaustive_scan(objective, min_pt, max_pt, delta, is_minimising, chunk_size)
+    for index, points, values in zip(scan.indices, scan.points, scan.values):
+        run.record([index, *points, *values])
+
+    if not len(scan.indices):
+        return run.result(
+            None, None, "out_of_bounds", success=False, iterations=scan.n_chunks
+        )
+
+    f2 = scan.values[:, 1]
+    best = np.argmin(f2) if is_minimising else np.argmax(f2)
+    x1, x2, x3 = scan.points[best]
+    return run.result(
+        x2, f2[best], "bracketed", bracket=(x1, x3), iterations=scan.n_chunks
+    )
+
+
+def exhaustive_scan(
+    objective,
+    min_pt: float,
+    max_pt: float,
+    delta: float,
+    is_minimising: bool = True,
+    chunk_size: int = 1 << 20,
+) -> ScanResult:
+    """
+    Evaluate the grid min_pt, min_pt + delta, ... below max_pt, chunk_size points
+    at a time, and find every x2 with f(x1) > f(x2) < f(x3) (and vice versa for
+    maxima) where x1 and x3 are its neighbours on the grid. The last two points of
+    a chunk are carried over so brackets across chunks are found too.
+    """
+    n_points = max(int(np.ceil((max_pt - min_pt) / delta)), 0)
+    chunk_size = max(chunk_size, 3)
+
+    found = []
+    carried = np.empty(0, dtype=np.int64)
+    carried_values = np.empty(0)
+    n_chunks = 0
+
+    for start in range(0, n_points, chunk_size):
+        stop = min(start + chunk_size, n_points)
+        values = objective(min_pt + delta * np.arange(start, stop))
+        n_chunks += 1
+
+        indices = np.concatenate([carried, np.arange(start, stop)])
+        values = np.concatenate([carried_values, values])
+        carried, carried_values = indices[-2:], values[-2:]
+
+        signed = values if is_minimising else -values
+        middle = np.flatnonzero(
+            (signed[:-2] > signed[1:-1]) & (signed[1:-1] < signed[2:])
+        )
+        if len(middle):
+            middle += 1
+            neighbours = np.stack([middle - 1, middle, middle + 1], axis=1)
+            found.append((indices[middle], values[neighbours]))
+
+    if found:
+        indices = np.concatenate([f[0] for f in found])
+        values = np.concatenate([f[1] for f in found])
+    else:
+        indices = np.empty(0, dtype=np.int64)
+        values = np.empty((0, 3))
+
+    points = min_pt + delta * (indices[:, None] + np.arange(-1, 2))
+    return ScanResult(indices, points, values, n_points, n_chunks)
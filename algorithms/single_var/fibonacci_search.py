@@ -1,17 +1,48 @@
 from functools import lru_cache
 
-from constants import objective_function, summary
+import numpy as np
+
+from constants import headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
 
 
-@lru_cache(None)
 def fibonacci(num: int) -> int:
     if num < 0:
         raise ValueError("Cannot find fibonacci of negative numbers")
 
-    elif num < 2:
-        return num
+    previous, current = 0, 1
+    for _ in range(num):
+        previous, current = current, previous + current
+
+    return previous
+
+
+@lru_cache(maxsize=16)
+def fibonacci_steps(n: int) -> np.ndarray:
+    """
+    Table of F(m) / F(m + 2) for m = 0, 1, ..., n - 1, the fraction of the current
+    interval between each end and the nearest point of fibonacci search when m + 2
+    interval reductions are left. The table is built once per n and shared between
+    runs.
+
+    The fractions are found without big integers from the consecutive ratios
+    F(m) / F(m + 1) = 1 / (1 + F(m - 1) / F(m)), which are all between 0.5 and 1,
+    so the table stays accurate for any n.
+    """
+    if n < 0:
+        raise ValueError("Cannot find fibonacci of negative numbers")
+
+    # consecutive[m] = F(m) / F(m + 1)
+    consecutive = np.zeros(n + 1)
+    if n > 0:
+        consecutive[1] = 1.0
+    for m in range(2, n + 1):
+        consecutive[m] = 1 / (1 + consecutive[m - 1])
 
-    return fibonacci(num - 1) + fibonacci(num - 2)
+    steps = consecutive[:-1] * consecutive[1:]
+    steps.flags.writeable = False
+    return steps
 
 
 def fibonnacci_seatch(
@@ -21,70 +52,92 @@ def fibonnacci_seatch(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-    iter_count=0,
-    k=2,
-    L=None,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. Find the number of iterations required to find the minimum. If not specified, it will be 100.
-        2. Find the length of the interval. This will stay the same throughout the iterations.
-        3. Find the L2 which will be ratio of L times (n-k+1)th fibonacci number to (n+1)th fibonacci number.
+        2. Find the length L of the current interval.
+        3. Find the L2 which will be ratio of L times (n-k+1)th fibonacci number to (n-k+3)th fibonacci number.
         4. Find the x1 and x2 which will be min_pt + L2 and max_pt - L2 respectively.
         5. Find the value of the objective function at x1 and x2.
         6. If the value of the objective function at x1 is less than the value of the objective function at x2, then the new interval will be [min_pt, x2] and if the value of the objective function at x1 is greater than the value of the objective function at x2, then the new interval will be [x1, max_pt].
-        7. Repeat till we reach number of iteration of value of L2 is less than epsilon or greater than delta.
+           If they are equal, the new interval will be [x1, x2].
+        7. Repeat till we reach number of iteration or the interval is shorter than epsilon.
+
+    The point kept inside the new interval is always one of the next x1 and x2,
+    so only one new evaluation is needed per iteration after the first one.
     """
-    if not L:
-        L = max_pt - min_pt
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["fibonacci_search"])
+
+    L = max_pt - min_pt
     if not iter:
         iter = 100
 
     if delta and delta > L:
-        if is_minimising:
-            print("Found minima")
+        x = (min_pt + max_pt) / 2
+        return run.result(
+            x, objective.value(x), "converged", bracket=(min_pt, max_pt)
+        )
+
+    steps = fibonacci_steps(iter)
+    iter_count = 0
+    kept = None  # Point (and its value) carried over to the next iteration
+    best = None
+
+    def result(reason):
+        x, fx = best if best is not None else ((min_pt + max_pt) / 2, None)
+        if fx is None:
+            fx = objective.value(x)
+        return run.result(
+            x, fx, reason, bracket=(min_pt, max_pt), iterations=iter_count
+        )
+
+    for k in range(2, iter + 1):
+        # Taken from the current interval, which is not shrunk by the fibonacci
+        # ratio when the values at x1 and x2 are equal
+        lk = steps[iter - k + 1] * (max_pt - min_pt)
+
+        if epsilon and max_pt - min_pt < epsilon:
+            return result("converged")
+
+        if kept is None:
+            x1 = min_pt + lk
+            x2 = max_pt - lk
+
+            fx1, fx2 = objective([x1, x2])
         else:
-            print("Found maxima")
-        return True
+            # The new point is the mirror image of the kept point in the interval
+            x_kept, f_kept = kept
+            x_new = min_pt + max_pt - x_kept
+            f_new = objective.value(x_new)
 
-    if k > iter:
-        return True
+            if x_new < x_kept:
+                x1, fx1, x2, fx2 = x_new, f_new, x_kept, f_kept
+            else:
+                x1, fx1, x2, fx2 = x_kept, f_kept, x_new, f_new
 
-    lk = fibonacci(iter - k + 1) / fibonacci(iter + 1) * L
+        iter_count += 1
+        run.record([iter_count, min_pt, max_pt, lk, x1, x2, fx1, fx2, k])
 
-    if epsilon and lk < epsilon:
         if is_minimising:
-            print("Found minima")
+            first_is_better, second_is_better = fx1 < fx2, fx1 > fx2
         else:
-            print("Found maxima")
-        return True
-
-    x1 = min_pt + lk
-    x2 = max_pt - lk
-
-    fx1 = objective_function(x1)
-    fx2 = objective_function(x2)
+            first_is_better, second_is_better = fx1 > fx2, fx1 < fx2
 
-    iter_count += 1
-    summary.append([iter_count, min_pt, max_pt, lk, x1, x2, fx1, fx2, k])
-
-    if is_minimising:
-        if fx1 < fx2:
-            max_pt = x2
-        elif fx1 > fx2:
-            min_pt = x1
-        else:
-            min_pt = x1
-            max_pt = x2
-    else:
-        if fx1 > fx2:
+        if first_is_better:
             max_pt = x2
-        elif fx1 < fx2:
+            kept = best = (x1, fx1)
+        elif second_is_better:
             min_pt = x1
+            kept = best = (x2, fx2)
         else:
             min_pt = x1
             max_pt = x2
+            kept = None
+            best = (x1, fx1)
 
-    return fibonnacci_seatch(
-        min_pt, max_pt, delta, epsilon, iter, is_minimising, iter_count, k + 1, L
-    )
+    return result("max_iterations")
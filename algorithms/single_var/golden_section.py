@@ -1,6 +1,17 @@
-import numpy as np
+from typing import NamedTuple
 
-from constants import GAMMA, objective_function, summary
+from constants import GAMMA, headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
+
+
+class GoldenSectionResult(NamedTuple):
+    min_pt: float  # Final interval
+    max_pt: float
+    x: float | None  # Best point evaluated. None if nothing was evaluated
+    fx: float | None
+    iterations: int
+    converged: bool  # True if the interval became shorter than epsilon
 
 
 def golden_section(
@@ -10,74 +21,128 @@ def golden_section(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-    iter_count=0,
-    k=2,
-    L=None,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. Find the number of iterations required to find the minimum. If not specified, it will be 100.
-        2. Find the length of the interval. This will stay the same throughout the iterations.
-        3. Find the L2 which will be ratio of L and (golden ratio ^ k).
+        2. Find the length L of the current interval.
+        3. Find the L2 which will be ratio of L and (golden ratio ^ 2).
         4. Find the x1 and x2 which will be min_pt + L2 and max_pt - L2 respectively.
         5. Find the value of the objective function at x1 and x2.
         6. If the value of the objective function at x1 is less than the value of the objective function at x2, then the new interval will be [min_pt, x2] and if the value of the objective function at x1 is greater than the value of the objective function at x2, then the new interval will be [x1, max_pt].
-        7. Repeat till we reach number of iteration of value of L2 is less than epsilon or greater than delta.
+           If they are equal, the new interval will be [x1, x2].
+        7. Repeat till we reach number of iteration or the interval is shorter than epsilon.
+
+    The point kept inside the new interval is always one of the next x1 and x2,
+    so only one new evaluation is needed per iteration after the first one.
     """
-    if not L:
-        L = max_pt - min_pt
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["golden_section_search"])
+
+    L = max_pt - min_pt
     if not iter:
         iter = 100
 
     if delta and delta > L:
-        if is_minimising:
-            print("Found minima")
-        else:
-            print("Found maxima")
-        return True
+        x = (min_pt + max_pt) / 2
+        return run.result(
+            x, objective.value(x), "converged", bracket=(min_pt, max_pt)
+        )
 
-    if k > iter:
-        return True
+    search = golden_section_interval(
+        objective,
+        min_pt,
+        max_pt,
+        epsilon,
+        iter,
+        is_minimising,
+        callback=lambda *row: run.record(list(row)),
+    )
 
-    lk = L / (GAMMA**k)
+    x, fx = search.x, search.fx
+    if x is None:
+        x = (search.min_pt + search.max_pt) / 2
+        fx = objective.value(x)
 
-    if epsilon and lk < epsilon:
-        if is_minimising:
-            print("Found minima")
-        else:
-            print("Found maxima")
-        return True
+    # Like fibonacci search, running out of iterations still gives a valid interval
+    return run.result(
+        x,
+        fx,
+        "converged" if search.converged else "max_iterations",
+        bracket=(search.min_pt, search.max_pt),
+        iterations=search.iterations,
+    )
+
+
+def golden_section_interval(
+    objective,
+    min_pt: float,
+    max_pt: float,
+    epsilon: float | None = None,
+    iter: int = 100,
+    is_minimising: bool = True,
+    callback=None,
+) -> GoldenSectionResult:
+    """
+    Golden section iterations of golden_section, also used as the line search of the
+    gradient based solvers.
+    callback is called with the summary row of every iteration.
+    """
+    iter_count = 0
+    kept = None  # Point (and its value) carried over to the next iteration
+    best = (None, None)
 
-    tx1 = min_pt + lk
-    tx2 = max_pt - lk
+    for _ in range(iter - 1):
+        # Taken from the current interval, which is not shrunk by the golden ratio
+        # when the values at x1 and x2 are equal
+        L = max_pt - min_pt
+        lk = L / GAMMA**2
 
-    # Ensure that x1 < x2
-    x1 = np.min([tx1, tx2])
-    x2 = np.max([tx1, tx2])
+        if epsilon and L < epsilon:
+            return GoldenSectionResult(min_pt, max_pt, *best, iter_count, True)
 
-    fx1 = objective_function(x1)
-    fx2 = objective_function(x2)
+        if kept is None:
+            tx1 = min_pt + lk
+            tx2 = max_pt - lk
 
-    iter_count += 1
-    summary.append([iter_count, min_pt, max_pt, lk, x1, x2, fx1, fx2])
+            # Ensure that x1 < x2
+            x1 = min(tx1, tx2)
+            x2 = max(tx1, tx2)
 
-    if is_minimising:
-        if fx1 < fx2:
-            max_pt = x2
-        elif fx1 > fx2:
-            min_pt = x1
+            fx1, fx2 = objective([x1, x2])
         else:
-            min_pt = x1
-            max_pt = x2
-    else:
-        if fx1 > fx2:
+            # The new point is the mirror image of the kept point in the interval
+            x_kept, f_kept = kept
+            x_new = min_pt + max_pt - x_kept
+            f_new = objective.value(x_new)
+
+            if x_new < x_kept:
+                x1, fx1, x2, fx2 = x_new, f_new, x_kept, f_kept
+            else:
+                x1, fx1, x2, fx2 = x_kept, f_kept, x_new, f_new
+
+        iter_count += 1
+        if callback is not None:
+            callback(iter_count, min_pt, max_pt, lk, x1, x2, fx1, fx2)
+
+        if is_minimising:
+            first_is_better, second_is_better = fx1 < fx2, fx1 > fx2
+        else:
+            first_is_better, second_is_better = fx1 > fx2, fx1 < fx2
+
+        if first_is_better:
             max_pt = x2
-        elif fx1 < fx2:
+            kept = best = (x1, fx1)
+        elif second_is_better:
             min_pt = x1
+            kept = best = (x2, fx2)
         else:
             min_pt = x1
             max_pt = x2
+            kept = None
+            best = (x1, fx1)
 
-    return golden_section(
-        min_pt, max_pt, delta, epsilon, iter, is_minimising, iter_count, k + 1, L
-    )
+    return GoldenSectionResult(min_pt, max_pt, *best, iter_count, False)
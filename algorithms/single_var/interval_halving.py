@@ -1,4 +1,6 @@
-from constants import objective_function, summary
+from constants import headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
 
 
 def interval_halving(
@@ -8,64 +10,81 @@ def interval_halving(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-    iter_count=0,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. Calculate xm = (x1 + x2) / 2
         2. Start with x1 = min_pt + L / 4, x2 = max_pt - L / 4, where L = max_pt - min_pt
         3. If f(x1) < f(xm) then set x2 = xm else if f(x2) < f(xm) then set x1 = xm else set x1 = x1 and x2 = x2
         4. Repeat steps 1-3 until L < epsilon
+
+    The next mean point is always one of x1, xm or x2, so its value is reused and
+    only f(x1) and f(x2) are evaluated after the first iteration.
     """
-    mean_pt = (min_pt + max_pt) / 2
-    L = max_pt - min_pt
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["interval_halving"])
 
     if not iter:
         iter = 100
 
-    if epsilon and L < epsilon:
-        if is_minimising:
-            print("Found minima")
-        else:
-            print("Found maxima")
-        return True
+    iter_count = 0
+    mean_pt = (min_pt + max_pt) / 2
+    fxm = None
 
-    if delta and delta > L:
-        if is_minimising:
-            print("Found minima")
-        else:
-            print("Found maxima")
-        return True
+    while True:
+        L = max_pt - min_pt
 
-    if iter_count > iter:
-        print("Could not find minima/maxima")
-        return False
+        if (epsilon and L < epsilon) or (delta and delta > L):
+            if fxm is None:
+                fxm = objective.value(mean_pt)
+            return run.result(
+                mean_pt,
+                fxm,
+                "converged",
+                bracket=(min_pt, max_pt),
+                iterations=iter_count,
+            )
 
-    x1 = min_pt + L / 4
-    x2 = max_pt - L / 4
+        if iter_count > iter:
+            return run.result(
+                mean_pt,
+                fxm,
+                "max_iterations",
+                success=False,
+                bracket=(min_pt, max_pt),
+                iterations=iter_count,
+            )
 
-    fx1 = objective_function(x1)
-    fxm = objective_function(mean_pt)
-    fx2 = objective_function(x2)
+        x1 = min_pt + L / 4
+        x2 = max_pt - L / 4
 
-    iter_count += 1
-    summary.append([iter_count, min_pt, max_pt, x1, mean_pt, x2, fx1, fxm, fx2])
-    if is_minimising:
-        if fx1 < fxm:
-            max_pt = mean_pt
-        elif fx2 < fxm:
-            min_pt = mean_pt
+        if fxm is None:
+            fx1, fxm, fx2 = objective([x1, mean_pt, x2])
         else:
-            min_pt = x1
-            max_pt = x2
-    else:
-        if fx1 > fxm:
-            max_pt = mean_pt
-        elif fx2 > fxm:
-            min_pt = mean_pt
+            fx1, fx2 = objective([x1, x2])
+
+        iter_count += 1
+        run.record([iter_count, min_pt, max_pt, x1, mean_pt, x2, fx1, fxm, fx2])
+        if is_minimising:
+            if fx1 < fxm:
+                max_pt = mean_pt
+                mean_pt, fxm = x1, fx1
+            elif fx2 < fxm:
+                min_pt = mean_pt
+                mean_pt, fxm = x2, fx2
+            else:
+                min_pt = x1
+                max_pt = x2
         else:
-            min_pt = x1
-            max_pt = x2
-    return interval_halving(
-        min_pt, max_pt, delta, epsilon, iter, is_minimising, iter_count
-    )
+            if fx1 > fxm:
+                max_pt = mean_pt
+                mean_pt, fxm = x1, fx1
+            elif fx2 > fxm:
+                min_pt = mean_pt
+                mean_pt, fxm = x2, fx2
+            else:
+                min_pt = x1
+                max_pt = x2
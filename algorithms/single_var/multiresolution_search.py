@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from algorithms.single_var.exhaustive_search import exhaustive_scan
+from constants import headers_dict, objective_function
+from objective import Objective
+from result import Result, SolverRun
+
+
+def resolution_schedule(
+    min_pt: float,
+    max_pt: float,
+    resolution: float,
+    coarse_points: int = 100,
+    refinement: int = 10,
+) -> list[float]:
+    """
+    Grid spacings from coarse_points points over [min_pt, max_pt] down to
+    resolution, each refinement times finer than the last
+    """
+    step = (max_pt - min_pt) / coarse_points
+    schedule = []
+    while step > resolution:
+        schedule.append(step)
+        step /= refinement
+
+    return schedule + [resolution]
+
+
+def multiresolution_search(
+    min_pt: float,
+    max_pt: float,
+    delta: float | None = None,
+    epsilon: float | None = None,
+    iter: int | None = None,
+    is_minimising: bool = False,
+    objective=None,
+    trace=None,
+    rng=None,
+    top_k: int = 3,
+    schedule: list[float] | None = None,
+    coarse_points: int = 100,
+    refinement: int = 10,
+    budget: int | None = None,
+    workers: int = 1,
+) -> Result:
+    """
+    Scan a coarse grid over the whole interval, keep the top_k best brackets and
+    scan each of them again with a finer grid, down to a grid spacing of delta (or
+    epsilon). Brackets of every local optimum are found on the coarse grid, so the
+    search is global down to the coarse spacing at a fraction of the evaluations of
+    a fine grid over the whole interval.
+
+    schedule is the grid spacing of every level, coarse to fine. By default it goes
+    from coarse_points points over the interval to delta, refinement times finer at
+    every level. iter limits the number of levels. The search stops refining when
+    the next level would take more than budget evaluations in total. With workers
+    greater than 1 the brackets of a level are scanned in parallel threads, which
+    helps objectives releasing the GIL. Objectives with a cache or instrumentation
+    are always scanned in this thread, see scan_intervals.
+
+    Working ->
+        1. Evaluate the grid of the first spacing of the schedule over [min_pt, max_pt]
+        2. Find every bracket f(x1) > f(x2) < f(x3) (and vice versa for maxima)
+        3. Keep the top_k brackets with the best f(x2)
+        4. Evaluate the grid of the next spacing over each bracket and find the
+           brackets inside it. A bracket with none inside it is kept as it is
+        5. Repeat from step 3 until the schedule, iter or the budget runs out
+    """
+    resolution = delta or epsilon
+    if not resolution:
+        raise ValueError("Must provide delta or epsilon for multiresolution search")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+
+    if not isinstance(objective, Objective):
+        # Grid points are never evaluated twice, so plain functions are not cached
+        objective = Objective(objective or objective_function)
+    run = SolverRun(objective, trace, headers_dict["multiresolution_search"])
+
+    if schedule is None:
+        schedule = resolution_schedule(
+            min_pt, max_pt, resolution, coarse_points, refinement
+        )
+    if iter:
+        schedule = schedule[:iter]
+
+    points, values = scan_intervals(
+        objective, [(min_pt, max_pt)], schedule[0], is_minimising, workers
+    )
+    if not len(points):
+        return run.result(None, None, "out_of_bounds", success=False, iterations=1)
+
+    level = 1
+    reason = "converged"
+    while True:
+        order = np.argsort(values[:, 1] if is_minimising else -values[:, 1])
+        points, values = points[order[:top_k]], values[order[:top_k]]
+        for row in np.hstack([points, values]):
+            run.record([level, schedule[level - 1], *row])
+
+        if level == len(schedule):
+            break
+
+        step = schedule[level]
+        needed = sum(int(np.ceil((x3 - x1) / step)) + 1 for x1, _, x3 in points)
+        if budget is not None and run_evaluations(run) + needed > budget:
+            reason = "max_evaluations"
+            break
+
+        # Scan up to and including x3
+        intervals = [(x1, x3 + step / 2) for x1, _, x3 in points]
+        found = scan_intervals(objective, intervals, step, is_minimising, workers)
+        points, values = merge_brackets(points, values, *found)
+        level += 1
+
+    x1, x2, x3 = points[0]
+    return run.result(x2, values[0, 1], reason, bracket=(x1, x3), iterations=level)
+
+
+def run_evaluations(run: SolverRun) -> int:
+    return run.objective.n_evaluations - run.start_evaluations
+
+
+def scan_intervals(objective, intervals, step, is_minimising, workers):
+    """
+    Brackets found by exhaustive_scan over every interval, as the points and values
+    arrays of all the brackets. Intervals are scanned in parallel threads when
+    workers is greater than 1, each with its own Objective whose evaluations are
+    added to objective afterwards. The cache and the instrumentation of objective
+    are not thread safe, so objectives with either are scanned serially to keep
+    them complete.
+    """
+
+    def scan(interval, scan_objective):
+        return exhaustive_scan(scan_objective, *interval, step, is_minimising)
+
+    serial = objective.cache is not None or objective.instrumentation is not None
+    if workers == 1 or len(intervals) == 1 or serial:
+        scans = [scan(interval, objective) for interval in intervals]
+    else:
+        objectives = [Objective(objective.func, objective.n_vars) for _ in intervals]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scans = list(pool.map(scan, intervals, objectives))
+        for scan_objective in objectives:
+            objective.n_calls += scan_objective.n_calls
+            objective.n_evaluations += scan_objective.n_evaluations
+
+    points = np.concatenate([s.points for s in scans])
+    values = np.concatenate([s.values for s in scans])
+    return points, values
+
+
+def merge_brackets(points, values, new_points, new_values):
+    """
+    Refined brackets, keeping the brackets of the previous level in which no
+    bracket was found
+    """
+    refined = [
+        np.any((new_points[:, 1] >= x1) & (new_points[:, 1] <= x3))
+        for x1, _, x3 in points
+    ]
+    kept = ~np.array(refined, dtype=bool)
+    return (
+        np.concatenate([new_points, points[kept]]),
+        np.concatenate([new_values, values[kept]]),
+    )
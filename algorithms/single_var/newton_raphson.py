@@ -1,7 +1,9 @@
 import numpy as np
 
-from constants import objective_function, summary
-from utils import find_derivative, find_double_derivative, find_random_start
+from constants import headers_dict, objective_function
+from objective import as_objective
+from result import Result, SolverRun
+from utils import find_random_start
 
 
 def newton_raphson(
@@ -11,19 +13,30 @@ def newton_raphson(
     epsilon: float | None = None,
     iter: int | None = None,
     is_minimising: bool = False,
-) -> bool:
+    objective=None,
+    trace=None,
+    rng=None,
+) -> Result:
     """
     Working ->
         1. Choose an initial guess for x0
-        2. Compute x0 and f'(x0)
+        2. Compute f'(x0) and f''(x0)
         3. Calculate x1 = x0 - f'(x0) / f''(x0)
         4. If |x1 - x0| < epsilon, then x1 is the solution
         5. Else, set x0 = x1 and go to step 2
+        6. Stop after iter iterations if given
+
+    The random start is drawn from rng, a numpy Generator or a seed.
+    The derivatives come from objective.derivatives, so exact derivatives or dual
+    numbers are used when available and each step costs a single evaluation.
     """
     if not epsilon:
         raise ValueError("Must provide epsilon for newton raphson")
 
-    x0 = find_random_start(min_pt, max_pt, epsilon)
+    objective = as_objective(objective, objective_function)
+    run = SolverRun(objective, trace, headers_dict["newton_raphson"])
+
+    x0 = find_random_start(min_pt, max_pt, epsilon, rng)
 
     assert x0 > min_pt and x0 < max_pt, "x0 must be between min_pt and max_pt"
 
@@ -31,9 +44,13 @@ def newton_raphson(
     f_derivative = 1000
 
     while np.abs(f_derivative) > epsilon:
-        f_value = objective_function(x0)
-        f_derivative = find_derivative(objective_function, x0)
-        f_double_derivative = find_double_derivative(objective_function, x0)
+        if iter and iter_count >= iter:
+            return run.result(
+                x, f_value, "max_iterations", success=False, iterations=iter_count
+            )
+
+        x = x0
+        f_value, f_derivative, f_double_derivative = objective.derivatives(x0)
 
         x1 = x0 - (f_derivative / f_double_derivative)
 
@@ -43,10 +60,11 @@ def newton_raphson(
         elif x1 > max_pt:
             x1 = max_pt
 
-        summary.append(
+        run.record(
             [iter_count, x0, f_value, f_derivative, f_double_derivative, x1 - x0]
         )
         x0 = x1
         iter_count += 1
 
-    return True
+    # x is the last point whose derivative was found
+    return run.result(x, f_value, "converged", iterations=iter_count)
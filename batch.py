@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from main import functions_dict
+from objective_registry import resolve_objective
+
+# Fields of a job in the manifest and their types. Only algorithm is required
+job_fields = {
+    "id": str,
+    "algorithm": str,
+    "min_pt": float,
+    "max_pt": float,
+    "delta": float,
+    "epsilon": float,
+    "iter": int,
+    "objective": str,
+    "n_vars": int,
+    "seed": int,
+}
+
+# Values of the fields missing from a job, as for the command line of main.py
+job_defaults = {"iter": 100}
+
+
+def read_manifest(path: str | Path) -> list[dict]:
+    """
+    Read the jobs from a .json file (a list of jobs or {"jobs": [...]}) or a .csv
+    file with a header row. Missing or empty fields take their value from
+    job_defaults, else None. Jobs without an id are numbered in order.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path) as file:
+            jobs = json.load(file)
+        if isinstance(jobs, dict):
+            jobs = jobs["jobs"]
+    elif path.suffix == ".csv":
+        with open(path, newline="") as file:
+            jobs = list(csv.DictReader(file))
+    else:
+        raise ValueError("Manifest must be either .json or .csv")
+
+    parsed = []
+    for index, job in enumerate(jobs):
+        unknown = set(job) - set(job_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields in job {index}: {', '.join(unknown)}")
+
+        job = {
+            field: (
+                job_defaults.get(field)
+                if job.get(field) in (None, "")
+                else cast(job[field])
+            )
+            for field, cast in job_fields.items()
+        }
+        if job["algorithm"] not in functions_dict:
+            raise ValueError(f"Unknown algorithm {job['algorithm']} in job {index}")
+        if job["id"] is None:
+            job["id"] = str(index)
+
+        parsed.append(job)
+
+    return parsed
+
+
+def run_job(job: dict) -> dict:
+    """
+    Run a single job. Errors are reported in the result instead of being raised,
+    so that one bad job does not stop the batch
+    """
+    result = {"id": job["id"], "algorithm": job["algorithm"]}
+    start = time.perf_counter()
+
+    try:
+        objective = None
+        if job["objective"] is not None:
+            objective = resolve_objective(job["objective"], job["n_vars"])
+
+        solution = functions_dict[job["algorithm"]](
+            job["min_pt"],
+            job["max_pt"],
+            job["delta"],
+            job["epsilon"],
+            job["iter"],
+            is_minimising=True,
+            objective=objective,
+            rng=job["seed"],
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    else:
+        result.update(solution.as_dict())
+
+    result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+def run_jobs(jobs: list[dict]) -> list[dict]:
+    return [run_job(job) for job in jobs]
+
+
+def seed_jobs(jobs: list[dict], seed: int | None) -> list[dict]:
+    """
+    Give every job without a seed its own random stream spawned from seed, so that
+    the results do not depend on the number of workers or the order of the jobs.
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(jobs))
+    return [
+        job if job["seed"] is not None else {**job, "seed": stream}
+        for job, stream in zip(jobs, streams)
+    ]
+
+
+def run_batch(jobs: list[dict], output, workers: int | None = None, chunk_size=64):
+    """
+    Run the jobs on a pool of worker processes and write every result as a json
+    line to output as soon as its chunk of jobs completes. Results are written in
+    the order they complete. workers=1 runs the jobs in this process.
+    Returns the number of failed jobs.
+    """
+    chunks = [jobs[i : i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    failed = 0
+
+    def write(results):
+        nonlocal failed
+        for result in results:
+            failed += "error" in result
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if workers == 1:
+        for chunk in chunks:
+            write(run_jobs(chunk))
+        return failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_jobs, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            write(future.result())
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the optimisation jobs of a manifest in parallel"
+    )
+    parser.add_argument("manifest", type=str, help="Jobs as a .json or .csv file")
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="File to write the results to as json lines. Defaults to stdout",
+        default=None,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes",
+        default=os.cpu_count(),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Number of jobs sent to a worker at a time",
+        default=64,
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the random streams of the jobs without a seed",
+        default=None,
+    )
+    args = parser.parse_args()
+
+    jobs = seed_jobs(read_manifest(args.manifest), args.seed)
+
+    if args.output is None:
+        failed = run_batch(jobs, sys.stdout, args.workers, args.chunk_size)
+    else:
+        with open(args.output, "w") as output:
+            failed = run_batch(jobs, output, args.workers, args.chunk_size)
+
+    if failed:
+        print(f"{failed} of {len(jobs)} jobs failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from tabulate import tabulate
+
+import simplex
+from constants import (
+    himmelblau_function,
+    objective_function,
+    rosenbrock_function,
+    sphere_function,
+)
+from main import functions_dict
+from objective import Objective
+from recorder import Trace
+
+
+# Test functions for the single variable algorithms
+# name -> (function, min_pt, max_pt, minimum value)
+single_var_functions = {
+    "objective_function": (objective_function, 1, 10, 37.5),
+    "quadratic": (lambda x: (x - 2) ** 2 + 1, 0, 5, 1.0),
+    "exp_linear": (lambda x: np.exp(x) - 3 * x, 0, 3, 3 - 3 * np.log(3)),
+}
+
+# Test functions for the multi variable algorithms
+# name -> (function, min_pt, max_pt, minimum value, dimensions)
+multi_var_functions = {
+    "himmelblau": (himmelblau_function, -5, 5, 0.0, [2]),
+    "sphere": (sphere_function, -5, 5, 0.0, [2, 5, 10, 30]),
+    "rosenbrock": (rosenbrock_function, -2, 2, 0.0, [2, 5, 30]),
+}
+
+# Parameters used for every algorithm and the dimensions it supports
+# Multi variable algorithms are the ones with dimensions
+algorithm_settings = {
+    "exhaustive_search": {"delta": 0.001},
+    "bounding_phase": {"delta": 0.01},
+    "interval_halving": {"epsilon": 1e-6},
+    "fibonacci_search": {"epsilon": 1e-6, "iter": 100},
+    "golden_section_search": {"epsilon": 1e-6, "iter": 100},
+    "newton_raphson": {"epsilon": 1e-4},
+    "bisection": {"epsilon": 1e-4},
+    "brent": {"epsilon": 1e-6},
+    "multiresolution_search": {"epsilon": 1e-6},
+    "evo_search": {"epsilon": 1e-6, "iter": 1000, "dimensions": [2, 5, 10]},
+    "simplex_search": {"epsilon": 1e-10, "iter": 5000, "dimensions": [2, 5, 10]},
+    "steepest_descent": {"epsilon": 1e-6, "iter": 1000, "dimensions": [2, 5, 10, 30]},
+    "conjugate_gradient": {"epsilon": 1e-6, "iter": 1000, "dimensions": [2, 5, 10, 30]},
+    "bfgs": {"epsilon": 1e-6, "iter": 1000, "dimensions": [2, 5, 10, 30]},
+    "lbfgs": {"epsilon": 1e-6, "iter": 1000, "dimensions": [2, 5, 10, 30]},
+}
+
+# Command lines of main.py whose startup time is measured
+startup_commands = {
+    "help": ["-h"],
+    "golden_section_search": [
+        "1",
+        "10",
+        "golden_section_search",
+        "--epsilon",
+        "1e-3",
+        "--no-trace",
+    ],
+}
+
+# Fields compared against the baseline
+compared_fields = ["wall_time", "evaluations", "peak_memory_kb"]
+
+
+class ProbedFunction:
+    """
+    Wraps a test function to record the best value seen and the iteration in which
+    it first came within tolerance of the known minimum
+    """
+
+    def __init__(self, func, minimum, tolerance, trace):
+        self.func = func
+        self.minimum = minimum
+        self.tolerance = tolerance
+        self.trace = trace
+        self.best = np.inf
+        self.iterations_to_tolerance = None
+
+    def __call__(self, *args):
+        values = self.func(*args)
+        # Dual numbers are passed through when finding derivatives
+        self.best = min(self.best, float(np.min(getattr(values, "value", values))))
+
+        if (
+            self.iterations_to_tolerance is None
+            and self.best - self.minimum <= self.tolerance
+        ):
+            # The solvers record an iteration after evaluating its points
+            self.iterations_to_tolerance = len(self.trace) + 1
+
+        return values
+
+
+def run_case(
+    name, function_name, func, min_pt, max_pt, minimum, n_vars, repeat, tolerance, seed
+):
+    """
+    Run one algorithm on one test function.
+    The wall time is the best of repeat runs. The peak memory is measured on a
+    separate run since tracemalloc slows down the run.
+    """
+    settings = {k: v for k, v in algorithm_settings[name].items() if k != "dimensions"}
+    solver = functions_dict[name]
+
+    if n_vars > 1 and name == "evo_search":
+        # Start the evolutionary search off centre so that it has to move
+        x0 = np.where(np.arange(n_vars) % 2 == 0, 0.7 * max_pt, 0.3 * min_pt)
+        args = (x0[0], x0[1])
+        settings["x0"] = x0
+    else:
+        args = (min_pt, max_pt)
+
+    def run(measure_memory=False):
+        trace = Trace()
+        probe = ProbedFunction(func, minimum, tolerance, trace)
+        objective = Objective(probe, n_vars)
+
+        if measure_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        # Every run draws its random starts from the same seed
+        result = solver(
+            *args,
+            **settings,
+            is_minimising=True,
+            objective=objective,
+            trace=trace,
+            rng=seed,
+        )
+        wall_time = time.perf_counter() - start
+
+        peak_memory = None
+        if measure_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        return wall_time, peak_memory, result, trace, probe, objective
+
+    wall_time = min(run()[0] for _ in range(repeat))
+    _, peak_memory, result, trace, probe, objective = run(measure_memory=True)
+
+    return {
+        "algorithm": name,
+        "function": function_name,
+        "dimensions": n_vars,
+        "success": result.success,
+        "reason": result.reason,
+        "wall_time": wall_time,
+        "evaluations": objective.n_evaluations,
+        "calls": objective.n_calls,
+        "iterations": len(trace),
+        "iterations_to_tolerance": probe.iterations_to_tolerance,
+        "best_value": probe.best,
+        "error": probe.best - minimum,
+        "peak_memory_kb": peak_memory / 1024,
+    }
+
+
+def run_multistart(repeat, seed):
+    """
+    Benchmark the multi start simplex search of simplex.py on the himmelblau function
+    """
+
+    def run(measure_memory=False):
+        summary = []
+        objective = Objective(himmelblau_function, n_vars=2)
+
+        if measure_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            solutions, _ = simplex.simplex_search(
+                simplex.lb,
+                simplex.ub,
+                simplex.gamma,
+                simplex.beta,
+                simplex.epsilon,
+                n_starts=simplex.n_starts,
+                workers=1,
+                seed=seed,
+                objective=objective,
+                summary=summary,
+            )
+        wall_time = time.perf_counter() - start
+
+        peak_memory = None
+        if measure_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        return wall_time, peak_memory, solutions, objective, summary
+
+    wall_time = min(run()[0] for _ in range(repeat))
+    _, peak_memory, solutions, objective, summary = run(measure_memory=True)
+    best = min(himmelblau_function(*solution) for solution in solutions)
+
+    return {
+        "algorithm": "simplex_multistart",
+        "function": "himmelblau",
+        "dimensions": 2,
+        "success": len(solutions) == 4,  # Himmelblau's function has 4 minima
+        "reason": None,
+        "wall_time": wall_time,
+        "evaluations": objective.n_evaluations,
+        "calls": objective.n_calls,
+        "iterations": len(summary),
+        "iterations_to_tolerance": None,
+        "best_value": float(best),
+        "error": float(best),
+        "peak_memory_kb": peak_memory / 1024,
+    }
+
+
+def run_startup(repeat):
+    """
+    Median wall time of running main.py in a new process, which is mostly the time
+    spent importing
+    """
+    results = []
+    for name, args in startup_commands.items():
+        wall_times = []
+        for _ in range(max(repeat, 5)):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "main.py", *args],
+                cwd=Path(__file__).parent,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            wall_times.append(time.perf_counter() - start)
+
+        results.append(
+            {
+                "algorithm": "startup",
+                "function": name,
+                "dimensions": 0,
+                "success": True,
+                "reason": None,
+                "wall_time": statistics.median(wall_times),
+                "evaluations": None,
+                "calls": None,
+                "iterations": None,
+                "iterations_to_tolerance": None,
+                "best_value": None,
+                "error": None,
+                "peak_memory_kb": None,
+            }
+        )
+
+    return results
+
+
+def run_benchmarks(algorithms, repeat, tolerance, seed):
+    results = []
+    for name in algorithms:
+        dimensions = algorithm_settings[name].get("dimensions")
+
+        if dimensions is None:
+            cases = [
+                (function_name, *function, 1)
+                for function_name, function in single_var_functions.items()
+            ]
+        else:
+            cases = [
+                (function_name, *function[:-1], n_vars)
+                for function_name, function in multi_var_functions.items()
+                for n_vars in function[-1]
+                if n_vars in dimensions
+            ]
+
+        for case in cases:
+            results.append(run_case(name, *case, repeat, tolerance, seed))
+
+    return results
+
+
+def compare(results, baseline, threshold, min_time):
+    """
+    Find the results which got worse than the baseline by more than threshold.
+    Wall times below min_time are too noisy to be compared.
+    """
+
+    def key(result):
+        return result["algorithm"], result["function"], result["dimensions"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+
+    regressions = []
+    for result in results:
+        base = baseline_results.get(key(result))
+        if base is None:
+            continue
+
+        for field in compared_fields:
+            new, old = result[field], base[field]
+            if new is None or old is None:
+                continue
+            if field == "wall_time" and new < min_time:
+                continue
+
+            if new > old * (1 + threshold):
+                # Any increase over a baseline of 0 is a regression of no finite size
+                increase = new / old - 1 if old else None
+                regressions.append([*key(result), field, old, new, increase])
+
+        if base["success"] and not result["success"]:
+            regressions.append([*key(result), "success", True, False, None])
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark every algorithm on a catalogue of test functions"
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        help="Algorithms to benchmark. Defaults to all of them",
+        choices=[*functions_dict.keys(), "simplex_multistart", "startup"],
+        default=[*functions_dict.keys(), "simplex_multistart", "startup"],
+    )
+    parser.add_argument(
+        "--repeat", type=int, help="Runs per case, the best is kept", default=3
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help="Distance from the minimum counted as reached",
+        default=1e-4,
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the random starts", default=0)
+    parser.add_argument(
+        "--output", type=str, help="Write the results as json to this file"
+    )
+    parser.add_argument(
+        "--baseline", type=str, help="Compare the results with this json file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Allowed relative increase over the baseline",
+        default=0.25,
+    )
+    parser.add_argument(
+        "--startup-target",
+        type=float,
+        help="Fail if running main.py takes longer than this many seconds",
+        default=0.3,
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        help="Wall times below this many seconds are not compared",
+        default=0.005,
+    )
+    args = parser.parse_args()
+
+    algorithms = [name for name in args.algorithms if name in functions_dict]
+    results = run_benchmarks(algorithms, args.repeat, args.tolerance, args.seed)
+    if "simplex_multistart" in args.algorithms:
+        results.append(run_multistart(args.repeat, args.seed))
+    if "startup" in args.algorithms:
+        results.extend(run_startup(args.repeat))
+
+    columns = [
+        "algorithm",
+        "function",
+        "dimensions",
+        "success",
+        "reason",
+        "wall_time",
+        "evaluations",
+        "iterations",
+        "iterations_to_tolerance",
+        "error",
+        "peak_memory_kb",
+    ]
+    print(
+        tabulate(
+            [[result[column] for column in columns] for result in results],
+            columns,
+            tablefmt="fancy_grid",
+        )
+    )
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    # The startup time of a solve is checked against the target, baseline or not
+    regressions = []
+    for result in results:
+        if result["algorithm"] == "startup" and result["function"] != "help":
+            wall_time = result["wall_time"]
+            if wall_time > args.startup_target:
+                regressions.append(
+                    [
+                        "startup",
+                        result["function"],
+                        0,
+                        "startup_target",
+                        args.startup_target,
+                        wall_time,
+                        wall_time / args.startup_target - 1,
+                    ]
+                )
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        regressions += compare(results, baseline, args.threshold, args.min_time)
+
+    if regressions:
+        print(
+            tabulate(
+                regressions,
+                [
+                    "algorithm",
+                    "function",
+                    "dimensions",
+                    "field",
+                    "baseline",
+                    "new",
+                    "increase",
+                ],
+                tablefmt="fancy_grid",
+            )
+        )
+        sys.exit(1)
+
+    if args.baseline:
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Marks the root of the repository for pytest, so that the tests can import the
+# top level modules, eg. objective and recorder
@@ -1,8 +1,6 @@
-from functools import lru_cache
-
-
 # Our objective function
-@lru_cache(None)
+# Both the functions work elementwise on numpy arrays so that a batch of points
+# can be evaluated in a single call. See objective.Objective
 def objective_function(x: float) -> float:
     return x**2 / 2 + 125 / x
 
@@ -11,9 +9,86 @@ def himmelblau_function(x, y):
     return (x**2 + y - 11) ** 2 + (x + y**2 - 7) ** 2
 
 
-# Basic var meant for visualisation
-summary = []
+# Test functions of any number of variables
+def sphere_function(*x):
+    return sum(xi**2 for xi in x)
+
+
+def rosenbrock_function(*x):
+    return sum(
+        100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(len(x) - 1)
+    )
+
+
+def point_headers(name: str, n_vars: int) -> list[str]:
+    """
+    Column names of a point in the trace, eg. x0_1, x0_2
+    """
+    return [f"{name}_{i + 1}" for i in range(n_vars)]
+
+
+def simplex_headers(n_vars: int) -> list[str]:
+    """
+    Columns recorded by simplex search, the n_vars + 1 vertices of the simplex
+    and the number of evaluations so far
+    """
+    return [
+        "iteration",
+        *[
+            header
+            for i in range(n_vars + 1)
+            for header in point_headers(f"x{i}", n_vars)
+        ],
+        "evaluations",
+    ]
+
+
+def evo_headers(n_vars: int) -> list[str]:
+    """
+    Columns recorded by evolutionary search, the centre of the hypercube, its best
+    corner and the step size
+    """
+    return [
+        "iteration",
+        *point_headers("x0", n_vars),
+        "f(x0)",
+        *point_headers("x1", n_vars),
+        "f(x1)",
+        *point_headers("delta", n_vars),
+        "delta_mag",
+    ]
+
 
+def gradient_headers(n_vars: int) -> list[str]:
+    """
+    Columns recorded by the gradient based searches
+    """
+    return [
+        "iteration",
+        *point_headers("x", n_vars),
+        "f(x)",
+        "|grad|",
+        "step",
+        "evaluations",
+    ]
+
+
+def constrained_headers(n_vars: int) -> list[str]:
+    """
+    Columns recorded by the constrained search, one row per penalty parameter
+    """
+    return [
+        "level",
+        "parameter",
+        *point_headers("x", n_vars),
+        "f(x)",
+        "violation",
+        "P(x)",
+        "evaluations",
+    ]
+
+
+# Columns recorded in the trace by each algorithm
 headers_dict = {
     "exhaustive_search": ["iteration", "x1", "x2", "x3", "f1", "f2", "f3"],
     "bounding_phase": ["iteration", "xkm1", "xk", "xkp1", "f(xk)", "f(xkp1)"],
@@ -60,22 +135,14 @@ headers_dict = {
         "f'(x)",
         "f(x)",
     ],
-    "evo_search": [
-        "iteration",
-        "x0",
-        "h1",
-        "h2",
-        "h3",
-        "h4",       
-        "delta",
-        "delta_mag",
-    ],
-    "simplex_search": [
-        "iteration",
-        "x0",
-        "x1",
-        "x2",
-    ],
+    "brent": ["iteration", "min_pt", "max_pt", "x", "f(x)", "u", "f(u)", "parabolic"],
+    "multiresolution_search": ["level", "step", "x1", "x2", "x3", "f1", "f2", "f3"],
+    "evo_search": evo_headers(2),
+    "simplex_search": simplex_headers(2),
+    "steepest_descent": gradient_headers(2),
+    "conjugate_gradient": gradient_headers(2),
+    "bfgs": gradient_headers(2),
+    "lbfgs": gradient_headers(2),
 }
 
-GAMMA = 1.618  # Golder ratio
+GAMMA = (1 + 5**0.5) / 2  # Golden ratio
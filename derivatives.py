@@ -0,0 +1,195 @@
+import numpy as np
+
+# Relative step of the finite differences. eps^(1/4) balances the truncation and
+# round off errors of the central second difference, which is the least accurate
+# of the differences taken from the same three points
+STEP_SCALE = np.finfo(float).eps ** 0.25
+
+
+class Dual:
+    """
+    Forward mode automatic differentiation of single variable functions.
+    Holds the value, first and second derivative of an expression with respect to x.
+    The parts can be numpy arrays, so a whole batch of points is differentiated in
+    a single call of the function.
+
+    Arithmetic operators, powers and the numpy functions sin, cos, tan, exp, log,
+    sqrt and abs are supported. Functions using anything else (eg. the math module)
+    raise a TypeError.
+
+    Usage:
+        fx = objective_function(Dual.variable(np.array([1.0, 2.0])))
+        fx.value, fx.d1, fx.d2
+    """
+
+    __slots__ = ("value", "d1", "d2")
+
+    def __init__(self, value, d1=0.0, d2=0.0):
+        self.value = value
+        self.d1 = d1
+        self.d2 = d2
+
+    @classmethod
+    def variable(cls, x) -> "Dual":
+        x = np.asarray(x, dtype=float)
+        return cls(x, np.ones_like(x), np.zeros_like(x))
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value}, {self.d1}, {self.d2})"
+
+    @staticmethod
+    def lift(other) -> "Dual":
+        return other if isinstance(other, Dual) else Dual(other)
+
+    def chain(self, f, df, ddf) -> "Dual":
+        """
+        Apply a function with value f, derivative df and second derivative ddf at
+        self.value. (g(x))'' = g''(x) * x'^2 + g'(x) * x''
+        """
+        return Dual(f, df * self.d1, ddf * self.d1**2 + df * self.d2)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.d1, -self.d2)
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        other = Dual.lift(other)
+        return Dual(self.value + other.value, self.d1 + other.d1, self.d2 + other.d2)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + -Dual.lift(other)
+
+    def __rsub__(self, other):
+        return Dual.lift(other) + -self
+
+    def __mul__(self, other):
+        other = Dual.lift(other)
+        return Dual(
+            self.value * other.value,
+            self.d1 * other.value + self.value * other.d1,
+            self.d2 * other.value + 2 * self.d1 * other.d1 + self.value * other.d2,
+        )
+
+    __rmul__ = __mul__
+
+    def reciprocal(self) -> "Dual":
+        inverse = 1 / self.value
+        return self.chain(inverse, -(inverse**2), 2 * inverse**3)
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return self * other.reciprocal()
+        return Dual(self.value / other, self.d1 / other, self.d2 / other)
+
+    def __rtruediv__(self, other):
+        return other * self.reciprocal()
+
+    def __pow__(self, power):
+        if isinstance(power, Dual):
+            # x^y = exp(y * log(x))
+            return (power * self.log()).exp()
+
+        return self.chain(
+            self.value**power,
+            power * self.value ** (power - 1),
+            power * (power - 1) * self.value ** (power - 2),
+        )
+
+    def __rpow__(self, base):
+        # a^x = exp(x * log(a))
+        return (self * np.log(base)).exp()
+
+    def __abs__(self):
+        sign = np.sign(self.value)
+        return Dual(np.abs(self.value), sign * self.d1, sign * self.d2)
+
+    def sin(self):
+        return self.chain(np.sin(self.value), np.cos(self.value), -np.sin(self.value))
+
+    def cos(self):
+        return self.chain(np.cos(self.value), -np.sin(self.value), -np.cos(self.value))
+
+    def tan(self):
+        tan = np.tan(self.value)
+        sec2 = 1 + tan**2
+        return self.chain(tan, sec2, 2 * tan * sec2)
+
+    def exp(self):
+        exp = np.exp(self.value)
+        return self.chain(exp, exp, exp)
+
+    def log(self):
+        return self.chain(np.log(self.value), 1 / self.value, -1 / self.value**2)
+
+    def sqrt(self):
+        root = np.sqrt(self.value)
+        return self.chain(root, 0.5 / root, -0.25 / root**3)
+
+    # np.sin(dual) etc. are routed to the methods above
+    _ufuncs = {
+        np.add: lambda a, b: Dual.lift(a) + b,
+        np.subtract: lambda a, b: Dual.lift(a) - b,
+        np.multiply: lambda a, b: Dual.lift(a) * b,
+        np.true_divide: lambda a, b: Dual.lift(a) / b,
+        np.power: lambda a, b: Dual.lift(a) ** b,
+        np.negative: lambda a: -a,
+        np.positive: lambda a: a,
+        np.absolute: abs,
+        np.sin: lambda a: a.sin(),
+        np.cos: lambda a: a.cos(),
+        np.tan: lambda a: a.tan(),
+        np.exp: lambda a: a.exp(),
+        np.log: lambda a: a.log(),
+        np.sqrt: lambda a: a.sqrt(),
+        np.square: lambda a: a * a,
+    }
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs or ufunc not in Dual._ufuncs:
+            return NotImplemented
+        return Dual._ufuncs[ufunc](*inputs)
+
+
+def dual_derivatives(f, x):
+    """
+    Find f(x), f'(x) and f''(x) exactly using a single call of f on a Dual
+    """
+    fx = f(Dual.variable(x))
+    if not isinstance(fx, Dual):
+        # Constant function
+        fx = Dual(np.asarray(fx, dtype=float))
+
+    shape = np.shape(x)
+    return tuple(
+        np.broadcast_to(part, shape).astype(float) for part in (fx.value, fx.d1, fx.d2)
+    )
+
+
+def finite_difference_step(x) -> np.ndarray:
+    """
+    Step size scaled to the magnitude of x, so that the differences are equally
+    accurate near 0 and for large x
+    """
+    return STEP_SCALE * np.maximum(1.0, np.abs(x))
+
+
+def finite_differences(f, x, h=None):
+    """
+    Find f(x), f'(x) and f''(x) with central differences using a single batched
+    call to f. Without h the step is chosen by finite_difference_step
+    """
+    x = np.asarray(x, dtype=float)
+    if h is None:
+        h = finite_difference_step(x)
+
+    # Use the exact step which can be represented around x
+    xh = x + h
+    xmh = x - h
+    h = (xh - xmh) / 2
+
+    fxh, fx, fxmh = f(np.stack([xh, x, xmh]))
+    return fx, (fxh - fxmh) / (2 * h), (fxh - 2 * fx + fxmh) / (h**2)
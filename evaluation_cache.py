@@ -0,0 +1,168 @@
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+# Rough per entry overhead of the dict/OrderedDict slots holding an entry, the
+# bytes object of the key and the float value. Together with the length of the key
+# it estimates the memory of the cache
+ENTRY_OVERHEAD = 120 + sys.getsizeof(b"") + sys.getsizeof(0.0)
+
+
+class EvaluationCache:
+    """
+    Bounded cache of objective values keyed by the evaluated point.
+
+    Points can be scalars or vectors. Keys are built from the raw bytes of the
+    point, or, when a tolerance is given, from the point quantized to multiples of
+    the tolerance so that near identical probes share an entry.
+
+    Args:
+        max_entries: Maximum number of entries held. None for no limit on count
+        max_bytes: Approximate memory budget of the cache. None for no limit
+        policy: Eviction policy, either "lru" or "lfu"
+        tolerance: Quantization step used for the keys. None for exact matches
+
+    Usage:
+        cache = EvaluationCache(max_entries=1000, policy="lfu", tolerance=1e-9)
+        objective = Objective(himmelblau_function, n_vars=2, cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = 10_000,
+        max_bytes: int | None = None,
+        policy: str = "lru",
+        tolerance: float | None = None,
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError("policy must be either lru or lfu")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.tolerance = tolerance
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.n_bytes = 0
+
+        # key -> value for lru. Ordered from least to most recently used
+        self._values = OrderedDict()
+        # key -> use count and count -> keys (oldest first) for lfu
+        self._counts = {}
+        self._buckets = {}
+        self._min_count = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "bytes": self.n_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._values.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+        self.n_bytes = 0
+
+    def keys_for(self, points: np.ndarray) -> list:
+        """
+        Build the keys of a batch of points of shape (m, n_vars). Every row is
+        viewed as a single opaque value, so the keys are built in one numpy call
+        """
+        points = np.ascontiguousarray(points, dtype=float)
+        if self.tolerance is not None:
+            points = np.round(points / self.tolerance).astype(np.int64)
+
+        points = points.reshape(len(points), -1)
+        rows = points.view(np.dtype((np.void, points.itemsize * points.shape[1])))
+        return rows.ravel().tolist()
+
+    def lookup(self, keys: list) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the cached values and a mask of the keys that were found
+        """
+        cached = [self._values.get(key) for key in keys]
+        found = np.array([value is not None for value in cached], dtype=bool)
+        values = np.empty(len(keys))
+        if found.any():
+            values[found] = [value for value in cached if value is not None]
+            for key, hit in zip(keys, found):
+                if hit:
+                    self._touch(key)
+
+        n_found = int(found.sum())
+        self.hits += n_found
+        self.misses += len(keys) - n_found
+        return values, found
+
+    def store(self, keys: list, values: np.ndarray):
+        # Evicting once after the whole batch leaves the same entries as evicting
+        # after every insert, since new entries are both the most recently used
+        # and among the least frequently used
+        for key, value in zip(keys, np.asarray(values, dtype=float).tolist()):
+            if key in self._values:
+                continue
+
+            self._values[key] = value
+            self.n_bytes += self._entry_size(key)
+            if self.policy == "lfu":
+                self._counts[key] = 1
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+                self._min_count = 1
+
+        self._evict()
+
+    def _entry_size(self, key: bytes) -> int:
+        return len(key) + ENTRY_OVERHEAD
+
+    def _touch(self, key: bytes):
+        if self.policy == "lru":
+            self._values.move_to_end(key)
+            return
+
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _is_full(self) -> bool:
+        if self.max_entries is not None and len(self._values) > self.max_entries:
+            return True
+
+        return self.max_bytes is not None and self.n_bytes > self.max_bytes
+
+    def _evict(self):
+        while self._values and self._is_full():
+            if self.policy == "lru":
+                key, _ = self._values.popitem(last=False)
+            else:
+                bucket = self._buckets[self._min_count]
+                key, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del self._buckets[self._min_count]
+                    self._min_count = min(self._buckets, default=0)
+                del self._counts[key]
+                del self._values[key]
+
+            self.n_bytes -= self._entry_size(key)
+            self.evictions += 1
@@ -0,0 +1,165 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Instrumentation:
+    """
+    Callbacks, timers and counters for the solvers. Attach it to an Objective and
+    every solver using that objective reports to it.
+
+    Time is split into phases. The self time of a phase excludes the phases nested
+    in it, so the self times add up to the time of the run:
+        solver: Bookkeeping of the solver itself
+        evaluation: Calls to the objective function
+        derivatives: Finding derivatives, apart from the evaluations this makes
+        recording: Recording the summary rows
+
+    Args:
+        on_iteration: Called with the summary row after every iteration
+        on_evaluation: Called with the points and their values after every call
+            to the objective function
+        on_termination: Called with the Result of the solver. Solvers run by other
+            solvers (eg. bounding phase in brent) do not call it
+        events: Keep every phase as an event for write_chrome_trace
+        profile: Run the solvers under cProfile for write_profile
+
+    Usage:
+        instrumentation = Instrumentation(on_iteration=print)
+        objective = Objective(
+            himmelblau_function, n_vars=2, instrumentation=instrumentation
+        )
+        bfgs(-5, 5, epsilon=1e-6, objective=objective)
+        instrumentation.summary()
+    """
+
+    phases = ("solver", "evaluation", "derivatives", "recording")
+
+    def __init__(
+        self,
+        on_iteration=None,
+        on_evaluation=None,
+        on_termination=None,
+        events: bool = False,
+        profile: bool = False,
+    ):
+        self.on_iteration = on_iteration
+        self.on_evaluation = on_evaluation
+        self.on_termination = on_termination
+
+        self.counts = dict.fromkeys(self.phases, 0)
+        self.total_time = dict.fromkeys(self.phases, 0.0)
+        self.self_time = dict.fromkeys(self.phases, 0.0)
+        self.n_iterations = 0
+        self.n_points = 0  # Points passed to the objective function
+
+        self.events = [] if events else None
+        self.profiler = cProfile.Profile() if profile else None
+
+        self._origin = time.perf_counter()
+        self._stack = []  # [phase, start, time spent in nested phases]
+        self._depth = 0  # Number of solvers currently running
+
+    def enter(self, phase: str):
+        self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def exit(self):
+        phase, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+
+        self.counts[phase] += 1
+        self.total_time[phase] += elapsed
+        self.self_time[phase] += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+        if self.events is not None:
+            # Complete event of the chrome trace event format, times in microseconds
+            self.events.append(
+                {
+                    "name": phase,
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+
+    @contextmanager
+    def phase(self, phase: str):
+        self.enter(phase)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def start_run(self):
+        """
+        Called by result.SolverRun when a solver starts
+        """
+        if self._depth == 0 and self.profiler is not None:
+            self.profiler.enable()
+        self._depth += 1
+        self.enter("solver")
+
+    def end_run(self, result):
+        """
+        Called by result.SolverRun with the result of the solver
+        """
+        self.exit()
+        self._depth -= 1
+        if self._depth == 0:
+            if self.profiler is not None:
+                self.profiler.disable()
+            if self.on_termination is not None:
+                self.on_termination(result)
+
+    def iteration(self, row):
+        self.n_iterations += 1
+        if self.on_iteration is not None:
+            self.on_iteration(row)
+
+    def evaluation(self, points, values):
+        self.n_points += values.size
+        if self.on_evaluation is not None:
+            self.on_evaluation(points, values)
+
+    def summary(self) -> list[list]:
+        """
+        Rows of phase, count, total time, self time and share of the self time of
+        all the phases
+        """
+        total = sum(self.self_time.values()) or 1.0
+        return [
+            [
+                phase,
+                self.counts[phase],
+                self.total_time[phase],
+                self.self_time[phase],
+                self.self_time[phase] / total,
+            ]
+            for phase in self.phases
+        ]
+
+    def write_chrome_trace(self, path: str | Path):
+        """
+        Write the events in the chrome trace event format, which can be opened in
+        chrome://tracing or https://ui.perfetto.dev
+        """
+        if self.events is None:
+            raise ValueError("Events are only kept with Instrumentation(events=True)")
+
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+
+    def write_profile(self, path: str | Path):
+        """
+        Write the cProfile statistics, which can be read with pstats or snakeviz
+        """
+        if self.profiler is None:
+            raise ValueError("Profiles are only kept with Instrumentation(profile=True)")
+
+        self.profiler.dump_stats(str(path))
@@ -1,36 +1,87 @@
 #!/usr/bin/env python3
 
 import argparse
+import importlib
+from collections.abc import Mapping
 
-import numpy as np
-from tabulate import tabulate
-
-from algorithms.multi_var.evolutionary_search import evolutionary_search
-from algorithms.multi_var.simplex_search import simplex_search
-from algorithms.single_var.bisection import bisection
-from algorithms.single_var.bounding_phase import bounding_phase
-from algorithms.single_var.exhaustive_search import exhaustive_search
-from algorithms.single_var.fibonacci_search import fibonnacci_seatch
-from algorithms.single_var.golden_section import golden_section
-from algorithms.single_var.interval_halving import interval_halving
-from algorithms.single_var.newton_raphson import newton_raphson
-from constants import headers_dict, summary
-
-# All possible algorithms that can be used
-functions_dict = {
-    "exhaustive_search": exhaustive_search,
-    "bounding_phase": bounding_phase,
-    "interval_halving": interval_halving,
-    "fibonacci_search": fibonnacci_seatch,
-    "golden_section_search": golden_section,
-    "newton_raphson": newton_raphson,
-    "bisection": bisection,
-    "evo_search": evolutionary_search,
-    "simplex_search": simplex_search,
-}
+from constants import headers_dict
+
+
+class LazyFunctions(Mapping):
+    """
+    Dictionary of algorithm name -> solver which only imports the module of a
+    solver when it is looked up, so running one solver does not import all of them
+    """
+
+    def __init__(self, references: dict[str, str]):
+        self.references = references
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self.loaded:
+            module_name, function_name = self.references[name].split(":")
+            module = importlib.import_module(module_name)
+            self.loaded[name] = getattr(module, function_name)
+
+        return self.loaded[name]
+
+    def __iter__(self):
+        return iter(self.references)
+
+    def __len__(self):
+        return len(self.references)
+
+
+# All possible algorithms that can be used, as module:function
+functions_dict = LazyFunctions(
+    {
+        "exhaustive_search": (
+            "algorithms.single_var.exhaustive_search:exhaustive_search"
+        ),
+        "bounding_phase": "algorithms.single_var.bounding_phase:bounding_phase",
+        "interval_halving": "algorithms.single_var.interval_halving:interval_halving",
+        "fibonacci_search": "algorithms.single_var.fibonacci_search:fibonnacci_seatch",
+        "golden_section_search": "algorithms.single_var.golden_section:golden_section",
+        "newton_raphson": "algorithms.single_var.newton_raphson:newton_raphson",
+        "bisection": "algorithms.single_var.bisection:bisection",
+        "brent": "algorithms.single_var.brent:brent",
+        "multiresolution_search": (
+            "algorithms.single_var.multiresolution_search:multiresolution_search"
+        ),
+        "evo_search": "algorithms.multi_var.evolutionary_search:evolutionary_search",
+        "simplex_search": "algorithms.multi_var.simplex_search:simplex_search",
+        "steepest_descent": "algorithms.multi_var.gradient_search:steepest_descent",
+        "conjugate_gradient": "algorithms.multi_var.gradient_search:conjugate_gradient",
+        "bfgs": "algorithms.multi_var.gradient_search:bfgs",
+        "lbfgs": "algorithms.multi_var.gradient_search:lbfgs",
+    }
+)
 
 assert functions_dict.keys() == headers_dict.keys()  # Sanity check
 
+# Algorithms evaluating large batches of points which are rarely revisited. Their
+# objectives are not cached, as the lookups would cost more than they save
+uncached_algorithms = {
+    "exhaustive_search",
+    "multiresolution_search",
+    "evo_search",
+    "simplex_search",
+}
+
+# Algorithms drawing from the random generator, eg. for their starting point. Their
+# results are only reproducible, and so only cached, when --seed is given
+random_algorithms = {
+    "bounding_phase",
+    "newton_raphson",
+    "brent",
+    "evo_search",
+    "simplex_search",
+    "steepest_descent",
+    "conjugate_gradient",
+    "bfgs",
+    "lbfgs",
+}
+
 parser = argparse.ArgumentParser(description="Get the range and type of optimisation")
 parser.add_argument(
     "minpt",
@@ -68,20 +119,264 @@ parser.add_argument(
     default=100,
     required=False,
 )
-args = parser.parse_args()
+parser.add_argument(
+    "--objective",
+    type=str,
+    help=(
+        "Function to optimise. Either a registered name (see objective_registry), "
+        "module:function or an expression such as 'x**2 / 2 + 125 / x'"
+    ),
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--n-vars",
+    type=int,
+    help="Number of variables, for objectives taking any number of them",
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    help="Seed of the random starts, to reproduce a run",
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--trace-file",
+    type=str,
+    help="Stream the summary to a .csv or .npy file instead of printing it",
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--trace-capacity",
+    type=int,
+    help="Only keep the last N rows of the summary. Cannot be used with --trace-file",
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--no-trace",
+    action="store_true",
+    help="Do not record the summary",
+)
+parser.add_argument(
+    "--timings",
+    action="store_true",
+    help="Print the time spent evaluating, finding derivatives, recording and solving",
+)
+parser.add_argument(
+    "--profile",
+    type=str,
+    help=(
+        "Write a chrome trace (.json) of the phases of the run or a cProfile "
+        "profile (.prof) of the solver"
+    ),
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--cache",
+    action="store_true",
+    help="Reuse the result (and summary) of an identical earlier run",
+)
+parser.add_argument(
+    "--cache-path",
+    type=str,
+    help="Database of the cached results. Defaults to ~/.cache/optimisation_algorithms",
+    default=None,
+    required=False,
+)
+parser.add_argument(
+    "--cache-max-mb",
+    type=float,
+    help="Size limit of the cache, the least recently used results are evicted",
+    default=256,
+    required=False,
+)
 
-if args.delta is None and args.epsilon is None and args.iter is None:
-    raise ValueError("Must provide either delta, epsilon or iter")
 
-functions_dict[args.optimisation_type](
-    args.minpt, args.maxpt, args.delta, args.epsilon, args.iter, is_minimising=True
-)
+def default_objective(name: str) -> str:
+    """
+    Name of the objective a solver uses when none is given
+    """
+    if "multi_var" in functions_dict.references[name]:
+        return "himmelblau"
+    return "objective_function"
+
 
-# Ensure that the summary is of the correct shape
-assert len(summary) > 0 and len(summary[0]) == len(headers_dict[args.optimisation_type])
+def main():
+    args = parser.parse_args()
 
-print(
-    tabulate(
-        np.array(summary), headers_dict[args.optimisation_type], tablefmt="fancy_grid"
+    if args.delta is None and args.epsilon is None and args.iter is None:
+        raise ValueError("Must provide either delta, epsilon or iter")
+    if args.profile is not None and not args.profile.endswith((".json", ".prof")):
+        raise ValueError("Profiles must be either .json or .prof")
+
+    # Imported here so that --help does not import numpy
+    from recorder import Trace
+
+    trace = Trace(
+        capacity=args.trace_capacity, path=args.trace_file, enabled=not args.no_trace
     )
-)
+
+    objective = None
+    if args.objective is not None:
+        from objective_registry import resolve_objective
+
+        objective = resolve_objective(
+            args.objective,
+            args.n_vars,
+            cache=args.optimisation_type not in uncached_algorithms,
+        )
+
+    instrumentation = None
+    if args.timings or args.profile is not None:
+        from instrumentation import Instrumentation
+        from objective_registry import resolve_objective
+
+        instrumentation = Instrumentation(
+            events=args.profile is not None and args.profile.endswith(".json"),
+            profile=args.profile is not None and args.profile.endswith(".prof"),
+        )
+        if objective is None:
+            # The default objective of the solver, so that it can be timed
+            objective = resolve_objective(
+                default_objective(args.optimisation_type),
+                cache=args.optimisation_type not in uncached_algorithms,
+            )
+        objective.instrumentation = instrumentation
+
+    # Timings and profiles need an actual run, as do unseeded random searches
+    reproducible = (
+        args.seed is not None or args.optimisation_type not in random_algorithms
+    )
+    cache = key = cached = None
+    if args.cache and instrumentation is None and reproducible:
+        cache, key = open_cache(args, objective)
+        cached = cache.get(key)
+        if cached is not None and trace.enabled and cached.rows is None:
+            # Stored without its summary, which is wanted now
+            cached = None
+
+    if cached is not None:
+        result = cached.result
+        if trace.enabled:
+            trace.start(cached.columns)
+            for row in cached.rows:
+                trace.record(row)
+    else:
+        result = functions_dict[args.optimisation_type](
+            args.minpt,
+            args.maxpt,
+            args.delta,
+            args.epsilon,
+            args.iter,
+            is_minimising=True,
+            objective=objective,
+            trace=trace,
+            rng=args.seed,
+        )
+        if cache is not None:
+            # Only complete summaries held in memory are stored
+            complete = (
+                trace.enabled
+                and trace.path is None
+                and (trace.capacity is None or len(trace) <= trace.capacity)
+            )
+            cache.put(key, result, trace if complete else None)
+
+    trace.close()
+
+    # Solvers which stop before their first iteration, eg. when delta is longer than
+    # the interval, have no rows to show
+    if trace.enabled and trace.path is None and len(trace) > 0:
+        # Ensure that the summary is of the correct shape. The multi variable
+        # searches have more columns for objectives of more than 2 variables
+        if args.objective is None:
+            assert len(trace.columns) == len(headers_dict[args.optimisation_type])
+
+        from tabulate import tabulate
+
+        print(tabulate(trace.rows, trace.columns, tablefmt="fancy_grid"))
+
+    if cached is not None:
+        print("Result loaded from the cache")
+    print_result(result)
+
+    if instrumentation is not None:
+        report_instrumentation(instrumentation, args.timings, args.profile)
+
+
+def open_cache(args, objective):
+    """
+    The result cache and the key of the run described by args
+    """
+    from objective_registry import resolve_objective
+    from result_cache import ResultCache, cache_key
+
+    if objective is None:
+        objective = resolve_objective(default_objective(args.optimisation_type))
+
+    cache = ResultCache(args.cache_path, max_bytes=int(args.cache_max_mb * 2**20))
+    key = cache_key(
+        args.optimisation_type,
+        functions_dict[args.optimisation_type],
+        objective.func,
+        objective.n_vars,
+        min_pt=args.minpt,
+        max_pt=args.maxpt,
+        delta=args.delta,
+        epsilon=args.epsilon,
+        iter=args.iter,
+        seed=args.seed,
+        is_minimising=True,
+    )
+    return cache, key
+
+
+def report_instrumentation(instrumentation, timings: bool, profile: str | None):
+    if timings:
+        from tabulate import tabulate
+
+        print(
+            tabulate(
+                instrumentation.summary(),
+                ["phase", "count", "total (s)", "self (s)", "share"],
+                tablefmt="fancy_grid",
+            )
+        )
+
+    if profile is None:
+        return
+    if profile.endswith(".json"):
+        instrumentation.write_chrome_trace(profile)
+    else:
+        instrumentation.write_profile(profile)
+    print(f"Profile written to {profile}")
+
+
+def print_result(result):
+    """
+    Print the outcome of a solver run, see result.Result
+    """
+    if result.success:
+        print("Bracketed minima" if result.reason == "bracketed" else "Found minima")
+    else:
+        print("Could not find minima")
+
+    if result.x is not None:
+        print(f"x = {result.x}, f(x) = {result.fun}")
+    if result.bracket is not None:
+        print(f"Minima lies in ({result.bracket[0]}, {result.bracket[1]})")
+    print(
+        f"Stopped after {result.iterations} iterations and "
+        f"{result.n_evaluations} evaluations in {result.elapsed:.4f}s "
+        f"({result.reason})"
+    )
+
+
+if __name__ == "__main__":
+    main()
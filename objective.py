@@ -0,0 +1,253 @@
+import numpy as np
+
+from derivatives import (
+    Dual,
+    dual_derivatives,
+    finite_difference_step,
+    finite_differences,
+)
+from evaluation_cache import EvaluationCache
+
+
+class Objective:
+    """
+    Wrapper around an objective function which evaluates a whole batch of
+    candidate points in a single call.
+
+    The wrapped function must work elementwise on numpy arrays.
+    Single variable functions are called as f(x) and multi variable functions
+    with one array per coordinate, eg. f(x, y).
+
+    Args:
+        func: The objective function
+        n_vars: Number of variables the function takes
+        cache: Optional EvaluationCache. Cached points are not re-evaluated
+        gradient: Optional exact first derivative. Called like func and for multi
+            variable functions returns the n_vars partial derivatives
+        hessian: Optional exact second derivative of a single variable function
+        autodiff: Differentiate func with dual numbers when no gradient is given.
+            Falls back to finite differences if func does not support them
+        instrumentation: Optional instrumentation.Instrumentation timing the
+            evaluations and derivatives and receiving the callbacks of the solvers
+
+    Usage:
+        objective = Objective(himmelblau_function, n_vars=2)
+        objective(np.array([[3, 2], [0, 0]]))  # -> array([0., 170.])
+
+        objective = Objective(np.sin, gradient=np.cos, hessian=lambda x: -np.sin(x))
+        objective.derivatives(1.0)  # -> (sin(1), cos(1), -sin(1))
+    """
+
+    def __init__(
+        self,
+        func,
+        n_vars: int = 1,
+        cache: EvaluationCache | None = None,
+        gradient=None,
+        hessian=None,
+        autodiff: bool = True,
+        instrumentation=None,
+    ):
+        self.func = func
+        self.n_vars = n_vars
+        self.cache = cache
+        self.gradient = gradient
+        self.hessian = hessian
+        self.autodiff = autodiff
+        self.instrumentation = instrumentation
+
+        # Number of calls made to the objective and number of points evaluated
+        self.n_calls = 0
+        self.n_evaluations = 0
+
+    def __call__(self, points) -> np.ndarray:
+        """
+        Evaluate a batch of points.
+        For single variable functions points can be of any shape and the output is
+        of the same shape. For multi variable functions the last axis holds the
+        coordinates, so an array of shape (m, n_vars) returns m values.
+        """
+        points = np.asarray(points, dtype=float)
+
+        if self.n_vars == 1:
+            shape = points.shape
+        else:
+            assert (
+                points.shape[-1] == self.n_vars
+            ), f"Expected points with {self.n_vars} coordinates"
+            shape = points.shape[:-1]
+
+        self.n_calls += 1
+        if self.cache is None:
+            return self._evaluate(points)
+
+        # Only the points missing from the cache are evaluated, again in one call
+        flat = points.reshape(-1, self.n_vars)
+        keys = self.cache.keys_for(flat)
+        values, found = self.cache.lookup(keys)
+        if not found.all():
+            missing = ~found
+            missing_points = flat[missing] if self.n_vars > 1 else flat[missing, 0]
+            values[missing] = self._evaluate(missing_points)
+            self.cache.store([k for k, m in zip(keys, missing) if m], values[missing])
+
+        return values.reshape(shape)
+
+    def _evaluate(self, points: np.ndarray) -> np.ndarray:
+        if self.instrumentation is None:
+            return self._call(points)
+
+        with self.instrumentation.phase("evaluation"):
+            values = self._call(points)
+        self.instrumentation.evaluation(points, values)
+        return values
+
+    def _call(self, points: np.ndarray) -> np.ndarray:
+        if self.n_vars == 1:
+            values = self.func(points)
+            self.n_evaluations += points.size
+        else:
+            values = self.func(*np.moveaxis(points, -1, 0))
+            self.n_evaluations += points.size // self.n_vars
+
+        return np.asarray(values, dtype=float)
+
+    def _call_duals(self, points, *duals):
+        """
+        Call func on dual numbers seeded at points. Counted, timed and reported
+        like _evaluate
+        """
+        if self.instrumentation is None:
+            fx = self.func(*duals)
+        else:
+            with self.instrumentation.phase("evaluation"):
+                fx = self.func(*duals)
+
+            value = fx.value if isinstance(fx, Dual) else fx
+            if self.n_vars == 1:
+                values = np.broadcast_to(value, np.shape(points))
+            else:
+                # Every coordinate carries the value at the single point
+                values = np.ravel(value)[0]
+            self.instrumentation.evaluation(points, np.asarray(values, dtype=float))
+
+        self.n_calls += 1
+        self.n_evaluations += np.size(points) // self.n_vars
+        return fx
+
+    def value(self, point) -> float:
+        """
+        Evaluate a single point and return a plain float
+        """
+        return float(self(point))
+
+    def derivatives(self, x):
+        """
+        Find f(x), f'(x) and f''(x) of a single variable function, for a float or
+        an array of points. Uses the first of these which is available:
+            1. The exact gradient (and hessian, else differences of the gradient)
+            2. Dual numbers, which cost a single evaluation per point
+            3. Central finite differences, which cost three evaluations per point
+        """
+        assert self.n_vars == 1, "Derivatives need a single variable function"
+
+        if self.instrumentation is None:
+            return self._derivatives(x)
+
+        with self.instrumentation.phase("derivatives"):
+            return self._derivatives(x)
+
+    def _derivatives(self, x):
+
+        if self.gradient is not None:
+            x = np.asarray(x, dtype=float)
+            fx = self(x)
+            f_derivative = self.gradient(x)
+            if self.hessian is not None:
+                f_double_derivative = self.hessian(x)
+            else:
+                h = finite_difference_step(x)
+                f_double_derivative = (
+                    self.gradient(x + h) - self.gradient(x - h)
+                ) / (2 * h)
+
+            return (
+                fx,
+                np.asarray(f_derivative, dtype=float),
+                np.asarray(f_double_derivative, dtype=float),
+            )
+
+        if self.autodiff:
+            x = np.asarray(x, dtype=float)
+            try:
+                return dual_derivatives(lambda dual: self._call_duals(x, dual), x)
+            except TypeError:
+                # func uses something dual numbers do not support, eg. math.sin
+                self.autodiff = False
+
+        return finite_differences(self, x)
+
+    def value_and_gradient(self, x) -> tuple[float, np.ndarray]:
+        """
+        Find f(x) and the gradient at a single point of n_vars coordinates.
+        Uses the exact gradient if given, else dual numbers, where every coordinate
+        is seeded along its own axis so the whole gradient comes from a single
+        evaluation, else central differences costing 2 * n_vars + 1 evaluations.
+        """
+        if self.instrumentation is None:
+            return self._value_and_gradient(x)
+
+        with self.instrumentation.phase("derivatives"):
+            return self._value_and_gradient(x)
+
+    def _value_and_gradient(self, x) -> tuple[float, np.ndarray]:
+        x = np.asarray(x, dtype=float).reshape(self.n_vars)
+
+        if self.gradient is not None:
+            gradient = self.gradient(*x)
+            return self.value(x), np.asarray(gradient, dtype=float).reshape(self.n_vars)
+
+        if self.autodiff:
+            seeds = np.eye(self.n_vars)
+            coords = [
+                Dual(np.full(self.n_vars, xi), seeds[i], np.zeros(self.n_vars))
+                for i, xi in enumerate(x)
+            ]
+            try:
+                fx = self._call_duals(x, *coords)
+            except TypeError:
+                self.autodiff = False
+            else:
+                if not isinstance(fx, Dual):
+                    # Constant function
+                    return float(fx), np.zeros(self.n_vars)
+
+                return (
+                    float(np.ravel(fx.value)[0]),
+                    np.broadcast_to(fx.d1, self.n_vars).astype(float),
+                )
+
+        h = finite_difference_step(x)
+        steps = np.diag(h)
+        values = self(np.vstack([x, x + steps, x - steps]))
+        n = self.n_vars
+        # Infinite values, eg. outside a barrier, give a nan gradient
+        with np.errstate(invalid="ignore"):
+            return values[0], (values[1 : n + 1] - values[n + 1 :]) / (2 * h)
+
+
+def as_objective(objective, default, n_vars: int = 1, cache: bool = True) -> Objective:
+    """
+    Helper used by the solvers to accept either an Objective, a plain function
+    or None (in which case the default function is used).
+    Plain functions are wrapped with a bounded LRU cache unless cache is False.
+    Solvers evaluating large batches of points which are rarely revisited, eg.
+    evolutionary search, pass False as the lookups would cost more than they save
+    """
+    if objective is None:
+        objective = default
+
+    if isinstance(objective, Objective):
+        return objective
+
+    return Objective(objective, n_vars, cache=EvaluationCache() if cache else None)
@@ -0,0 +1,234 @@
+import ast
+import importlib
+import inspect
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from constants import (
+    himmelblau_function,
+    objective_function,
+    rosenbrock_function,
+    sphere_function,
+)
+from evaluation_cache import EvaluationCache
+from objective import Objective
+
+# Objectives which can be selected by name
+# name -> (function, number of variables). None for any number of variables
+objectives_dict = {
+    "objective_function": (objective_function, 1),
+    "himmelblau": (himmelblau_function, 2),
+    "sphere": (sphere_function, None),
+    "rosenbrock": (rosenbrock_function, None),
+}
+
+# Names which can be used in expressions, everything else is a variable
+expression_functions = {
+    name: getattr(np, name)
+    for name in [
+        "sin",
+        "cos",
+        "tan",
+        "arcsin",
+        "arccos",
+        "arctan",
+        "sinh",
+        "cosh",
+        "tanh",
+        "exp",
+        "log",
+        "log10",
+        "log2",
+        "sqrt",
+        "abs",
+        "square",
+        "minimum",
+        "maximum",
+    ]
+}
+expression_constants = {"pi": np.pi, "e": np.e}
+
+allowed_nodes = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.USub,
+    ast.UAdd,
+)
+
+reference_pattern = re.compile(r"^[A-Za-z_][\w.]*:[A-Za-z_]\w*$")
+
+
+def register_objective(name: str, n_vars: int | None = 1):
+    """
+    Decorator adding a function to objectives_dict
+
+    Usage:
+        @register_objective("booth", n_vars=2)
+        def booth(x, y):
+            return (x + 2 * y - 7) ** 2 + (2 * x + y - 5) ** 2
+    """
+
+    def decorator(func):
+        objectives_dict[name] = (func, n_vars)
+        return func
+
+    return decorator
+
+
+def variable_order(name: str):
+    # x1, x2, ..., x10 are sorted by their number, other names alphabetically
+    match = re.fullmatch(r"([A-Za-z_]+?)_?(\d+)", name)
+    if match:
+        return match.group(1), int(match.group(2))
+    return name, -1
+
+
+class CompiledExpression:
+    """
+    Objective function compiled from an expression like "x**2 / 2 + 125 / x" or
+    "(x**2 + y - 11)**2 + (x + y**2 - 7)**2".
+    The expression is parsed and compiled into a python function once, calls do
+    not go through eval. Only arithmetic, numbers, pi, e and the numpy functions in
+    expression_functions are allowed, every other name is a variable.
+    Expressions are picklable so that they can be sent to worker processes.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.variables, self.func = compile_expression(expression)
+        self.n_vars = len(self.variables)
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+    def __reduce__(self):
+        return CompiledExpression, (self.expression,)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression: str):
+    """
+    Returns the variables of the expression and a function taking them in order
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {expression!r}: {e.msg}") from None
+
+    variables = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, allowed_nodes):
+            raise ValueError(
+                f"{type(node).__name__} is not allowed in expression {expression!r}"
+            )
+
+        if isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in expression_functions
+                or node.keywords
+            ):
+                raise ValueError(f"Unknown function in expression {expression!r}")
+
+        elif isinstance(node, ast.Name) and node.id not in expression_functions:
+            if node.id not in expression_constants:
+                variables.add(node.id)
+
+        elif isinstance(node, ast.Constant) and not isinstance(
+            node.value, (int, float)
+        ):
+            raise ValueError(f"Only numbers are allowed in expression {expression!r}")
+
+    if not variables:
+        raise ValueError(f"Expression {expression!r} has no variables")
+
+    variables = sorted(variables, key=variable_order)
+
+    function = ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=tree.body,
+    )
+    code = compile(
+        ast.fix_missing_locations(ast.Expression(body=function)),
+        "<objective>",
+        "eval",
+    )
+    namespace = {"__builtins__": {}, **expression_functions, **expression_constants}
+    return tuple(variables), eval(code, namespace)
+
+
+def import_objective(reference: str):
+    """
+    Import a function given as module:function
+    """
+    module_name, function_name = reference.split(":")
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, function_name)
+    except AttributeError:
+        raise ValueError(f"{module_name} has no function {function_name}") from None
+
+
+def count_variables(func) -> int | None:
+    """
+    Number of positional arguments of func, None if it takes *args
+    """
+    parameters = inspect.signature(func).parameters.values()
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in parameters):
+        return None
+
+    return sum(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty
+        for p in parameters
+    )
+
+
+def resolve_objective(
+    spec: str, n_vars: int | None = None, cache: bool = True
+) -> Objective:
+    """
+    Build an Objective from
+        - the name of a registered objective, eg. himmelblau
+        - a module:function reference, eg. benchmark:sphere_function
+        - an expression, eg. "sin(x) * exp(-y**2)"
+    n_vars is only needed for functions taking any number of variables
+    """
+    if spec in objectives_dict:
+        func, func_n_vars = objectives_dict[spec]
+    elif reference_pattern.match(spec):
+        func = import_objective(spec)
+        func_n_vars = count_variables(func)
+    else:
+        func = CompiledExpression(spec)
+        func_n_vars = func.n_vars
+
+    if func_n_vars is None:
+        if n_vars is None:
+            raise ValueError(f"Must provide the number of variables of {spec}")
+        func_n_vars = n_vars
+    elif n_vars is not None and n_vars != func_n_vars:
+        raise ValueError(f"{spec} takes {func_n_vars} variables, not {n_vars}")
+
+    return Objective(func, func_n_vars, cache=EvaluationCache() if cache else None)
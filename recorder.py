@@ -0,0 +1,168 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+
+
+class Trace:
+    """
+    Per run recorder of the rows which the solvers used to append to the global
+    summary list.
+
+    Rows are stored in a typed numpy buffer which grows by doubling. When a capacity
+    is given the buffer becomes a ring buffer keeping only the latest rows. When a
+    path is given the rows are streamed to disk in chunks of chunk_rows:
+        - *.csv files are appended to
+        - *.npy paths produce one file per chunk, eg. run.00000.npy, run.00001.npy
+    Streamed traces keep every row, so a path cannot be combined with a capacity.
+    A disabled trace drops every row, so solvers pay nothing for recording.
+
+    Args:
+        columns: Names of the columns. Solvers set these through start()
+        capacity: Keep only the latest capacity rows. None to keep all
+        path: File to stream the rows to. None to keep them in memory. Cannot be
+            given with capacity
+        chunk_rows: Number of rows written to disk at a time
+        enabled: Set to False to disable recording
+        dtype: Type of the buffer
+
+    Usage:
+        trace = Trace()
+        golden_section(1, 10, epsilon=1e-3, trace=trace)
+        print(trace.columns, trace.rows)
+    """
+
+    def __init__(
+        self,
+        columns: list[str] | None = None,
+        capacity: int | None = None,
+        path: str | Path | None = None,
+        chunk_rows: int = 65_536,
+        enabled: bool = True,
+        dtype=float,
+    ):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if path is not None and Path(path).suffix not in (".csv", ".npy"):
+            raise ValueError("Trace files must be either .csv or .npy")
+        if path is not None and capacity is not None:
+            raise ValueError("Traces streamed to a file cannot have a capacity")
+
+        self.columns = columns or []
+        self.capacity = capacity
+        self.path = Path(path) if path is not None else None
+        self.chunk_rows = chunk_rows
+        self.enabled = enabled
+        self.dtype = dtype
+
+        self.n_recorded = 0
+        self.n_chunks = 0
+
+        self._lock = threading.Lock()
+        self._buffer = None
+        self._size = 0  # Rows currently held in the buffer
+        self._head = 0  # Position of the oldest row when used as a ring buffer
+
+    def __len__(self) -> int:
+        return self.n_recorded
+
+    def start(self, columns: list[str]):
+        """
+        Called by the solvers before recording the first row
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self.n_recorded and len(columns) != len(self.columns):
+                raise ValueError("Cannot change the number of columns of a trace")
+
+            self.columns = list(columns)
+
+    def record(self, row):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self._buffer is None:
+                self._buffer = np.empty(
+                    (self._initial_rows(), len(self.columns)), dtype=self.dtype
+                )
+
+            if self.capacity is not None and self.path is None:
+                if self._size == self.capacity:
+                    self._buffer[self._head] = row
+                    self._head = (self._head + 1) % self.capacity
+                    self.n_recorded += 1
+                    return
+
+            elif self._size == len(self._buffer):
+                if self.path is not None:
+                    self._write_chunk()
+                else:
+                    self._buffer = np.resize(
+                        self._buffer, (2 * self._size, len(self.columns))
+                    )
+
+            self._buffer[self._size] = row
+            self._size += 1
+            self.n_recorded += 1
+
+    @property
+    def rows(self) -> np.ndarray:
+        """
+        Rows held in memory, oldest first.
+        For streamed traces these are only the rows not yet written to disk
+        """
+        if self._buffer is None:
+            return np.empty((0, len(self.columns)), dtype=self.dtype)
+
+        with self._lock:
+            rows = self._buffer[: self._size]
+            return np.roll(rows, -self._head, axis=0) if self._head else rows.copy()
+
+    def flush(self):
+        """
+        Write the rows held in memory to disk
+        """
+        if self.path is None or not self._size:
+            return
+
+        with self._lock:
+            self._write_chunk()
+
+    def close(self):
+        self.flush()
+
+    def _initial_rows(self) -> int:
+        if self.path is not None:
+            return self.chunk_rows
+        if self.capacity is not None:
+            return self.capacity
+
+        return 1024
+
+    def _write_chunk(self):
+        chunk = self._buffer[: self._size]
+        if self.path.suffix == ".npy":
+            np.save(self.path.with_suffix(f".{self.n_chunks:05d}.npy"), chunk)
+        else:
+            with open(self.path, "w" if self.n_chunks == 0 else "a") as file:
+                np.savetxt(
+                    file,
+                    chunk,
+                    delimiter=",",
+                    fmt="%.17g",
+                    header=",".join(self.columns) if self.n_chunks == 0 else "",
+                    comments="",
+                )
+
+        self.n_chunks += 1
+        self._size = 0
+
+
+def as_trace(trace: Trace | None) -> Trace:
+    """
+    Helper used by the solvers. Without a trace nothing is recorded
+    """
+    return trace if trace is not None else Trace(enabled=False)
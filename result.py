@@ -0,0 +1,174 @@
+import time
+
+import numpy as np
+
+from recorder import as_trace
+
+
+class Result:
+    """
+    Outcome of a solver run. A result is truthy when the solver succeeded, so it
+    can be used wherever the solvers used to return True or False.
+
+    Attributes:
+        x: Best point found. A float for single variable solvers, else an array.
+            None if the solver failed before evaluating anything useful
+        fun: Value of the objective at x
+        bracket: Interval (min_pt, max_pt) containing the optimum, if known
+        iterations: Number of iterations performed
+        n_evaluations: Number of points evaluated by this run
+        reason: Why the solver stopped, one of
+            converged: The tolerance was reached
+            bracketed: A bracket of the optimum was found
+            max_iterations: The iteration limit was reached
+            max_evaluations: The evaluation budget was reached
+            out_of_bounds: The search left [min_pt, max_pt] without a bracket
+            no_start: No suitable starting point was found
+            no_progress: The search could not improve on the current point
+            infeasible: The solution violates the constraints
+        success: True if the optimum (or a bracket of it) was found
+        elapsed: Wall time of the run in seconds
+    """
+
+    __slots__ = (
+        "x",
+        "fun",
+        "bracket",
+        "iterations",
+        "n_evaluations",
+        "reason",
+        "success",
+        "elapsed",
+    )
+
+    def __init__(
+        self,
+        x,
+        fun,
+        reason: str,
+        success: bool,
+        bracket=None,
+        iterations: int = 0,
+        n_evaluations: int = 0,
+        elapsed: float = 0.0,
+    ):
+        self.x = x
+        self.fun = fun
+        self.bracket = bracket
+        self.iterations = iterations
+        self.n_evaluations = n_evaluations
+        self.reason = reason
+        self.success = success
+        self.elapsed = elapsed
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Result({fields})"
+
+    def as_dict(self) -> dict:
+        """
+        Fields as plain python values, eg. to be written as json
+        """
+
+        def plain(value):
+            if value is None:
+                return None
+            if isinstance(value, (tuple, list, np.ndarray)):
+                return [plain(v) for v in value]
+            if isinstance(value, (bool, np.bool_)):
+                return bool(value)
+            if isinstance(value, (int, np.integer)):
+                return int(value)
+            if isinstance(value, (float, np.floating)):
+                return float(value)
+            return value
+
+        return {name: plain(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, fields: dict) -> "Result":
+        """
+        Inverse of as_dict
+        """
+        fields = dict(fields)
+        if isinstance(fields["x"], list):
+            fields["x"] = np.array(fields["x"])
+        if fields["bracket"] is not None:
+            fields["bracket"] = tuple(fields["bracket"])
+
+        return cls(**fields)
+
+
+class SolverRun:
+    """
+    Started by a solver before it does any work. Starts the trace with the given
+    columns, records its rows, measures the elapsed time and the evaluations made
+    by the run and builds its Result. Reports to the instrumentation of the
+    objective, if any.
+
+    Usage:
+        run = SolverRun(objective, trace, headers_dict["golden_section_search"])
+        ...
+        run.record([iter_count, ...])
+        ...
+        return run.result(x, fx, "converged", iterations=iter_count)
+    """
+
+    def __init__(self, objective, trace=None, columns: list[str] | None = None):
+        self.objective = objective
+        self.trace = as_trace(trace)
+        if columns is not None:
+            self.trace.start(columns)
+
+        self.instrumentation = objective.instrumentation
+        if self.instrumentation is not None:
+            self.instrumentation.start_run()
+
+        self.start = time.perf_counter()
+        self.start_evaluations = objective.n_evaluations
+
+    def record(self, row):
+        """
+        Record the summary row of an iteration
+        """
+        if self.instrumentation is None:
+            self.trace.record(row)
+            return
+
+        with self.instrumentation.phase("recording"):
+            self.trace.record(row)
+        self.instrumentation.iteration(row)
+
+    def result(
+        self,
+        x,
+        fun,
+        reason: str,
+        success: bool = True,
+        bracket=None,
+        iterations: int = 0,
+    ) -> Result:
+        if x is not None and np.ndim(x) == 0:
+            x = float(x)
+        if fun is not None:
+            fun = float(fun)
+        if bracket is not None:
+            bracket = (float(bracket[0]), float(bracket[1]))
+
+        result = Result(
+            x,
+            fun,
+            reason,
+            success,
+            bracket,
+            iterations,
+            self.objective.n_evaluations - self.start_evaluations,
+            time.perf_counter() - self.start,
+        )
+        if self.instrumentation is not None:
+            self.instrumentation.end_run(result)
+
+        return result
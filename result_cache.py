@@ -0,0 +1,250 @@
+import hashlib
+import inspect
+import io
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from result import Result
+
+# Bump when a change outside the solver modules changes the results
+CACHE_VERSION = 1
+
+default_cache_path = Path.home() / ".cache" / "optimisation_algorithms" / "results.db"
+
+# Modules under this directory are hashed with the solvers depending on them
+project_root = Path(__file__).resolve().parent
+
+
+class CachedRun(NamedTuple):
+    result: Result
+    columns: list[str] | None  # Summary of the run. None if it was not stored
+    rows: np.ndarray | None
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def project_dependencies(module) -> list:
+    """
+    The module and every module of this project it uses, directly or through
+    other project modules, eg. brent -> bounding_phase -> objective
+    """
+    found = {}
+    pending = [module]
+    while pending:
+        module = pending.pop()
+        path = getattr(module, "__file__", None)
+        if module.__name__ in found or path is None:
+            continue
+        if not Path(path).resolve().is_relative_to(project_root):
+            continue
+
+        found[module.__name__] = module
+        for value in vars(module).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            elif isinstance(getattr(value, "__module__", None), str):
+                dependency = sys.modules.get(value.__module__)
+                if dependency is not None:
+                    pending.append(dependency)
+
+    return [found[name] for name in sorted(found)]
+
+
+def function_identity(func) -> str:
+    """
+    Identity of a solver or objective function: its qualified name and a hash of
+    the source of its module and of the project modules it depends on, so editing
+    any of them invalidates its results. Compiled expressions are identified by
+    their expression.
+    """
+    expression = getattr(func, "expression", None)
+    if expression is not None:
+        return f"expression:{expression}"
+
+    name = f"{func.__module__}.{func.__qualname__}"
+    module = inspect.getmodule(func)
+    if module is None:
+        return name
+
+    try:
+        sources = [
+            f"{dependency.__name__}\n{inspect.getsource(dependency)}"
+            for dependency in project_dependencies(module)
+        ]
+    except (TypeError, OSError):
+        # Builtins and functions defined in an interactive session
+        return name
+
+    if not sources:
+        # Functions of installed packages, eg. numpy.sin
+        return name
+
+    return f"{name}:{digest(''.join(sources))}"
+
+
+def cache_key(algorithm: str, solver, objective, n_vars: int, **params) -> str:
+    """
+    Hash of everything a run depends on: the algorithm and its source, the
+    objective function and its source and the parameters, eg. the bounds,
+    tolerances and seed. params must be json serialisable.
+    """
+    config = {
+        "version": CACHE_VERSION,
+        "algorithm": algorithm,
+        "solver": function_identity(solver),
+        "objective": function_identity(objective),
+        "n_vars": n_vars,
+        "params": params,
+    }
+    return digest(json.dumps(config, sort_keys=True))
+
+
+class ResultCache:
+    """
+    Results of solver runs, and optionally their summary, stored in an SQLite
+    database and keyed by cache_key. The database can be shared by any number of
+    processes. When the stored results grow beyond max_bytes or max_entries the
+    least recently used ones are evicted.
+
+    Args:
+        path: Database file. Defaults to default_cache_path
+        max_bytes: Approximate size budget of the stored results. None for no limit
+        max_entries: Maximum number of stored results. None for no limit
+
+    Usage:
+        cache = ResultCache(max_bytes=64 * 2**20)
+        key = cache_key("golden_section_search", golden_section, objective_function,
+                        1, min_pt=1, max_pt=10, epsilon=1e-3)
+        cached = cache.get(key)
+        if cached is None:
+            cache.put(key, golden_section(1, 10, epsilon=1e-3, trace=trace), trace)
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_bytes: int | None = 256 * 2**20,
+        max_entries: int | None = None,
+    ):
+        self.path = Path(path) if path is not None else default_cache_path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    columns TEXT,
+                    rows BLOB,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        query = "SELECT 1 FROM results WHERE key = ?"
+        return self.connection.execute(query, (key,)).fetchone() is not None
+
+    def stats(self) -> dict:
+        entries, n_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": n_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key: str) -> CachedRun | None:
+        query = "SELECT result, columns, rows FROM results WHERE key = ?"
+        stored = self.connection.execute(query, (key,)).fetchone()
+        if stored is None:
+            self.misses += 1
+            return None
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        self.hits += 1
+
+        result, columns, rows = stored
+        if rows is not None:
+            columns = json.loads(columns)
+            rows = np.load(io.BytesIO(rows))
+
+        return CachedRun(Result.from_dict(json.loads(result)), columns, rows)
+
+    def put(self, key: str, result: Result, trace=None):
+        """
+        Store a result. The rows of the trace are stored too if given
+        """
+        columns = rows = None
+        if trace is not None:
+            buffer = io.BytesIO()
+            np.save(buffer, trace.rows)
+            columns, rows = json.dumps(trace.columns), buffer.getvalue()
+
+        result = json.dumps(result.as_dict())
+        size = len(key) + len(result) + (len(rows) if rows is not None else 0)
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, result, columns, rows, size, time.time()),
+            )
+            self._evict()
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
+
+    def close(self):
+        self.connection.close()
+
+    def _evict(self):
+        entries, n_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+
+        evicted = []
+        oldest = self.connection.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        )
+        for key, size in oldest:
+            too_many = self.max_entries is not None and entries > self.max_entries
+            too_big = self.max_bytes is not None and n_bytes > self.max_bytes
+            if not (too_many or too_big) or entries == 1:
+                break
+
+            evicted.append((key,))
+            entries -= 1
+            n_bytes -= size
+
+        self.connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.evictions += len(evicted)
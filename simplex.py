@@ -7,19 +7,22 @@
 # 1. Uses the simplex search algorithm to find the global minima of the Himmelblau's function
 # 2. Uses the tabulate library to print the summary table
 # 3. Uses the matplotlib library to plot the points for each iteration
-# 4. Uses the PIL library to generate the gif from the images
+# 4. Uses the PIL library to generate the gif from the in memory frames
 # 5. Uses multiple initial points to ensure that all the global minima are found
 # 6. Takes into account the stopping criteria and terminates the algorithm when the points are too close to each other
 # 7. Considers if the points are collinear and restarts the algorithm with different initial points
+#    The search itself is the N dimensional engine in algorithms/multi_var/nelder_mead.py
 # 8. Dynamically plots the number of minima and gif according to the number of initial points
+# 9. Runs the initial points in parallel on a process pool with reproducible seeding
+# 10. Can be imported as a library. tabulate, matplotlib and PIL are only imported
+#     when the table is printed or the gifs are rendered
 
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
-from random import uniform
-from tabulate import tabulate
-import matplotlib.pyplot as plt
-import glob
-from PIL import Image
+
+from algorithms.multi_var.nelder_mead import nelder_mead, simplex_volume
+from objective import Objective
 
 # --------------------------------------------------------------------------------- #
 # --------------------------------- Input variable -------------------------------- #
@@ -31,6 +34,11 @@ ub = [5, 5]
 gamma = 1.5  # Gamma value for the reflection. Taken from notes
 beta = 0.5  # Beta value for the contraction. Taken from notes
 epsilon = 0.000001  # Epsilon value for the stopping criteria. Taken from notes
+n_starts = 16  # Number of random initial points
+workers = os.cpu_count()  # Number of parallel workers. 1 runs the starts one by one
+seed = None  # Seed of the random initial points. Set an int to reproduce a run
+render = True  # Set to False to skip the plots and gifs, eg. for headless batch runs
+save_frames = False  # Also save every frame as png in the frame_folder
 
 
 # --------------------------------------------------------------------------------- #
@@ -53,23 +61,25 @@ def himmelblau_function(x, y):
     return (x**2 + y - 11) ** 2 + (x + y**2 - 7) ** 2
 
 
-# Folder name to store the frames used to generate the animation
+# Folder name to store the frames used to generate the animation, if save_frames is set
 frame_folder = "./Animation"
 
-# Array which stores the points for each iteration. Used to plot the points in the animation and visualize the algorithm
+# Array which stores the points for each iteration of the run below. Used to print the summary table
 summary = []
 
 
 # --------------------------------------------------------------------------------- #
 # --------------------------------- Helper functions ------------------------------ #
 # --------------------------------------------------------------------------------- #
-def add_to_summary(iteration, simplex):
+def add_to_summary(iteration, simplex, value=None, summary=summary):
     """
     Helper function to properly format the summary table.
     Convert the nd array into a proper printable string for great output
     Args:
         iteration (int): Iteration number
         simplex (ndarray): Simplex array
+        value (float): Function value of the first point, if already known
+        summary (list): Summary to append to. Defaults to the global summary
 
     Returns:
         None. Appends to the summary array
@@ -85,7 +95,10 @@ def add_to_summary(iteration, simplex):
         str += ")"
         summary_item.append(str)
 
-    summary_item.append(himmelblau_function(*simplex[0]))
+    if value is None:
+        value = himmelblau_function(*simplex[0])
+
+    summary_item.append(value)
     summary.append(summary_item)
 
 
@@ -98,79 +111,237 @@ def find_area(points):
     Args:
         points: 3 points in the simplex
     Returns:
-        None: Plots the image and saves it in Animation folder
+        Twice the area of the triangle
     """
-    A = np.append(points.T, np.array([[1, 1, 1]]), axis=0)
-    return abs(np.linalg.det(A))
+    return 2 * simplex_volume(points)
 
 
-def plot_function(pointsforplot, lb, ub, iteration=0):
+def contour_grid(lb, ub, n=50):
     """
-    Plot the function and the points for each iteration
+    Compute the grid of the contour plot. This is done once and shared by every frame
     Args:
-        pointsforplot: Points to plot
         lb: Lower bound
         ub: Upper bound
-        iteration: Iteration number
+        n: Number of points along each axis
     """
-    x = np.linspace(lb[0], ub[0], 50)
-    y = np.linspace(lb[1], ub[1], 50)
+    x = np.linspace(lb[0], ub[0], n)
+    y = np.linspace(lb[1], ub[1], n)
 
     X, Y = np.meshgrid(x, y)
-    Z = himmelblau_function(X, Y)
-
-    fig1, ax1 = plt.subplots()
-    ax1.contour(X, Y, Z, cmap="coolwarm", levels=50)
-    ax1.scatter(pointsforplot[0, 0], pointsforplot[0, 1], color="red", marker="*", s=50)
-    ax1.scatter(pointsforplot[1, 0], pointsforplot[1, 1], color="red", marker="*", s=50)
-    ax1.scatter(pointsforplot[2, 0], pointsforplot[2, 1], color="red", marker="*", s=50)
-    ax1.plot(
-        [pointsforplot[0, 0], pointsforplot[1, 0]],
-        [pointsforplot[0, 1], pointsforplot[1, 1]],
-        color="red",
-        linewidth=1,
-    )
-    ax1.plot(
-        [pointsforplot[1, 0], pointsforplot[2, 0]],
-        [pointsforplot[1, 1], pointsforplot[2, 1]],
-        color="red",
-        linewidth=1,
-    )
-    ax1.plot(
-        [pointsforplot[0, 0], pointsforplot[2, 0]],
-        [pointsforplot[0, 1], pointsforplot[2, 1]],
-        color="red",
-        linewidth=1,
+    return X, Y, himmelblau_function(X, Y)
+
+
+def render_frames(simplices, grid, frame_folder=None, dpi=100):
+    """
+    Plot the function and the points for each iteration
+    A single figure is used for all the frames. The contour is drawn once and kept
+    as background, only the simplex and the title are redrawn on top of it per frame.
+    Frames are rendered in memory.
+    Args:
+        simplices: Simplex for each iteration
+        grid: X, Y, Z of the contour. See contour_grid
+        frame_folder: If given, the frames are also saved as png in this folder
+        dpi: Resolution of the frames
+
+    Returns:
+        frames: List of PIL images
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    fig = Figure(dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.contour(*grid, cmap="coolwarm", levels=50)
+    ax.set(xlabel="x1", ylabel="x2")
+    (triangle,) = ax.plot(
+        [], [], color="red", linewidth=1, marker="*", markersize=7, animated=True
     )
-    ax1.set(xlabel="x1", ylabel="x2")
-    ax1.set_title("Iteration {}".format(iteration))
-    plt.savefig(f"{frame_folder}/fig{str(iteration).zfill(3)}.png", dpi=400)
-    plt.show()
+    title = ax.set_title("", animated=True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    frames = []
+    for iteration, points in enumerate(simplices):
+        canvas.restore_region(background)
+
+        # Close the triangle by going back to the first point
+        closed = np.append(points, points[:1], axis=0)
+        triangle.set_data(closed[:, 0], closed[:, 1])
+        title.set_text("Iteration {}".format(iteration))
+        ax.draw_artist(triangle)
+        fig.draw_artist(title)
+
+        frame = Image.fromarray(np.asarray(canvas.buffer_rgba())).convert("RGB")
+        frames.append(frame)
+
+        if frame_folder is not None:
+            frame.save(f"{frame_folder}/fig{str(iteration).zfill(3)}.png")
 
+    return frames
 
-def make_gif(frame_folder, count):
+
+def make_gif(frames, count):
     """
-    Uses all the images from the folder and creates a gif
+    Creates a gif from the frames
+    All the frames share the palette of the first one, which avoids quantizing
+    every frame separately
     Args:
-        frame_folder: Folder name
+        frames: List of PIL images
         count: Count of the gif
 
     """
-    frames = [Image.open(image) for image in sorted(glob.glob(f"{frame_folder}/*.png"))]
-    frame_one = frames[0]
-    frame_one.save(
+    from PIL import Image
+
+    palette = frames[0].quantize()
+    frames = [
+        frame.quantize(palette=palette, dither=Image.Dither.NONE) for frame in frames
+    ]
+    frames[0].save(
         "Simplex" + str(count) + ".gif",
         format="GIF",
-        append_images=frames,
+        append_images=frames[1:],
         save_all=True,
         duration=1000,
         loop=5,
     )
 
 
+def render_gif(simplices, grid, count, frame_folder=None, dpi=100):
+    """
+    Render the frames of one solution and write its gif
+    Args:
+        simplices: Simplex for each iteration
+        grid: X, Y, Z of the contour. See contour_grid
+        count: Count of the gif
+        frame_folder: If given, the frames are also saved as png in frame_folder/count
+        dpi: Resolution of the frames
+    """
+    if frame_folder is not None:
+        frame_folder = f"{frame_folder}/{count}"
+        os.makedirs(frame_folder, exist_ok=True)
+
+    make_gif(render_frames(simplices, grid, frame_folder, dpi), count)
+
+
+def render_gifs(sol_simplex, lb, ub, frame_folder=None, workers=None, dpi=100):
+    """
+    Render the gif of every solution. Each gif is rendered by a separate worker
+    Args:
+        sol_simplex: List of simplices for each solution
+        lb: Lower bound
+        ub: Upper bound
+        frame_folder: If given, the frames are also saved as png in this folder
+        workers: Number of parallel workers. None uses every cpu, 1 runs serially
+        dpi: Resolution of the frames
+    """
+    grid = contour_grid(lb, ub)
+
+    if workers == 1:
+        for count, simplices in enumerate(sol_simplex):
+            render_gif(simplices, grid, count, frame_folder, dpi)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(render_gif, simplices, grid, count, frame_folder, dpi)
+            for count, simplices in enumerate(sol_simplex)
+        ]
+        for future in futures:
+            future.result()
+
+
 # --------------------------------------------------------------------------------- #
 # --------------------------------- Main function --------------------------------- #
 # --------------------------------------------------------------------------------- #
+def random_simplex(rng, lb, ub):
+    """
+    Generate 3 random points within the search space
+    Args:
+        rng: numpy random Generator
+        lb: Lower bound
+        ub: Upper bound
+    """
+    return rng.uniform(lb, ub, size=(3, len(lb)))
+
+
+def run_start(lb, ub, gamma, beta, epsilon, iter, seed_sequence, objective=None):
+    """
+    Run the simplex search from a single random initial point
+    Args:
+        lb: Lower bound - List of lower bounds for each dimension
+        ub: Upper bound - List of upper bounds for each dimension
+        gamma: Gamma value for the reflection
+        beta: Beta value for the contraction
+        epsilon: Epsilon value for the stopping criteria
+        iter: Number of iterations
+        seed_sequence: Seed of this start. Every start gets its own random stream
+        objective: Objective to minimise. Defaults to the himmelblau function
+
+    Returns:
+        minima: Best point of the final simplex
+        simplex_points: Simplex for each iteration
+        summary: Summary rows of this start
+        counts: Calls and evaluations of the objective made by this start
+    """
+    rng = np.random.default_rng(seed_sequence)
+    if objective is None:
+        objective = Objective(himmelblau_function, n_vars=2)
+    start_counts = objective.n_calls, objective.n_evaluations
+    summary = []
+
+    # Generate 3 random points within the search space
+    # Ensure that the points are not collinear.
+    # If colinear find new points
+    while True:
+        initial_simplex = random_simplex(rng, lb, ub)
+
+        if find_area(initial_simplex) > 1e-6:
+            break
+
+    simplex = np.array(initial_simplex)
+    add_to_summary(0, simplex, summary=summary)
+    simplex_points = [simplex]
+
+    def restart(simplex):
+        # If the points are collinear, we restart the algorithm with different initial points
+        # Unless the points are close to each other, in which case it has converged
+        if np.sqrt(np.mean((simplex[0] - simplex[1]) ** 2)) > 1:
+            print("Points are collinear: Restaring with different initial points")
+            return random_simplex(rng, lb, ub)
+
+    def record(iteration, simplex, fvals, n_evaluations):
+        add_to_summary(iteration, simplex, fvals[0], summary)
+        simplex_points.append(simplex.copy())
+
+    # Run the algorithm for the given number of iterations
+    # Points going out of bound are brought back to the bound
+    # The algorithm stops when the values of the points are within epsilon
+    result = nelder_mead(
+        objective,
+        simplex,
+        epsilon,
+        iter,
+        lb=lb,
+        ub=ub,
+        expansion=gamma,
+        contraction=beta,
+        min_volume=0.005,  # find_area < 0.01
+        restart=restart,
+        callback=record,
+    )
+    if result.converged:
+        print("Epsilon reached!")
+
+    counts = (
+        objective.n_calls - start_counts[0],
+        objective.n_evaluations - start_counts[1],
+    )
+    return result.simplex[0], np.array(simplex_points), summary, counts
+
+
 def simplex_search(
     lb,
     ub,
@@ -178,9 +349,18 @@ def simplex_search(
     beta=None,
     epsilon=None,
     iter=500,
+    n_starts=16,
+    workers=None,
+    seed=None,
+    executor="process",
+    objective=None,
+    summary=None,
 ):
     """
     Uses the simplex search algorithm to find the global minima of the Himmelblau's function
+    The starts are independent, so they are fanned out over a pool of workers and
+    merged in the order of the starts. The result only depends on the seed and not
+    on the number of workers.
     Args:
         lb: Lower bound - List of lower bounds for each dimension
         ub: Upper bound - List of upper bounds for each dimension
@@ -188,6 +368,16 @@ def simplex_search(
         beta: Beta value for the contraction
         epsilon: Epsilon value for the stopping criteria
         iter: Number of iterations
+        n_starts: Number of random initial points
+        workers: Number of parallel workers. None uses every cpu, 1 runs serially
+        seed: Seed of the random initial points
+        executor: Either "process" or "thread"
+        objective: Objective to minimise. Defaults to the himmelblau function.
+            Worker processes evaluate a copy of it, whose calls and evaluations are
+            added back to it. An objective with a cache or instrumentation is run
+            on threads instead, so that they see every evaluation
+        summary: List to which the summary rows of every start are appended, in
+            the order of the starts. None to not keep them
 
     ArgTypes:
         lb: list
@@ -196,6 +386,12 @@ def simplex_search(
         beta: float
         epsilon: float
         iter: int
+        n_starts: int
+        workers: int
+        seed: int
+        executor: str
+        objective: objective.Objective
+        summary: list
 
     Returns:
         solutions: List of solutions
@@ -209,141 +405,86 @@ def simplex_search(
     assert gamma > 1, "Gamma must be greater than 1"
     assert 0 < beta < 1, "Beta must lie between 0 and 1"
     assert lb[0] < ub[0] and lb[1] < ub[1], "Lower bound must be less than upper bound"
+    assert executor in ("process", "thread"), "Executor must be process or thread"
 
-    # Run the algorithm for 16 different initial points
+    # Run the algorithm for n_starts different initial points
     # This is done to ensure we find all the global minima
-    for num in range(16):
-        # Generate 3 random points within the search space
-        # Ensure that the points are not collinear.
-        # If colinear find new points
-        while True:
-            initial_simplex = np.array(
-                [
-                    [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                    [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                    [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                ]
-            )
-
-            if find_area(initial_simplex) > 1e-6:
-                break
+    # Each start gets an independent random stream spawned from the seed
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_starts)
+    args = [
+        (lb, ub, gamma, beta, epsilon, iter, ss, objective) for ss in seed_sequences
+    ]
+
+    shared = objective is not None and (
+        objective.cache is not None or objective.instrumentation is not None
+    )
+    in_processes = workers != 1 and executor == "process" and not shared
 
-        # Sort the points based on the function value
-        simplex = np.array(initial_simplex)
-        add_to_summary(0, simplex)
-        simplex_points = np.array([simplex])
-
-        # Run the algorithm for the given number of iterations
-        for i in range(iter):
-            simplex = simplex[
-                np.argsort([himmelblau_function(x[0], x[1]) for x in simplex])
-            ]
-
-            centroid = np.mean(simplex[:-1], axis=0)
-            x2 = centroid + (centroid - simplex[-1])
-            if (
-                himmelblau_function(*simplex[0])
-                <= himmelblau_function(*x2)
-                < himmelblau_function(*simplex[-2])
-            ):
-                simplex[-1] = x2
-            else:
-                if himmelblau_function(*x2) < himmelblau_function(*simplex[0]):
-                    # xnew = centroid + 2 * (x2 - centroid)
-                    xnew = (1 + gamma) * centroid - gamma * simplex[-1]
-                    simplex[-1] = xnew
-
-                else:
-                    if himmelblau_function(*simplex[-2]) < himmelblau_function(
-                        *x2
-                    ) and himmelblau_function(*x2) < himmelblau_function(*simplex[-1]):
-                        xnew = (1 + beta) * centroid - beta * simplex[-1]
-                    else:
-                        xnew = (1 - beta) * centroid + beta * simplex[-1]
-                    simplex[-1] = xnew
-
-            # When the points go out of bound, we bring them back to the bound
-            # Ensure that the points are within the search space
-            if not (
-                (lb[0] < simplex[-1][0] < ub[0]) and (lb[1] < simplex[-1][1] < ub[1])
-            ):
-                print("Out of bound!")
-                for i in range(len(lb)):
-                    if simplex[-1][i] < lb[i]:
-                        simplex[-1][i] = lb[i]
-                    elif simplex[-1][i] > ub[i]:
-                        simplex[-1][i] = ub[i]
-
-            # If the points are collinear, we restart the algorithm with different initial points
-            if (
-                find_area(simplex) < 0.01
-                and np.sqrt(np.mean((simplex[0] - simplex[1]) ** 2)) > 1
-            ):
-                print("Points are collinear: Restaring with different initial points")
-                simplex = np.array(
-                    [
-                        [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                        [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                        [uniform(lb[0], ub[0]), uniform(lb[1], ub[1])],
-                    ]
-                )
-
-            # If the points are too close to each other, we stop the algorithm
-            # This is the termination criteria
-            if np.all(
-                np.abs(
-                    himmelblau_function(*simplex[0]) - himmelblau_function(*simplex[-1])
-                )
-                < epsilon
-            ):
-                print("Epsilon reached!")
-                break
+    if workers == 1:
+        runs = [run_start(*arg) for arg in args]
+    else:
+        pool = ProcessPoolExecutor if in_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as pool:
+            runs = list(pool.map(run_start, *zip(*args)))
+
+    if in_processes and objective is not None:
+        # The workers evaluated copies of the objective
+        for *_, (n_calls, n_evaluations) in runs:
+            objective.n_calls += n_calls
+            objective.n_evaluations += n_evaluations
 
-            add_to_summary(i, simplex)
-            simplex_points = np.append(simplex_points, [simplex], axis=0)
+    for minima, simplex_points, start_summary, _ in runs:
+        if summary is not None:
+            summary.extend(start_summary)
 
         # Ensure that the solutions are unique.
         # If the distance between the points is less than 1e-2, then they are the same
         flag = True
         for i in range(len(solutions)):
-            if np.sqrt(np.mean((simplex[0] - solutions[i]) ** 2)) < 1e-2:
+            if np.sqrt(np.mean((minima - solutions[i]) ** 2)) < 1e-2:
                 flag = False
                 break
 
         if flag:
-            solutions.append(simplex[0])
+            solutions.append(minima)
             solutions_simplex.append(simplex_points)
     return solutions, solutions_simplex
 
 
-# --------------------------------------------------------------------------------- #
-# --------------------------------- Setup ----------------------------------------- #
-# --------------------------------------------------------------------------------- #
-
-# Create a folder named frame_folder to store the images
-if not os.path.exists(frame_folder):
-    os.makedirs(frame_folder)
-
 # --------------------------------------------------------------------------------- #
 # --------------------------------- Run the algorithm ----------------------------- #
 # --------------------------------------------------------------------------------- #
-sol, sol_simplex = simplex_search(lb, ub, gamma, beta, epsilon)
-
-# Print the summary table
-print(
-    tabulate(
-        np.array(summary),
-        ["iteration", "x0", "x1", "x2", "func"],
-        tablefmt="fancy_grid",
+if __name__ == "__main__":
+    sol, sol_simplex = simplex_search(
+        lb,
+        ub,
+        gamma,
+        beta,
+        epsilon,
+        n_starts=n_starts,
+        workers=workers,
+        seed=seed,
+        summary=summary,
     )
-)
 
+    from tabulate import tabulate
+
+    # Print the summary table
+    print(
+        tabulate(
+            np.array(summary),
+            ["iteration", "x0", "x1", "x2", "func"],
+            tablefmt="fancy_grid",
+        )
+    )
 
-# Plot the points for each iteration
-for i in range(len(sol)):
-    # Plot the points for each iteration.
+    # Plot the points for each iteration and generate a gif per solution.
     # The points are stored in the sol_simplex array
-    # The images are later used to generate the gif
-    for j in range(sol_simplex[i].shape[0]):
-        plot_function(sol_simplex[i][j], lb, ub, iteration=j)
-    make_gif(frame_folder, i)
+    if render:
+        render_gifs(
+            sol_simplex,
+            lb,
+            ub,
+            frame_folder=frame_folder if save_frames else None,
+            workers=workers,
+        )
@@ -0,0 +1,87 @@
+import io
+import json
+
+import pytest
+
+from batch import read_manifest, run_batch, run_job, seed_jobs
+
+
+def test_missing_iter_defaults_to_100(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "algorithm,min_pt,max_pt,epsilon,iter\n"
+        "evo_search,-5,5,0.001,\n"
+        "simplex_search,-5,5,0.001,\n"
+        "golden_section_search,1,10,0.001,20\n"
+    )
+
+    jobs = seed_jobs(read_manifest(path), seed=0)
+    results = [run_job(job) for job in jobs]
+
+    assert [job["iter"] for job in jobs] == [100, 100, 20]
+    assert [job["id"] for job in jobs] == ["0", "1", "2"]
+    for result in results:
+        assert "error" not in result
+        assert result["success"]
+
+
+def write_manifest(tmp_path, jobs):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps({"jobs": jobs}))
+    return path
+
+
+def test_json_manifest(tmp_path):
+    path = write_manifest(
+        tmp_path,
+        [
+            {"algorithm": "bfgs", "objective": "sphere", "n_vars": 3, "epsilon": 1e-6},
+            {"id": "expression", "algorithm": "brent", "objective": "(x - 2)**2"},
+        ],
+    )
+
+    jobs = read_manifest(path)
+
+    assert [job["id"] for job in jobs] == ["0", "expression"]
+    assert jobs[0]["n_vars"] == 3
+    assert jobs[1]["min_pt"] is None
+
+
+@pytest.mark.parametrize(
+    "job", [{"algorithm": "bfgs", "bounds": 1}, {"algorithm": "no_such_algorithm"}]
+)
+def test_invalid_jobs(tmp_path, job):
+    with pytest.raises(ValueError):
+        read_manifest(write_manifest(tmp_path, [job]))
+
+
+def test_errors_are_reported_in_the_result(tmp_path):
+    jobs = read_manifest(
+        write_manifest(tmp_path, [{"algorithm": "bfgs", "min_pt": -5, "max_pt": 5}])
+    )
+
+    result = run_job(jobs[0])
+
+    assert result["error"] == "ValueError: Must provide epsilon for gradient search"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(tmp_path, workers):
+    # The bfgs jobs have no epsilon and fail
+    path = write_manifest(
+        tmp_path,
+        [
+            {"algorithm": "evo_search", "min_pt": -5, "max_pt": 5, "epsilon": 1e-3},
+            {"algorithm": "bfgs", "min_pt": -5, "max_pt": 5},
+        ]
+        * 3,
+    )
+    output = io.StringIO()
+
+    failed = run_batch(
+        seed_jobs(read_manifest(path), 0), output, workers=workers, chunk_size=2
+    )
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert failed == 3
+    assert sorted(result["id"] for result in results) == [str(i) for i in range(6)]
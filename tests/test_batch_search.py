@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from algorithms.single_var.batch_search import (
+    bisection_batch,
+    golden_section_batch,
+    interval_halving_batch,
+    newton_raphson_batch,
+)
+from objective import Objective
+
+solvers = [
+    golden_section_batch,
+    interval_halving_batch,
+    bisection_batch,
+    newton_raphson_batch,
+]
+centres = np.linspace(-3, 3, 50)
+min_pts = np.full(50, -5.0)
+max_pts = np.full(50, 5.0)
+
+
+def shifted_quadratic(x, centre):
+    return (x - centre) ** 2 + 1
+
+
+@pytest.mark.parametrize("solver", solvers)
+def test_every_problem_finds_its_own_minimum(solver):
+    result = solver(min_pts, max_pts, 1e-6, objective=shifted_quadratic, params=centres)
+
+    assert result.converged.all()
+    np.testing.assert_allclose(result.x, centres, atol=1e-4)
+    np.testing.assert_allclose(result.fx, 1, atol=1e-6)
+
+
+@pytest.mark.parametrize("solver", solvers)
+def test_maximising(solver):
+    result = solver(
+        min_pts,
+        max_pts,
+        1e-6,
+        is_minimising=False,
+        objective=lambda x, centre: -shifted_quadratic(x, centre),
+        params=centres,
+    )
+
+    np.testing.assert_allclose(result.x, centres, atol=1e-4)
+    np.testing.assert_allclose(result.fx, -1, atol=1e-6)
+
+
+def test_one_call_per_iteration():
+    objective = Objective(lambda x: (x - 2) ** 2)
+    result = golden_section_batch(
+        np.zeros(100), np.full(100, 10.0), 1e-6, objective=objective
+    )
+
+    # Two points per problem first, then one per problem for every iteration
+    assert objective.n_calls == result.iterations.max() + 1
+    assert objective.n_evaluations == 100 * (result.iterations.max() + 2)
+
+
+def test_converged_problems_are_retired():
+    # The wider intervals need more iterations, the narrow ones stop early
+    result = golden_section_batch(
+        np.zeros(3), [1, 10, 100], 1e-3, objective=lambda x: (x - 0.5) ** 2
+    )
+
+    assert result.converged.all()
+    assert result.iterations[0] < result.iterations[1] < result.iterations[2]
+    assert np.all(result.max_pt - result.min_pt < 1e-3)
+
+
+def test_running_out_of_iterations():
+    result = interval_halving_batch(
+        [0, 0], [10, 1e-4], 1e-3, iter=3, objective=lambda x: (x - 1e-5) ** 2
+    )
+
+    np.testing.assert_array_equal(result.converged, [False, True])
+    np.testing.assert_array_equal(result.iterations, [3, 0])
+
+
+def test_bisection_skips_intervals_without_a_minimum():
+    result = bisection_batch([-5, 1], [5, 5], 1e-6, objective=lambda x: x**2)
+
+    np.testing.assert_array_equal(result.converged, [True, False])
+    assert result.iterations[1] == 0
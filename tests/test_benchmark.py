@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmark import compare
+
+root = Path(__file__).parent.parent
+
+
+def test_benchmark_runs(tmp_path):
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "benchmark.py",
+            "--algorithms",
+            "golden_section_search",
+            "evo_search",
+            "simplex_multistart",
+            "startup",
+            "--repeat",
+            "1",
+            "--startup-target",
+            "60",
+            "--output",
+            str(output),
+        ],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+
+    results = json.loads(output.read_text())["results"]
+    algorithms = {result["algorithm"] for result in results}
+    assert algorithms == {
+        "golden_section_search",
+        "evo_search",
+        "simplex_multistart",
+        "startup",
+    }
+    assert all("reason" in result for result in results)
+
+
+def result(peak_memory_kb):
+    return {
+        "algorithm": "golden_section_search",
+        "function": "objective_function",
+        "dimensions": 1,
+        "wall_time": 0.1,
+        "evaluations": 10,
+        "peak_memory_kb": peak_memory_kb,
+        "success": True,
+    }
+
+
+def test_compare_against_a_zero_baseline():
+    baseline = {"results": [result(0)]}
+
+    assert compare([result(0)], baseline, 0.1, 0) == []
+    assert compare([result(2)], baseline, 0.1, 0) == [
+        ["golden_section_search", "objective_function", 1, "peak_memory_kb", 0, 2, None]
+    ]
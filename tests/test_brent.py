@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from algorithms.single_var.brent import brent
+from algorithms.single_var.golden_section import golden_section
+from objective import Objective
+
+
+def test_default_objective():
+    result = brent(1, 10, epsilon=1e-8, is_minimising=True, rng=0)
+
+    assert result.reason == "converged"
+    assert result.x == pytest.approx(5, abs=1e-6)
+    assert result.fun == pytest.approx(37.5)
+    min_pt, max_pt = result.bracket
+    assert min_pt <= result.x <= max_pt
+
+
+def test_faster_than_golden_section():
+    def f(x):
+        return np.exp(x) - 3 * x
+
+    brent_objective, golden_objective = Objective(f), Objective(f)
+    brent_result = brent(
+        -2, 4, epsilon=1e-8, is_minimising=True, objective=brent_objective, rng=0
+    )
+    golden_result = golden_section(
+        -2, 4, epsilon=1e-8, is_minimising=True, objective=golden_objective
+    )
+
+    assert brent_result.x == pytest.approx(np.log(3), abs=1e-7)
+    assert golden_result.x == pytest.approx(np.log(3), abs=1e-7)
+    assert brent_objective.n_evaluations < golden_objective.n_evaluations
+
+
+def test_maximising():
+    result = brent(0, 3, epsilon=1e-8, objective=np.sin, rng=0)
+
+    assert result.x == pytest.approx(np.pi / 2, abs=1e-6)
+    assert result.fun == pytest.approx(1)
+
+
+def test_minimum_on_a_kink():
+    # Parabolic steps are not trusted, golden section steps still converge
+    result = brent(
+        -3,
+        7,
+        epsilon=1e-8,
+        is_minimising=True,
+        objective=lambda x: abs(x - 1.234),
+        rng=0,
+    )
+
+    assert result.x == pytest.approx(1.234, abs=1e-7)
+
+
+def test_missing_epsilon():
+    with pytest.raises(ValueError):
+        brent(1, 10)
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from algorithms.multi_var.constrained_search import constrained_search
+from algorithms.multi_var.evolutionary_search import evolutionary_search
+from algorithms.multi_var.gradient_search import bfgs
+from algorithms.multi_var.simplex_search import simplex_search
+from constants import himmelblau_function
+
+
+def distance(x, y):
+    # Unconstrained minimum (2, 1), outside x + y <= 2
+    return (x - 2) ** 2 + (y - 1) ** 2
+
+
+def below_line(x, y):
+    return 2 - x - y
+
+
+@pytest.mark.parametrize(
+    "solver, method",
+    [
+        (simplex_search, "penalty"),
+        (simplex_search, "barrier"),
+        (evolutionary_search, "penalty"),
+        (evolutionary_search, "barrier"),
+        (bfgs, "penalty"),
+    ],
+)
+def test_active_constraint(solver, method):
+    result = constrained_search(
+        0,
+        3,
+        0.5,
+        1e-6,
+        1000,
+        is_minimising=True,
+        objective=distance,
+        rng=0,
+        inequalities=[below_line],
+        method=method,
+        solver=solver,
+        max_levels=20,
+    )
+
+    assert result.reason == "converged"
+    np.testing.assert_allclose(result.x, [1.5, 0.5], atol=1e-4)
+
+
+def test_equality_constraint():
+    result = constrained_search(
+        -3,
+        3,
+        0.5,
+        1e-6,
+        1000,
+        is_minimising=True,
+        objective=distance,
+        rng=0,
+        equalities=[lambda x, y: x - y],
+        max_levels=20,
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.x, [1.5, 1.5], atol=1e-3)
+
+
+def test_evolutionary_search_keeps_to_the_bounds():
+    # The nearest minimum of himmelblau's function, (3, 2), is outside
+    result = constrained_search(
+        0,
+        2,
+        0.5,
+        1e-6,
+        1000,
+        is_minimising=True,
+        rng=0,
+        solver=evolutionary_search,
+        x0=[1, 1],
+    )
+
+    assert result.success
+    assert np.all((result.x >= 0) & (result.x <= 2))
+    assert result.x[0] == pytest.approx(2)
+
+
+def test_infeasible():
+    result = constrained_search(
+        0,
+        3,
+        0.5,
+        1e-6,
+        1000,
+        is_minimising=True,
+        objective=distance,
+        rng=0,
+        inequalities=[lambda x, y: x - 2.5, lambda x, y: 2 - x],
+        max_levels=3,
+    )
+
+    assert result.reason == "infeasible"
+    assert not result.success
+
+
+def test_barrier_with_gradient_search():
+    with pytest.raises(ValueError):
+        constrained_search(
+            0,
+            3,
+            epsilon=1e-6,
+            objective=distance,
+            inequalities=[below_line],
+            method="barrier",
+            solver=bfgs,
+        )
+
+
+def test_barrier_needs_a_feasible_start():
+    with pytest.raises(ValueError):
+        constrained_search(
+            0,
+            3,
+            epsilon=1e-6,
+            objective=distance,
+            inequalities=[below_line],
+            method="barrier",
+            x0=[2, 1],
+        )
+
+
+def test_simplex_search_stays_inside_the_bounds():
+    # The nearest minimum of himmelblau's function, (3.58, -1.85), is outside
+    result = simplex_search(
+        0, 2, 0.5, 1e-8, 500, is_minimising=True, x0=[1.5, 1.5], rng=0
+    )
+
+    assert np.all((result.x >= 0) & (result.x <= 2))
+    assert himmelblau_function(*result.x) < himmelblau_function(1.5, 1.5)
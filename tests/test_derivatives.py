@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+import pytest
+
+from constants import himmelblau_function, objective_function, rosenbrock_function
+from derivatives import Dual, dual_derivatives, finite_differences
+from objective import Objective
+
+x = np.array([0.5, 1.5, 2.5])  # Away from the kink of abs(x - 1)
+
+# f, f' and f'' of functions built from everything Dual supports
+cases = [
+    (lambda x: 3 * x**3 - 2 * x + 1, lambda x: 9 * x**2 - 2, lambda x: 18 * x),
+    (lambda x: np.sin(x) * np.exp(x), None, None),
+    (lambda x: np.log(x) / np.sqrt(x), None, None),
+    (lambda x: np.tan(x / 4) + np.cos(x) ** 2, None, None),
+    (lambda x: 2**x - abs(x - 1), None, None),
+    (lambda x: x**x, None, None),
+    (objective_function, lambda x: x - 125 / x**2, lambda x: 1 + 250 / x**3),
+]
+
+
+@pytest.mark.parametrize("f, df, ddf", cases)
+def test_dual_matches_finite_differences(f, df, ddf):
+    fx, d1, d2 = dual_derivatives(f, x)
+    _, fd1, fd2 = finite_differences(f, x)
+
+    np.testing.assert_allclose(fx, f(x))
+    np.testing.assert_allclose(d1, fd1, rtol=1e-6)
+    np.testing.assert_allclose(d2, fd2, rtol=1e-4, atol=1e-6)
+    if df is not None:
+        np.testing.assert_allclose(d1, df(x))
+        np.testing.assert_allclose(d2, ddf(x))
+
+
+def test_constant_function():
+    fx, d1, d2 = dual_derivatives(lambda x: 4.0, x)
+
+    np.testing.assert_array_equal(fx, 4.0)
+    np.testing.assert_array_equal(d1, 0.0)
+    np.testing.assert_array_equal(d2, 0.0)
+
+
+def test_unsupported_function_raises_type_error():
+    with pytest.raises(TypeError):
+        math.sin(Dual.variable(1.0))
+
+
+def test_objective_derivatives_cost_one_evaluation_per_point():
+    objective = Objective(objective_function)
+    fx, d1, d2 = objective.derivatives(x)
+
+    np.testing.assert_allclose(d1, x - 125 / x**2)
+    assert objective.n_calls == 1
+    assert objective.n_evaluations == len(x)
+
+
+def test_objective_falls_back_to_finite_differences():
+    objective = Objective(np.vectorize(lambda x: math.sin(x) + x * x))
+    fx, d1, d2 = objective.derivatives(x)
+
+    assert not objective.autodiff
+    np.testing.assert_allclose(d1, np.cos(x) + 2 * x, rtol=1e-6)
+    np.testing.assert_allclose(d2, 2 - np.sin(x), rtol=1e-4)
+    assert objective.n_evaluations == 3 * len(x)
+
+
+def test_exact_derivatives():
+    objective = Objective(np.sin, gradient=np.cos, hessian=lambda x: -np.sin(x))
+
+    fx, d1, d2 = objective.derivatives(1.0)
+
+    assert (fx, d1, d2) == pytest.approx((np.sin(1), np.cos(1), -np.sin(1)))
+
+
+@pytest.mark.parametrize(
+    "func, n_vars, point",
+    [(himmelblau_function, 2, [1.0, -2.0]), (rosenbrock_function, 5, np.arange(5.0))],
+)
+def test_value_and_gradient(func, n_vars, point):
+    dual = Objective(func, n_vars)
+    differences = Objective(func, n_vars, autodiff=False)
+
+    fx, gradient = dual.value_and_gradient(point)
+    fd_fx, fd_gradient = differences.value_and_gradient(point)
+
+    assert fx == pytest.approx(func(*point))
+    np.testing.assert_allclose(gradient, fd_gradient, rtol=1e-6, atol=1e-6)
+    assert dual.n_evaluations == 1
+    assert differences.n_evaluations == 2 * n_vars + 1
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from constants import himmelblau_function
+from evaluation_cache import EvaluationCache
+from objective import Objective
+
+
+def store(cache, *points):
+    keys = cache.keys_for(np.array(points, dtype=float).reshape(len(points), -1))
+    cache.store(keys, np.arange(len(points), dtype=float))
+    return keys
+
+
+def found(cache, *points):
+    keys = cache.keys_for(np.array(points, dtype=float).reshape(len(points), -1))
+    return cache.lookup(keys)[1].tolist()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = EvaluationCache(max_entries=3, policy="lru")
+    store(cache, 1, 2, 3)
+    found(cache, 1)  # 2 is now the least recently used
+    store(cache, 4)
+
+    assert found(cache, 1, 2, 3, 4) == [True, False, True, True]
+    assert cache.evictions == 1
+    assert len(cache) == 3
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = EvaluationCache(max_entries=3, policy="lfu")
+    store(cache, 1, 2, 3)
+    found(cache, 1)
+    found(cache, 1)
+    found(cache, 3)
+    store(cache, 4)  # 2 was never used
+
+    assert found(cache, 1, 2, 3, 4) == [True, False, True, True]
+
+
+def test_lfu_breaks_ties_by_age():
+    cache = EvaluationCache(max_entries=2, policy="lfu")
+    store(cache, 1)
+    store(cache, 2)
+    store(cache, 3)
+
+    assert found(cache, 1, 2, 3) == [False, True, True]
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_batch_larger_than_the_cache(policy):
+    cache = EvaluationCache(max_entries=4, policy=policy)
+    store(cache, *range(10))
+
+    assert len(cache) == 4
+    assert cache.evictions == 6
+    assert found(cache, 6, 7, 8, 9) == [True] * 4
+
+
+def test_max_bytes():
+    cache = EvaluationCache(max_entries=None, max_bytes=1000)
+    store(cache, *range(100))
+
+    assert 0 < cache.n_bytes <= 1000
+    assert cache.stats()["bytes"] == cache.n_bytes
+    assert found(cache, 99) == [True]
+
+
+def test_tolerance_shares_entries():
+    cache = EvaluationCache(tolerance=1e-6)
+    store(cache, [1.0, 2.0])
+
+    assert found(cache, [1.0 + 1e-9, 2.0 - 1e-9], [1.1, 2.0]) == [True, False]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        EvaluationCache(policy="fifo")
+    with pytest.raises(ValueError):
+        EvaluationCache(max_entries=0)
+    with pytest.raises(ValueError):
+        EvaluationCache(tolerance=0)
+
+
+def test_objective_only_evaluates_misses():
+    objective = Objective(himmelblau_function, n_vars=2, cache=EvaluationCache())
+    first = objective(np.array([[3.0, 2.0], [0.0, 0.0]]))
+    second = objective(np.array([[0.0, 0.0], [1.0, 1.0], [3.0, 2.0]]))
+
+    np.testing.assert_allclose(first, [0, 170])
+    np.testing.assert_allclose(second, [170, 106, 0])
+    assert objective.n_evaluations == 3
+    assert objective.cache.hits == 2
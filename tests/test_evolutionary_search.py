@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from algorithms.multi_var.evolutionary_search import (
+    evolutionary_search,
+    hyper_cube_signs,
+)
+from constants import sphere_function
+from objective import Objective
+
+
+def test_corners_of_a_square_go_around_it():
+    signs = hyper_cube_signs(2)
+
+    np.testing.assert_array_equal(signs, [[-1, -1], [1, -1], [1, 1], [-1, 1]])
+
+
+def test_consecutive_corners_differ_in_one_coordinate():
+    signs = hyper_cube_signs(5)
+
+    assert len(np.unique(signs, axis=0)) == 32
+    assert np.all(np.sum(signs[1:] != signs[:-1], axis=1) == 1)
+
+
+def test_himmelblau():
+    result = evolutionary_search(1, 1, epsilon=1e-6, iter=1000)
+
+    assert result.reason == "converged"
+    np.testing.assert_allclose(result.x, [3, 2], atol=1e-5)
+
+
+@pytest.mark.parametrize("n_vars", [3, 5])
+def test_sphere(n_vars):
+    objective = Objective(sphere_function, n_vars=n_vars)
+    result = evolutionary_search(
+        -3, 2, delta=1, epsilon=1e-6, iter=1000, objective=objective
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.x, 0, atol=1e-5)
+    # Every iteration evaluates all the corners, in one call
+    assert objective.n_evaluations == 1 + result.iterations * 2**n_vars
+    assert objective.n_calls == 1 + result.iterations
+
+
+def test_sampled_corners():
+    objective = Objective(sphere_function, n_vars=12)
+    result = evolutionary_search(
+        0,
+        0,
+        delta=1,
+        epsilon=1e-4,
+        iter=2000,
+        objective=objective,
+        x0=np.linspace(-2, 2, 12),
+        rng=0,
+        max_corners=64,
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.x, 0, atol=1e-3)
+    assert objective.n_evaluations <= 1 + result.iterations * 64
+
+
+def test_running_out_of_iterations():
+    result = evolutionary_search(1, 1, epsilon=1e-6, iter=3)
+
+    assert result.reason == "max_iterations"
+    assert not result.success
+    assert result.iterations == 3
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from algorithms.single_var.exhaustive_search import exhaustive_scan, exhaustive_search
+from objective import Objective
+
+
+def test_stepping_brackets_the_minimum():
+    result = exhaustive_search(1, 10, delta=0.01, is_minimising=True)
+
+    assert result.reason == "bracketed"
+    min_pt, max_pt = result.bracket
+    assert min_pt < 5 < max_pt
+    assert max_pt - min_pt == pytest.approx(0.02)
+
+
+@pytest.mark.parametrize("chunk_size", [3, 7, 100, 1 << 20])
+def test_scan_finds_every_bracket_across_chunks(chunk_size):
+    objective = Objective(np.cos)
+    scan = exhaustive_scan(objective, 0, 20, 0.01, chunk_size=chunk_size)
+
+    # The minima of cos in [0, 20] are at pi, 3 pi and 5 pi
+    np.testing.assert_allclose(
+        scan.points[:, 1], [np.pi, 3 * np.pi, 5 * np.pi], atol=0.01
+    )
+    np.testing.assert_array_equal(scan.values[:, 1], np.cos(scan.points[:, 1]))
+    assert scan.n_points == objective.n_evaluations == 2000
+    assert scan.n_chunks == objective.n_calls
+
+
+def test_scan_of_maxima():
+    scan = exhaustive_scan(Objective(np.cos), 0, 20, 0.01, is_minimising=False)
+
+    np.testing.assert_allclose(
+        scan.points[:, 1], [2 * np.pi, 4 * np.pi, 6 * np.pi], atol=0.01
+    )
+
+
+@pytest.mark.parametrize("is_minimising", [True, False])
+def test_vectorized_result_is_the_best_bracket(is_minimising):
+    def objective(x):
+        return np.cos(x) + x / 100
+
+    result = exhaustive_search(
+        0,
+        20,
+        delta=0.001,
+        is_minimising=is_minimising,
+        objective=objective,
+        vectorized=True,
+        chunk_size=1000,
+    )
+
+    assert result.reason == "bracketed"
+    # The slope makes the first minimum and the last maximum the best
+    assert result.x == pytest.approx(np.pi if is_minimising else 6 * np.pi, abs=0.02)
+
+
+def test_vectorized_without_a_bracket():
+    result = exhaustive_search(
+        0, 1, delta=0.01, is_minimising=True, objective=np.exp, vectorized=True
+    )
+
+    assert result.reason == "out_of_bounds"
+    assert not result.success
@@ -0,0 +1,63 @@
+import pytest
+
+from algorithms.single_var.fibonacci_search import (
+    fibonacci,
+    fibonacci_steps,
+    fibonnacci_seatch,
+)
+from objective import Objective
+
+
+def quadratic(x):
+    return (x - 3.3) ** 2
+
+
+def test_steps_match_the_fibonacci_ratios():
+    steps = fibonacci_steps(30)
+
+    for m in range(30):
+        assert steps[m] == pytest.approx(fibonacci(m) / fibonacci(m + 2))
+
+
+def test_converges_to_a_bracket_of_the_minimum():
+    result = fibonnacci_seatch(
+        0, 10, epsilon=1e-6, iter=100, is_minimising=True, objective=quadratic
+    )
+
+    assert result.reason == "converged"
+    min_pt, max_pt = result.bracket
+    assert min_pt <= 3.3 <= max_pt
+    assert max_pt - min_pt < 1e-6
+
+
+def test_equal_values_shrink_the_interval():
+    # (x - 5)^2 over [0, 10] is symmetric, so f(x1) == f(x2) on the first iteration
+    result = fibonnacci_seatch(
+        0,
+        10,
+        epsilon=1e-6,
+        iter=100,
+        is_minimising=True,
+        objective=lambda x: (x - 5) ** 2,
+    )
+
+    assert result.reason == "converged"
+    min_pt, max_pt = result.bracket
+    assert min_pt <= 5 <= max_pt
+    assert max_pt - min_pt < 1e-6
+
+
+def test_one_evaluation_per_iteration():
+    objective = Objective(quadratic)
+    result = fibonnacci_seatch(0, 10, iter=20, is_minimising=True, objective=objective)
+
+    assert result.reason == "max_iterations"
+    assert result.n_evaluations == objective.n_evaluations == result.iterations + 1
+
+
+def test_many_iterations():
+    result = fibonnacci_seatch(
+        0, 10, iter=3000, is_minimising=True, objective=quadratic
+    )
+
+    assert result.x == pytest.approx(3.3)
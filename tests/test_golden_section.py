@@ -0,0 +1,72 @@
+import pytest
+
+from algorithms.single_var.golden_section import golden_section
+from algorithms.single_var.interval_halving import interval_halving
+from constants import objective_function
+from objective import Objective
+
+
+def quadratic(x):
+    return (x - 3.3) ** 2
+
+
+def test_converges_to_a_bracket_of_the_minimum():
+    result = golden_section(
+        0, 10, epsilon=1e-8, is_minimising=True, objective=quadratic
+    )
+
+    assert result.reason == "converged"
+    min_pt, max_pt = result.bracket
+    assert min_pt <= 3.3 <= max_pt
+    assert max_pt - min_pt < 1e-8
+
+
+def test_one_evaluation_per_iteration():
+    objective = Objective(objective_function)
+    result = golden_section(
+        1, 10, epsilon=1e-6, is_minimising=True, objective=objective
+    )
+
+    assert result.n_evaluations == objective.n_evaluations == result.iterations + 1
+
+
+def test_equal_values_shrink_the_interval():
+    # (x - 5)^2 over [0, 10] is symmetric, so f(x1) == f(x2) on the first iteration
+    result = golden_section(
+        0,
+        10,
+        epsilon=1e-8,
+        iter=200,
+        is_minimising=True,
+        objective=lambda x: (x - 5) ** 2,
+    )
+
+    assert result.reason == "converged"
+    min_pt, max_pt = result.bracket
+    assert min_pt <= 5 <= max_pt
+    assert max_pt - min_pt < 1e-8
+
+
+def test_maximising():
+    result = golden_section(0, 3, epsilon=1e-6, objective=lambda x: -((x - 2) ** 2))
+
+    assert result.x == pytest.approx(2, abs=1e-5)
+
+
+@pytest.mark.parametrize("solver", [golden_section, interval_halving])
+def test_no_recursion_limit(solver):
+    # Far more iterations than the default recursion limit, without a tolerance
+    result = solver(0, 10, iter=5000, is_minimising=True, objective=quadratic)
+
+    assert result.reason == "max_iterations"
+    assert result.x == pytest.approx(3.3)
+
+
+def test_interval_halving_converges():
+    result = interval_halving(
+        0, 10, epsilon=1e-6, is_minimising=True, objective=quadratic
+    )
+
+    assert result.reason == "converged"
+    min_pt, max_pt = result.bracket
+    assert min_pt <= 3.3 <= max_pt
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from algorithms.multi_var.gradient_search import (
+    bfgs,
+    conjugate_gradient,
+    lbfgs,
+    steepest_descent,
+)
+from constants import rosenbrock_function, sphere_function
+from objective import Objective
+
+solvers = [steepest_descent, conjugate_gradient, bfgs, lbfgs]
+
+
+@pytest.mark.parametrize("solver", solvers)
+def test_himmelblau(solver):
+    result = solver(-5, 5, epsilon=1e-6, iter=1000, x0=[1.0, 1.0])
+
+    assert result.reason == "converged"
+    np.testing.assert_allclose(result.x, [3, 2], atol=1e-4)
+    assert result.fun == pytest.approx(0, abs=1e-8)
+
+
+@pytest.mark.parametrize("solver", [conjugate_gradient, bfgs, lbfgs])
+def test_rosenbrock(solver):
+    objective = Objective(rosenbrock_function, n_vars=5)
+    result = solver(
+        -5, 5, epsilon=1e-6, iter=2000, objective=objective, x0=np.zeros(5)
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.x, np.ones(5), atol=1e-4)
+    assert result.n_evaluations == objective.n_evaluations
+
+
+def test_fletcher_reeves():
+    objective = Objective(sphere_function, n_vars=10)
+    result = conjugate_gradient(
+        -5,
+        5,
+        epsilon=1e-6,
+        objective=objective,
+        x0=np.arange(10) - 4.5,
+        method="fletcher_reeves",
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.x, 0, atol=1e-5)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        conjugate_gradient(-5, 5, epsilon=1e-6, method="newton")
+
+
+@pytest.mark.parametrize("solver", solvers)
+def test_minimum_on_the_bounds(solver):
+    # The unconstrained minimum (3, 2) is outside, the best point in the box is on
+    # its edge
+    result = solver(-1, 1, epsilon=1e-6, iter=1000, x0=[0.0, 0.0])
+
+    assert result.success
+    assert np.all(np.abs(result.x) <= 1)
+    assert result.x[0] == 1
+
+
+
+def test_infinite_values_are_no_progress():
+    # Central differences across the wall at x = 1 are not finite
+    def walled(x, y):
+        return np.where(x < 1, np.inf, sphere_function(x, y))
+
+    objective = Objective(walled, n_vars=2, autodiff=False)
+    result = bfgs(-5, 5, epsilon=1e-6, objective=objective, x0=[3.0, 2.0])
+
+    assert result.reason == "no_progress"
+    assert not result.success
+    assert np.isfinite(result.fun)
+    assert result.x[0] >= 1
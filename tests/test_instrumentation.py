@@ -0,0 +1,39 @@
+import pytest
+
+from algorithms.multi_var.evolutionary_search import evolutionary_search
+from algorithms.multi_var.gradient_search import bfgs
+from algorithms.single_var.bisection import bisection
+from algorithms.single_var.golden_section import golden_section
+from algorithms.single_var.newton_raphson import newton_raphson
+from constants import himmelblau_function, objective_function
+from instrumentation import Instrumentation
+from objective import Objective
+
+
+@pytest.mark.parametrize(
+    "solver, func, n_vars, bounds",
+    [
+        (golden_section, objective_function, 1, (1, 10)),
+        (newton_raphson, objective_function, 1, (1, 10)),
+        (bisection, objective_function, 1, (1, 10)),
+        (evolutionary_search, himmelblau_function, 2, (0, 0)),
+        (bfgs, himmelblau_function, 2, (-5, 5)),
+    ],
+)
+def test_every_evaluation_is_reported(solver, func, n_vars, bounds):
+    reported = []
+    results = []
+    instrumentation = Instrumentation(
+        on_evaluation=lambda points, values: reported.append(values.size),
+        on_termination=results.append,
+    )
+    objective = Objective(func, n_vars, instrumentation=instrumentation)
+
+    result = solver(
+        *bounds, 0.5, 1e-6, 100, is_minimising=True, objective=objective, rng=0
+    )
+
+    assert result.n_evaluations == objective.n_evaluations > 0
+    assert sum(reported) == instrumentation.n_points == objective.n_evaluations
+    assert results == [result]
+    assert instrumentation.counts["solver"] == 1
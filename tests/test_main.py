@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from main import print_result
+from result import Result
+
+root = Path(__file__).parent.parent
+
+
+def run_main(*args):
+    return subprocess.run(
+        [sys.executable, "main.py", *args],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+@pytest.mark.parametrize(
+    "args, reason",
+    [
+        # Runs stopping before their first iteration have an empty summary
+        (["1", "2", "exhaustive_search", "--delta", "1"], "out_of_bounds"),
+        (["1", "2", "bounding_phase", "--delta", "5", "--seed", "0"], "no_start"),
+        (
+            ["1", "10", "golden_section_search", "--epsilon", "1e-3", "--iter", "1"],
+            "max_iterations",
+        ),
+        (["1", "10", "golden_section_search", "--epsilon", "1e-3"], "converged"),
+    ],
+)
+def test_runs(args, reason):
+    assert f"({reason})" in run_main(*args)
+
+
+@pytest.mark.parametrize(
+    "reason, success, message",
+    [
+        ("converged", True, "Found minima"),
+        ("bracketed", True, "Bracketed minima"),
+        ("no_start", False, "Could not find minima"),
+    ],
+)
+def test_print_result(capsys, reason, success, message):
+    print_result(Result(5.0, 37.5, reason, success, bracket=(4.9, 5.1)))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == message
+    assert lines[2] == "Minima lies in (4.9, 5.1)"
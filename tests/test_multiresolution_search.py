@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from algorithms.single_var.multiresolution_search import (
+    multiresolution_search,
+    resolution_schedule,
+)
+from evaluation_cache import EvaluationCache
+from instrumentation import Instrumentation
+from objective import Objective
+
+
+def wavy(x):
+    # Global minimum near -0.524 among many local minima
+    return np.sin(3 * x) + 0.05 * (x - 7) ** 2
+
+
+def test_resolution_schedule():
+    schedule = resolution_schedule(0, 100, 1e-3, coarse_points=100, refinement=10)
+
+    np.testing.assert_allclose(schedule, [1, 0.1, 0.01, 1e-3])
+
+
+def test_finds_the_global_minimum():
+    objective = Objective(wavy)
+    result = multiresolution_search(
+        -20, 30, delta=1e-6, is_minimising=True, objective=objective
+    )
+
+    # A uniform grid with this spacing would take 5e7 evaluations
+    assert result.reason == "converged"
+    assert result.fun == pytest.approx(wavy(np.linspace(-20, 30, 1000001)).min())
+    min_pt, max_pt = result.bracket
+    assert max_pt - min_pt == pytest.approx(2e-6)
+    assert result.n_evaluations == objective.n_evaluations < 2000
+
+
+def test_maximising():
+    result = multiresolution_search(0, 10, delta=1e-6, objective=lambda x: -wavy(x))
+
+    assert result.fun == pytest.approx(-wavy(np.linspace(0, 10, 100001)).min())
+
+
+def test_budget():
+    result = multiresolution_search(
+        -20, 30, delta=1e-6, is_minimising=True, objective=wavy, budget=300
+    )
+
+    assert result.reason == "max_evaluations"
+    assert result.n_evaluations <= 300
+
+
+def test_without_a_bracket():
+    result = multiresolution_search(0, 1, delta=1e-3, objective=np.exp)
+
+    assert result.reason == "out_of_bounds"
+
+
+def test_workers_give_the_same_result():
+    serial = Objective(wavy)
+    threaded = Objective(wavy)
+
+    expected = multiresolution_search(
+        -20, 30, delta=1e-6, is_minimising=True, objective=serial
+    )
+    result = multiresolution_search(
+        -20, 30, delta=1e-6, is_minimising=True, objective=threaded, workers=2
+    )
+
+    assert result.x == expected.x
+    assert threaded.n_evaluations == serial.n_evaluations
+    assert threaded.n_calls == serial.n_calls
+
+
+def test_workers_keep_the_cache_and_instrumentation():
+    reported = []
+    instrumentation = Instrumentation(
+        on_evaluation=lambda points, values: reported.append(values.size)
+    )
+    cache = EvaluationCache()
+    objective = Objective(wavy, cache=cache, instrumentation=instrumentation)
+
+    result = multiresolution_search(
+        -20, 30, delta=1e-6, is_minimising=True, objective=objective, workers=2
+    )
+
+    assert result.n_evaluations == objective.n_evaluations
+    assert sum(reported) == objective.n_evaluations
+    assert cache.misses == objective.n_evaluations
+    assert cache.hits > 0
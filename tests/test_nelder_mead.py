@@ -0,0 +1,16 @@
+import numpy as np
+
+from algorithms.multi_var.nelder_mead import nelder_mead
+from constants import rosenbrock_function
+from objective import Objective
+
+
+def test_nelder_mead_minimises_rosenbrock():
+    objective = Objective(rosenbrock_function, n_vars=3)
+    simplex_points = np.vstack([np.zeros(3), np.eye(3)])
+
+    result = nelder_mead(objective, simplex_points, 1e-14, 5000)
+
+    assert result.converged
+    np.testing.assert_allclose(result.simplex[0], np.ones(3), atol=1e-3)
+    assert result.n_evaluations == objective.n_evaluations
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from constants import himmelblau_function, objective_function, sphere_function
+from objective import Objective, as_objective
+
+
+def test_single_variable_batches_keep_their_shape():
+    objective = Objective(objective_function)
+    points = np.array([[1.0, 2.0], [5.0, 10.0]])
+
+    np.testing.assert_allclose(objective(points), objective_function(points))
+    assert objective.n_calls == 1
+    assert objective.n_evaluations == 4
+
+
+def test_multi_variable_batches_take_the_last_axis_as_coordinates():
+    objective = Objective(himmelblau_function, n_vars=2)
+
+    np.testing.assert_allclose(objective(np.array([[3, 2], [0, 0]])), [0, 170])
+    assert objective.value([3, 2]) == 0
+    assert objective.n_calls == 2
+    assert objective.n_evaluations == 3
+
+
+def test_any_number_of_variables():
+    objective = Objective(sphere_function, n_vars=5)
+    points = np.arange(15.0).reshape(3, 5)
+
+    np.testing.assert_allclose(objective(points), np.sum(points**2, axis=1))
+
+
+def test_wrong_number_of_coordinates():
+    with pytest.raises(AssertionError):
+        Objective(himmelblau_function, n_vars=2)(np.zeros((4, 3)))
+
+
+def test_as_objective():
+    objective = Objective(himmelblau_function, n_vars=2)
+
+    assert as_objective(objective, objective_function) is objective
+    assert as_objective(None, objective_function).func is objective_function
+    assert as_objective(np.sin, objective_function).cache is not None
+    assert as_objective(np.sin, objective_function, cache=False).cache is None
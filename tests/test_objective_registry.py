@@ -0,0 +1,96 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from constants import himmelblau_function
+from objective_registry import (
+    CompiledExpression,
+    objectives_dict,
+    register_objective,
+    resolve_objective,
+)
+
+
+def test_registered_name():
+    objective = resolve_objective("himmelblau")
+
+    assert objective.func is himmelblau_function
+    assert objective.n_vars == 2
+    assert objective.cache is not None
+    assert resolve_objective("himmelblau", cache=False).cache is None
+
+
+def test_any_number_of_variables():
+    objective = resolve_objective("sphere", n_vars=4)
+
+    assert objective.n_vars == 4
+    assert objective.value([1, 2, 3, 4]) == 30
+
+    with pytest.raises(ValueError):
+        resolve_objective("sphere")
+
+
+def test_wrong_number_of_variables():
+    with pytest.raises(ValueError):
+        resolve_objective("himmelblau", n_vars=3)
+
+
+def test_module_function_reference():
+    objective = resolve_objective("constants:himmelblau_function")
+
+    assert objective.func is himmelblau_function
+    assert objective.n_vars == 2
+
+    with pytest.raises(ValueError):
+        resolve_objective("constants:no_such_function")
+
+
+def test_register_objective():
+    @register_objective("test_booth", n_vars=2)
+    def booth(x, y):
+        return (x + 2 * y - 7) ** 2 + (2 * x + y - 5) ** 2
+
+    try:
+        assert resolve_objective("test_booth").value([1, 3]) == 0
+    finally:
+        del objectives_dict["test_booth"]
+
+
+def test_expression():
+    objective = resolve_objective("(x**2 + y - 11)**2 + (x + y**2 - 7)**2")
+    points = np.array([[3.0, 2.0], [0.5, -1.5]])
+
+    assert objective.n_vars == 2
+    np.testing.assert_allclose(objective(points), himmelblau_function(*points.T))
+
+
+def test_expression_variables_are_ordered():
+    expression = CompiledExpression("x10 - x2 + x1 * sin(pi * a)")
+
+    assert expression.variables == ("a", "x1", "x2", "x10")
+    assert expression(0.5, 2, 3, 4) == pytest.approx(2 - 3 + 4)
+
+
+def test_expression_is_picklable():
+    expression = pickle.loads(pickle.dumps(CompiledExpression("exp(-x**2) + y")))
+
+    assert expression(0, 1) == 2
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "x +",
+        "__import__('os').system('true')",
+        "x.real",
+        "open(x)",
+        "x if x else 1",
+        "'x' * x",
+        "pi * e",
+        "[x][0]",
+    ],
+)
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CompiledExpression(expression)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from algorithms.single_var.golden_section import golden_section
+from recorder import Trace
+
+
+def rows(n, start=0):
+    return [[i, i * 0.5] for i in range(start, start + n)]
+
+
+def record(trace, rows):
+    trace.start(["i", "x"])
+    for row in rows:
+        trace.record(row)
+
+
+def test_grows_past_the_initial_buffer():
+    trace = Trace()
+    record(trace, rows(3000))
+
+    assert len(trace) == 3000
+    np.testing.assert_array_equal(trace.rows, rows(3000))
+
+
+@pytest.mark.parametrize("n", [3, 5, 12])
+def test_ring_buffer_keeps_the_latest_rows(n):
+    trace = Trace(capacity=5)
+    record(trace, rows(n))
+
+    assert len(trace) == n
+    np.testing.assert_array_equal(trace.rows, rows(min(n, 5), start=max(0, n - 5)))
+
+
+def test_disabled_trace_records_nothing():
+    trace = Trace(enabled=False)
+    record(trace, rows(10))
+
+    assert len(trace) == 0
+    assert trace.rows.shape == (0, 0)
+
+
+def test_columns_cannot_change():
+    trace = Trace()
+    record(trace, rows(1))
+
+    with pytest.raises(ValueError):
+        trace.start(["i", "x", "y"])
+
+
+def test_csv_streaming(tmp_path):
+    path = tmp_path / "run.csv"
+    trace = Trace(path=path, chunk_rows=4)
+    record(trace, rows(10))
+    trace.close()
+
+    assert trace.n_chunks == 3
+    assert path.read_text().splitlines()[0] == "i,x"
+    np.testing.assert_array_equal(
+        np.loadtxt(path, delimiter=",", skiprows=1), rows(10)
+    )
+
+
+def test_npy_streaming(tmp_path):
+    trace = Trace(path=tmp_path / "run.npy", chunk_rows=4)
+    record(trace, rows(10))
+    trace.close()
+
+    chunks = sorted(tmp_path.glob("run.*.npy"))
+    assert [chunk.name for chunk in chunks] == [
+        "run.00000.npy",
+        "run.00001.npy",
+        "run.00002.npy",
+    ]
+    np.testing.assert_array_equal(
+        np.concatenate([np.load(chunk) for chunk in chunks]), rows(10)
+    )
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        Trace(capacity=0)
+    with pytest.raises(ValueError):
+        Trace(path=tmp_path / "run.txt")
+    with pytest.raises(ValueError):
+        Trace(path=tmp_path / "run.csv", capacity=10)
+
+
+def test_solver_records_one_row_per_iteration():
+    trace = Trace()
+    result = golden_section(1, 10, epsilon=1e-3, trace=trace)
+
+    assert trace.columns[0] == "iteration"
+    assert len(trace) == result.iterations
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from algorithms.multi_var.gradient_search import bfgs
+from algorithms.single_var.brent import brent
+from algorithms.single_var.golden_section import golden_section
+from constants import objective_function
+from recorder import Trace
+from result_cache import ResultCache, cache_key, function_identity
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(tmp_path / "results.db", max_bytes=None, max_entries=2)
+    yield cache
+    cache.close()
+
+
+def key(epsilon):
+    return cache_key(
+        "golden_section_search",
+        golden_section,
+        objective_function,
+        1,
+        min_pt=1,
+        max_pt=10,
+        epsilon=epsilon,
+    )
+
+
+def test_round_trip_with_trace(cache):
+    trace = Trace()
+    result = golden_section(1, 10, epsilon=1e-3, trace=trace)
+    cache.put(key(1e-3), result, trace)
+
+    cached = cache.get(key(1e-3))
+
+    assert cached.result.as_dict() == result.as_dict()
+    assert cached.columns == trace.columns
+    np.testing.assert_array_equal(cached.rows, trace.rows)
+    assert cache.get(key(1e-4)) is None
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_are_evicted(cache):
+    result = golden_section(1, 10, epsilon=1e-3)
+    cache.put(key(1e-1), result)
+    cache.put(key(1e-2), result)
+    cache.get(key(1e-1))
+    cache.put(key(1e-3), result)
+
+    assert key(1e-1) in cache
+    assert key(1e-2) not in cache
+    assert key(1e-3) in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_keys_depend_on_the_parameters():
+    assert key(1e-3) == key(1e-3)
+    assert key(1e-3) != key(1e-4)
+
+
+def test_identity_covers_the_modules_used(monkeypatch):
+    # Editing golden section changes the identity of the searches using it
+    import inspect
+
+    import algorithms.single_var.golden_section as golden_section_module
+
+    before = function_identity(bfgs), function_identity(brent)
+    getsource = inspect.getsource
+
+    def edited(module):
+        source = getsource(module)
+        return source + "\n# edited" if module is golden_section_module else source
+
+    monkeypatch.setattr(inspect, "getsource", edited)
+
+    assert function_identity(bfgs) != before[0]
+    assert function_identity(brent) == before[1]
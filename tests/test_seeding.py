@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from algorithms.multi_var.evolutionary_search import evolutionary_search
+from algorithms.multi_var.gradient_search import bfgs
+from algorithms.multi_var.simplex_search import simplex_search
+from algorithms.single_var.bounding_phase import bounding_phase
+from algorithms.single_var.brent import brent
+from algorithms.single_var.newton_raphson import newton_raphson
+from batch import seed_jobs
+from constants import sphere_function
+from objective import Objective
+from utils import find_random_start
+
+
+def one_var():
+    return Objective(lambda x: (x - 1.5) ** 2)
+
+
+def two_vars():
+    return Objective(sphere_function, n_vars=2)
+
+
+cases = [
+    (bounding_phase, one_var, {}),
+    (brent, one_var, {}),
+    (newton_raphson, one_var, {}),
+    (simplex_search, two_vars, {}),
+    (bfgs, two_vars, {}),
+    # Sampling 2 of the 4 corners makes evolutionary search random
+    (evolutionary_search, two_vars, {"max_corners": 2}),
+]
+
+
+def summary(result):
+    return result.reason, np.asarray(result.x).tolist(), result.n_evaluations
+
+
+@pytest.mark.parametrize("solver, objective, kwargs", cases)
+def test_same_seed_same_result(solver, objective, kwargs):
+    def solve(rng):
+        return solver(
+            -5, 5, 0.5, 1e-6, 1000, True, objective(), rng=rng, **kwargs
+        )
+
+    first = solve(7)
+    # The global random state is not used
+    random.seed(1)
+    np.random.seed(1)
+    second = solve(np.random.default_rng(7))
+
+    assert summary(first) == summary(second)
+
+
+def test_different_seeds_start_in_different_places():
+    results = [
+        bounding_phase(-50, 50, 0.5, is_minimising=True, objective=one_var(), rng=seed)
+        for seed in range(5)
+    ]
+
+    assert len({result.n_evaluations for result in results}) > 1
+
+
+def test_find_random_start():
+    assert find_random_start(0, 10, 0.1, rng=3) == find_random_start(0, 10, 0.1, rng=3)
+
+
+def test_seed_jobs():
+    jobs = [{"id": str(i), "seed": None} for i in range(4)] + [{"id": "4", "seed": 9}]
+
+    first, second = seed_jobs(jobs, 0), seed_jobs(jobs, 0)
+    draws = [np.random.default_rng(job["seed"]).random() for job in first]
+
+    # Every job gets its own stream, reproduced by the same seed
+    assert draws == [np.random.default_rng(job["seed"]).random() for job in second]
+    assert len(set(draws)) == len(draws)
+    assert first[4]["seed"] == 9
+    # A job keeps its stream whatever the jobs after it
+    assert draws[:2] == [
+        np.random.default_rng(job["seed"]).random() for job in seed_jobs(jobs[:2], 0)
+    ]
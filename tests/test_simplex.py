@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import simplex
+from constants import himmelblau_function
+from objective import Objective
+
+
+def multistart(capsys, **kwargs):
+    solutions, _ = simplex.simplex_search(
+        simplex.lb, simplex.ub, 1.5, 0.5, 1e-6, n_starts=6, seed=1, **kwargs
+    )
+    capsys.readouterr()
+    return solutions
+
+
+def test_multistart_is_reentrant(capsys):
+    first, second = [], []
+    multistart(capsys, workers=1, summary=first)
+    multistart(capsys, workers=1, summary=second)
+
+    assert len(first) > 0
+    assert first == second
+    assert simplex.summary == []
+
+
+@pytest.mark.parametrize(
+    "workers, executor", [(1, "process"), (2, "process"), (2, "thread")]
+)
+def test_multistart_counts_evaluations(capsys, workers, executor):
+    serial = Objective(himmelblau_function, n_vars=2)
+    objective = Objective(himmelblau_function, n_vars=2)
+    expected = multistart(capsys, workers=1, objective=serial)
+
+    solutions = multistart(
+        capsys, workers=workers, executor=executor, objective=objective
+    )
+
+    np.testing.assert_array_equal(solutions, expected)
+    assert objective.n_evaluations == serial.n_evaluations > 0
+    assert objective.n_calls == serial.n_calls
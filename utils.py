@@ -1,18 +1,12 @@
-import random
+import numpy as np
 
 
-def find_derivative(f, x, h=0.01):
-    return (f(x + h) - f(x)) / h
-
-
-def find_double_derivative(f, x, h=0.01):
-    return (f(x + h) - 2 * f(x) + f(x - h)) / (h**2)
-
-
-def find_random_start(min_pt, max_pt, epsilon):
+def find_random_start(min_pt, max_pt, epsilon, rng=None):
+    # rng is a numpy Generator or a seed. None for a fresh unseeded generator
+    rng = np.random.default_rng(rng)
     tries = 100  # Max tries to initiliase x0
     while tries:
-        x0 = round(random.uniform(min_pt, max_pt), 2)
+        x0 = round(rng.uniform(min_pt, max_pt), 2)
         if (x0 - epsilon) > min_pt and (x0 + epsilon) < max_pt:
             return x0
 